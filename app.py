@@ -2,10 +2,23 @@ import streamlit as st
 import streamlit.components.v1 as components
 import time
 import random
-import urllib.parse
+from html import escape
 from tournament_manager import TournamentManager
-from utils import get_sport_icon, get_round_name, get_team_name_label
-from models import SportType
+from utils import get_sport_icon, get_round_name, get_team_name_label, parse_team_names, parse_team_csv
+from models import SportType, OrphanPolicy, SET_SPORTS, NO_DRAW_SPORTS
+from slides import get_slide_deck
+from html_cache import cached_fragment
+from summary_index import get_summaries, query
+from search import get_search_index
+from live_scoring import get_live_scoring
+from templates import points_table, matches_table
+from theme import (
+    GLOBAL_CSS, SLIDE_CSS, FULLSCREEN_CHROME_CSS, style_tag, sport_background_style,
+    sport_tile_layers, compact_no_scroll_css, slide_canvas_css,
+)
+from assets import static_asset_url, stylesheet
+from profiling import profiled, rerun, render_panel
+import metrics
 
 # Configure page
 st.set_page_config(
@@ -17,6 +30,7 @@ st.set_page_config(
 
 # Initialize tournament manager
 tm = TournamentManager()
+metrics.set_process_name("streamlit")
 
 # Initialize session state
 if 'page' not in st.session_state:
@@ -32,6 +46,36 @@ if 'auto_mode_running' not in st.session_state:
 if 'auto_slides_seed' not in st.session_state:
     st.session_state.auto_slides_seed = 0
 
+# Seconds between checks of the shared change feed on display pages
+CHANGE_WATCH_INTERVAL = 2
+
+# Seconds between refreshes of the live scores strip (only while a match is live)
+LIVE_REFRESH_INTERVAL = 1
+
+@st.fragment(run_every=CHANGE_WATCH_INTERVAL)
+def _watch_for_changes():
+    """Rerun the page once another session commits or a match goes live or ends; reads only in-memory state"""
+    metrics.session_seen()
+    if tm.has_external_changes() or get_live_scoring().generation != st.session_state.get("live_generation"):
+        st.rerun(scope="app")
+
+def _render_live_strip():
+    """Scores of the matches being scored live, refreshed from memory"""
+    tournaments = tm.get_all_tournaments()
+    for score in get_live_scoring().live():
+        tournament = tournaments.get(score.tournament_id)
+        match = tournament and (tournament.matches.get(score.match_id) or tournament.knockout_matches.get(score.match_id))
+        if match is None:
+            continue
+        team1 = tournament.teams.get(match.team1_id)
+        team2 = tournament.teams.get(match.team2_id)
+        sets = "  ".join(f"{a}-{b}" for a, b in score.sets)
+        st.markdown(
+            f"🔴 **مباشر** · {escape(tournament.name)}: {escape(team1.name if team1 else '—')} "
+            f"**{score.team1} - {score.team2}** {escape(team2.name if team2 else '—')}"
+            + (f" · الأشواط {sets}" if sets else "")
+        )
+
 # ---------- Global styling & sidebar ----------
 def match_completed(m):
     try:
@@ -43,481 +87,63 @@ def match_completed(m):
         return False
 
 def inject_global_styles():
-    st.markdown(
-        """
-        <style>
-        :root {
-            --brand-primary: #1f4e79;
-            --brand-primary-700: #153956;
-            --surface: #ffffff;
-            --surface-muted: #f8fafc;
-            --border: #e5e7eb;
-            --text: #111111;
-            --text-strong: #0f172a;
-        }
-        @import url('https://fonts.googleapis.com/css2?family=Cairo:wght@400;700;800&display=swap');
-        html, body, [class*="css"] {
-            direction: rtl;
-            font-family: 'Cairo', -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Arial, "Apple Color Emoji", "Noto Color Emoji", sans-serif;
-        }
-        /* Core brand overrides */
-        .stMarkdown h1, .stMarkdown h2, .stMarkdown h3 { color: var(--text-strong); }
-        div.stButton>button[kind="primary"], div.stButton>button[data-baseweb="button"] {
-            background: var(--brand-primary) !important;
-            border-color: var(--brand-primary) !important;
-            color: #ffffff !important;
-        }
-        div.stButton>button[kind="secondary"] {
-            border-color: var(--brand-primary) !important;
-            color: var(--brand-primary) !important;
-        }
-        div.stButton>button { border-radius: 10px !important; }
-        /* Buttons */
-        button[kind="primary"], button[data-baseweb="button"] { border-radius: 10px !important; }
-        /* Cards */
-        .ux-card { 
-            border-radius: 12px; 
-            padding: 1rem; 
-            background: var(--surface); 
-            border: 1px solid var(--border); 
-            box-shadow: 0 1px 2px rgba(0,0,0,0.04);
-            color: var(--text);
-        }
-        .ux-card-accent {
-            background: linear-gradient(180deg, var(--surface-muted), var(--surface));
-        }
-        .ux-card, .ux-card * { color: var(--text) !important; }
-        .ux-card:hover { box-shadow: 0 4px 10px rgba(0,0,0,0.08); border-color: var(--border); }
-        .ux-muted { color: #6c757d; }
-        .ux-section-title { color: var(--brand-primary); margin: 0.5rem 0 1rem 0; }
-        .chip { display:inline-block; padding: 2px 8px; border-radius:999px; background:#eef2f7; color:var(--text); font-size:12px; border:1px solid var(--border); }
-        .chip-accent { background: rgba(31,78,121,0.08); color: var(--brand-primary); border-color: rgba(31,78,121,0.25); }
-        .chip-green { background:#e9fbe7; border-color:#b7f0b0; color:#0a5c2b; }
-        .chip-amber { background:#fff8e1; border-color:#ffe08a; color:#7a5200; }
-        /* Professional tables */
-        .pro-table { width:100%; border-collapse:separate; border-spacing:0; background:var(--surface); border:1px solid var(--border); border-radius:12px; overflow:hidden; }
-        .pro-table th, .pro-table td { padding:10px 12px; border-bottom:1px solid var(--border); text-align:center; color:var(--text); }
-        .pro-table th { background:var(--surface-muted); font-weight:800; color:var(--text-strong); }
-        .pro-table tbody tr:nth-child(even) { background:#f9fafb; }
-        .pro-table tr:hover { background:#f5f7fa; }
-        .section-title { text-align:center; color:var(--brand-primary); margin: 1rem 0 0.5rem; font-weight:800; }
-        .subsection-title { text-align:center; color:#111111; margin: 0.5rem 0; font-weight:700; }
-
-        /* Inputs & widgets */
-        .stTextInput input, .stNumberInput input, .stSelectbox select, .stMultiSelect [role="combobox"], textarea {
-            border-radius: 10px !important;
-        }
-        [data-testid="stMetricValue"] { color: var(--brand-primary) !important; }
-        [data-testid="stSidebar"] { background: var(--surface-muted) !important; }
-        /* Remove top whitespace globally */
-        html, body { margin-top: 0 !important; padding-top: 0 !important; }
-        [data-testid="stHeader"], header { display: none !important; height: 0 !important; }
-        [data-testid="stToolbar"] { display: none !important; }
-        [data-testid="stAppViewContainer"] { padding-top: 0 !important; }
-        .block-container { padding-top: 0 !important; margin-top: 0 !important; }
-        .block-container > :first-child { margin-top: 0 !important; }
-        /* Completely remove Streamlit's sidebar UI */
-        [data-testid="stSidebar"], [data-testid="stSidebarCollapsedControl"] { display: none !important; }
-        [data-testid="stAppViewContainer"] { margin-right: 0 !important; margin-left: 0 !important; }
-        
-        /* Mobile responsiveness */
-        @media (max-width: 768px) {
-            .block-container { padding: 0.5rem !important; }
-            .stButton > button { font-size: 14px !important; padding: 0.5rem !important; }
-            .stSelectbox, .stTextInput, .stNumberInput { font-size: 16px !important; }
-            .stColumns > div { padding: 0.25rem !important; }
-            .pro-table th, .pro-table td { padding: 6px 4px !important; font-size: 12px !important; }
-            .section-title { font-size: 1.1rem !important; margin: 0.5rem 0 !important; }
-            .subsection-title { font-size: 1rem !important; margin: 0.25rem 0 !important; }
-            .ux-card { padding: 0.75rem !important; margin-bottom: 0.5rem !important; }
-            .chip { font-size: 11px !important; padding: 2px 6px !important; }
-            .top-nav { padding: 4px 6px !important; }
-            .top-nav-row { flex-direction: column !important; gap: 4px !important; }
-            .top-stats { margin-right: 0 !important; justify-content: center !important; }
-        }
-        
-        @media (max-width: 480px) {
-            .block-container { padding: 0.25rem !important; }
-            .stButton > button { font-size: 12px !important; padding: 0.4rem !important; }
-            .pro-table th, .pro-table td { padding: 4px 2px !important; font-size: 11px !important; }
-            .section-title { font-size: 1rem !important; }
-            .subsection-title { font-size: 0.9rem !important; }
-            .ux-card { padding: 0.5rem !important; }
-            .chip { font-size: 10px !important; padding: 1px 4px !important; }
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-def _sport_background_css(sport_name: str) -> str:
-    palettes = {
-        "كرة قدم": "linear-gradient(135deg, #0f9d58 0%, #0b7a43 100%)",
-        "كرة سلة": "linear-gradient(135deg, #f97316 0%, #ea580c 100%)",
-        "تنس": "linear-gradient(135deg, #84cc16 0%, #65a30d 100%)",
-        "بينغ بونغ": "linear-gradient(135deg, #38bdf8 0%, #0ea5e9 100%)",
-    }
-    return palettes.get(sport_name, "linear-gradient(135deg, #1f4e79 0%, #153956 100%)")
-
-def _sport_accent_color(sport_name: str) -> str:
-    """Primary accent color per sport for consistent theming."""
-    accents = {
-        "كرة قدم": "#0f9d58",
-        "كرة سلة": "#f97316",
-        "تنس": "#84cc16",
-        "بينغ بونغ": "#0ea5e9",
-    }
-    return accents.get(sport_name, "#1f4e79")
-
-def _sport_tile_data_uri(emoji: str) -> str:
-    # SVG tile with faint emoji watermark
-    svg = f"""
-    <svg xmlns='http://www.w3.org/2000/svg' width='120' height='120'>
-      <rect width='120' height='120' fill='none'/>
-      <text x='60' y='70' font-size='64' text-anchor='middle' opacity='0.09'>{emoji}</text>
-    </svg>
-    """.strip()
-    encoded = urllib.parse.quote(svg)
-    return f"url('data:image/svg+xml;utf8,{encoded}')"
-
-def _sport_scene_tile_data_uri(sport_name: str) -> str:
-    # Subtle field/court motifs per sport
-    if sport_name == "كرة قدم":
-        svg = """
-        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
-          <rect width='240' height='240' fill='none'/>
-          <rect x='10' y='10' width='220' height='220' fill='none' stroke='white' stroke-opacity='0.12' stroke-width='2'/>
-          <circle cx='120' cy='120' r='30' fill='none' stroke='white' stroke-opacity='0.12' stroke-width='2'/>
-          <line x1='120' y1='10' x2='120' y2='230' stroke='white' stroke-opacity='0.12' stroke-width='2'/>
-        </svg>
-        """
-    elif sport_name == "كرة سلة":
-        svg = """
-        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
-          <rect width='240' height='240' fill='none'/>
-          <path d='M0,80 L240,80 M0,160 L240,160' stroke='white' stroke-opacity='0.10' stroke-width='3'/>
-          <circle cx='120' cy='120' r='60' fill='none' stroke='white' stroke-opacity='0.08' stroke-width='3'/>
-        </svg>
-        """
-    elif sport_name == "تنس":
-        svg = """
-        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
-          <rect width='240' height='240' fill='none'/>
-          <rect x='20' y='20' width='200' height='200' fill='none' stroke='white' stroke-opacity='0.14' stroke-width='2'/>
-          <line x1='120' y1='20' x2='120' y2='220' stroke='white' stroke-opacity='0.14' stroke-width='2'/>
-          <line x1='20' y1='120' x2='220' y2='120' stroke='white' stroke-opacity='0.14' stroke-width='2'/>
-        </svg>
-        """
-    else:  # بينغ بونغ
-        svg = """
-        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
-          <rect width='240' height='240' fill='none'/>
-          <path d='M0,0 L240,240 M240,0 L0,240' stroke='white' stroke-opacity='0.06' stroke-width='2'/>
-          <circle cx='60' cy='60' r='12' fill='white' fill-opacity='0.06'/>
-          <circle cx='180' cy='180' r='12' fill='white' fill-opacity='0.06'/>
-        </svg>
-        """
-    encoded = urllib.parse.quote(svg.strip())
-    return f"url('data:image/svg+xml;utf8,{encoded}')"
+    st.markdown(stylesheet("global", GLOBAL_CSS), unsafe_allow_html=True)
 
 def apply_sport_background(sport_name: str, fullscreen: bool = False):
-    bg = _sport_background_css(sport_name)
-    # Use sport icon as watermarked pattern
-    from utils import get_sport_icon
-    emoji = get_sport_icon(sport_name)
-    tile = _sport_tile_data_uri(emoji)
-    scene = _sport_scene_tile_data_uri(sport_name)
-    accent = _sport_accent_color(sport_name)
-    if fullscreen:
-        st.markdown(
-            f"""
-            <style>
-            :root {{ --brand-primary: {accent}; }}
-            html, body {{ height:100%; overflow:hidden; }}
-            body {{ background-image: {bg}, {scene}, {tile}; background-repeat: no-repeat, repeat, repeat; background-size: cover, 240px 240px, 120px 120px; background-attachment: fixed, fixed, fixed; background-position: center top, left top, left top; }}
-            .block-container {{ background: rgba(255,255,255,0.85); border-radius: 12px; box-shadow: 0 8px 24px rgba(0,0,0,0.10); backdrop-filter: blur(1.5px); }}
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
-    else:
-        # Embedded mode: keep normal page chrome and scrolling; lighter overlay
-        st.markdown(
-            f"""
-            <style>
-            :root {{ --brand-primary: {accent}; }}
-            body {{ background-image: {bg}, {scene}, {tile}; background-repeat: no-repeat, repeat, repeat; background-size: cover, 240px 240px, 120px 120px; background-attachment: fixed, fixed, fixed; background-position: center top, left top, left top; }}
-            .block-container {{ background: rgba(255,255,255,0.92); border-radius: 12px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); }}
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
+    st.markdown(style_tag(sport_background_style(sport_name, fullscreen, static_asset_url)), unsafe_allow_html=True)
 
 def apply_fullscreen_chrome():
     """Hide sidebar and Streamlit chrome for true fullscreen displays."""
-    st.markdown(
-        """
-        <style>
-        [data-testid="stSidebar"], [data-testid="stToolbar"], [data-testid="stStatusWidget"] { display: none !important; }
-        #MainMenu { visibility: hidden; }
-        header { visibility: hidden; }
-        footer { visibility: hidden; }
-        [data-testid="stDecoration"] { display: none !important; }
-        .block-container { padding-top: 0; padding-bottom: 0.5rem; }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(style_tag(FULLSCREEN_CHROME_CSS), unsafe_allow_html=True)
 
 def apply_compact_no_scroll(scale_percent: int = 90):
     """Compact styling to fit all content in one screen without scrolling and hide sidebar."""
-    scale = max(50, min(100, int(scale_percent)))
-    st.markdown(
-        f"""
-        <style>
-        [data-testid="stSidebar"], [data-testid="stToolbar"], [data-testid="stStatusWidget"], header, footer, [data-testid="stDecoration"] {{ display: none !important; }}
-        html, body {{ overflow: hidden !important; }}
-        .block-container {{ padding-top: 0.25rem; padding-bottom: 0.25rem; height: 100vh; overflow: hidden; transform: scale({scale/100}); transform-origin: top center; }}
-        .pro-table th, .pro-table td {{ padding: 6px 8px; font-size: 12px; }}
-        .section-title {{ margin: 0.25rem 0; font-size: 1rem; }}
-        .subsection-title {{ margin: 0.25rem 0; font-size: 0.95rem; }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(style_tag(compact_no_scroll_css(scale_percent)), unsafe_allow_html=True)
+
+def _render_auto_slide(slide):
+    """Render a single pre-built slide in fullscreen mode."""
+    st.markdown(stylesheet("slides", SLIDE_CSS), unsafe_allow_html=True)
+    st.markdown(slide.html, unsafe_allow_html=True)
+
+def _points_table_html(standings):
+    """Team/points table for a list of standings rows"""
+    return points_table(standings)
+
+def _matches_table_html(tournament, matches, team1_label="الفريق 1", team2_label="الفريق 2"):
+    """Team/score/team table for a list of matches"""
+    return matches_table(tournament, matches, team1_label, team2_label)
+
+def _group_matches(tournament, group_id):
+    return tournament.get_group_matches(group_id)
 
-def _build_auto_slides(tournaments_list):
-    """Build a linear list of slides: (tournament_id, kind, payload)
-    kind: 'overview' | 'groups_chunk' | 'group' | 'knockout'
-    payload: None | list[group_id] | 'semi'/'final'
+def _group_results_tile_html(tournament, group_id):
+    """Group matches table inside a container with sport-themed background tiles"""
+    scene_bg, emoji_tile = sport_tile_layers(tournament.sport_type.value, static_asset_url)
+    matches_html = _matches_table_html(tournament, _group_matches(tournament, group_id), "الفريق", "الفريق")
+    return f"""
+    <div style='padding:8px;border-radius:12px; background-image: {scene_bg}, {emoji_tile};
+                background-repeat: repeat, repeat; background-size: 180px 180px, 90px 90px; background-color: rgba(255,255,255,0.92);
+                box-shadow: 0 2px 8px rgba(0,0,0,0.06);'>
+        {matches_html}
+    </div>
+    """
+
+def _group_points_tile_html(tournament, group_id):
+    """Group standings table inside a container with sport-themed background tiles"""
+    scene_bg, emoji_tile = sport_tile_layers(tournament.sport_type.value, static_asset_url)
+    group = tournament.groups[group_id]
+    table_html = _points_table_html(tournament.get_group_standings(group_id))
+    return f"""
+    <div style='padding:8px;border-radius:12px;
+                background-image: {scene_bg}, {emoji_tile};
+                background-repeat: repeat, repeat;
+                background-size: 180px 180px, 90px 90px;
+                background-color: rgba(255,255,255,0.92);
+                box-shadow: 0 2px 8px rgba(0,0,0,0.06);'>
+        <div class='subsection-title' style='margin:0 0 0.25rem 0;color:var(--text-strong);'>{escape(group.name)}</div>
+        {table_html}
+    </div>
     """
-    slides = []
-    for t in tournaments_list:
-        # Build group chunks to ensure each slide fits
-        if t.groups:
-            # Estimate rows per group = standings rows + match rows
-            group_ids = list(t.groups.keys())
-            current_chunk = []
-            current_rows = 0
-            max_rows = 28  # target rows per slide
-            for gid in group_ids:
-                try:
-                    s_rows = len(t.get_group_standings(gid))
-                except Exception:
-                    s_rows = len(t.groups[gid].team_ids)
-                m_rows = sum(1 for m in t.matches.values() if m.group_id == gid)
-                g_rows = max(2, s_rows) + max(1, m_rows) + 2  # include headers/margins
-                # If adding this group would overflow the target, flush current chunk
-                if current_rows > 0 and current_rows + g_rows > max_rows:
-                    slides.append((t.id, 'groups_chunk', current_chunk))
-                    current_chunk = []
-                    current_rows = 0
-                current_chunk.append(gid)
-                current_rows += g_rows
-            if current_chunk:
-                slides.append((t.id, 'groups_chunk', current_chunk))
-        # One slide for knockout (if exists)
-        if t.knockout_matches:
-            slides.append((t.id, 'knockout', None))
-    return slides
-
-def _render_auto_slide(tournament, kind, payload):
-    """Render a single slide in fullscreen mode."""
-    # Common title
-    title = f"{get_sport_icon(tournament.sport_type.value)} {tournament.name}"
-    st.markdown(
-        f"<h1 style='text-align:center;margin:0 0 0.5rem;'>{title}</h1>",
-        unsafe_allow_html=True,
-    )
-    # Slide-specific styles (cards and list rows instead of tables)
-    st.markdown(
-        """
-        <style>
-        .slide-card { background: rgba(255,255,255,0.95); border: 1px solid var(--border); border-radius: 12px; padding: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.06); }
-        .slide-list { display: flex; flex-direction: column; gap: 6px; }
-        .slide-row { display: flex; align-items: center; justify-content: space-between; padding: 8px 10px; border-radius: 10px; background: #ffffff; border: 1px solid var(--border); }
-        .slide-row .name { font-weight: 700; color: var(--text-strong); }
-        .slide-chip { display:inline-block; min-width: 44px; text-align:center; padding: 2px 10px; border-radius: 999px; background: rgba(31,78,121,0.08); color: var(--brand-primary); border: 1px solid rgba(31,78,121,0.25); font-weight: 800; }
-        .slide-score { display:inline-block; min-width: 72px; text-align:center; padding: 2px 12px; border-radius: 999px; background: rgba(31,78,121,0.10); color: var(--brand-primary); border: 1px solid rgba(31,78,121,0.25); font-weight: 800; }
-        .slide-rows-3 { display:grid; grid-template-columns: 1fr auto 1fr; gap: 10px; align-items:center; }
-        .slide-xs { font-size: 12px; color: #6c757d; }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-    if kind == 'groups_chunk' and tournament.groups:
-        st.markdown(f"<div class='section-title'>🏁 دور المجموعات</div>", unsafe_allow_html=True)
-        # Grid CSS and compact table styles for slideshow
-        st.markdown(
-            """
-            <style>
-            .groups-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 12px; }
-            .group-card { background: rgba(255,255,255,0.96); border: 1px solid var(--border); border-radius: 12px; padding: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.06); }
-            .group-title { font-weight: 800; margin-bottom: 6px; color: var(--text-strong); text-align: center; }
-            .group-card .pro-table.compact th, .group-card .pro-table.compact td { padding: 6px 8px; font-size: 12px; }
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
-        group_cards_html = []
-        for gid, group in tournament.groups.items():
-            # Standings table
-            standings = tournament.get_group_standings(gid)
-            s_rows_html = "".join([f"<tr><td>{row['team_name']}</td><td>{row['points']}</td></tr>" for row in standings])
-            if not s_rows_html:
-                s_rows_html = "<tr><td>—</td><td>0</td></tr>"
-            s_table_html = (
-                "<table class='pro-table compact'>"
-                "<thead><tr><th>الفريق</th><th>النقاط</th></tr></thead>"
-                f"<tbody>{s_rows_html}</tbody>"
-                "</table>"
-            )
-            # Matches table
-            group_matches = [m for m in tournament.matches.values() if m.group_id == gid]
-            m_rows_html = "".join([
-                f"<tr><td>{(tournament.teams.get(m.team1_id).name if m.team1_id in tournament.teams else '—')}</td><td>{(f'{m.team1_score} - {m.team2_score}' if m.is_completed else '—')}</td><td>{(tournament.teams.get(m.team2_id).name if m.team2_id in tournament.teams else '—')}</td></tr>"
-                for m in group_matches
-            ])
-            if not m_rows_html:
-                m_rows_html = "<tr><td>—</td><td>—</td><td>—</td></tr>"
-            m_table_html = (
-                "<table class='pro-table compact'>"
-                "<thead><tr><th>الفريق 1</th><th>النتيجة</th><th>الفريق 2</th></tr></thead>"
-                f"<tbody>{m_rows_html}</tbody>"
-                "</table>"
-            )
-            card_html = (
-                "<div class='group-card'>"
-                f"<div class='group-title'>{group.name}</div>"
-                "<div class='slide-xs' style='margin:2px 0 4px 0'>الترتيب</div>"
-                f"{s_table_html}"
-                "<div class='slide-xs' style='margin:8px 0 4px 0'>المباريات</div>"
-                f"{m_table_html}"
-                "</div>"
-            )
-            group_cards_html.append(card_html)
-        st.markdown(
-            """
-            <div class='groups-grid'>
-              {cards}
-            </div>
-            """.replace("{cards}", "\n".join(group_cards_html)),
-            unsafe_allow_html=True,
-        )
-    elif kind == 'group' and payload in tournament.groups:
-        group = tournament.groups[payload]
-        st.markdown(f"<div class='section-title'>🏁 {group.name}</div>", unsafe_allow_html=True)
-        standings = tournament.get_group_standings(group.id)
-        # Standings list (no tables)
-        s_rows = [
-            f"<div class='slide-row'><div class='name'>{row['team_name']}</div><div class='slide-chip'>{row['points']}</div></div>"
-            for row in standings
-        ]
-        st.markdown("""
-            <div class='slide-card'>
-              <div class='slide-list'>
-                {rows}
-              </div>
-            </div>
-        """.replace("{rows}", "\n".join(s_rows)), unsafe_allow_html=True)
-        # Matches table
-        group_matches = [m for m in tournament.matches.values() if m.group_id == group.id]
-        st.markdown(f"<div class='subsection-title'>نتائج المباريات</div>", unsafe_allow_html=True)
-        if group_matches:
-            m_rows = []
-            for m in group_matches:
-                t1 = tournament.teams.get(m.team1_id)
-                t2 = tournament.teams.get(m.team2_id)
-                n1 = t1.name if t1 else '—'
-                n2 = t2.name if t2 else '—'
-                score = f"{m.team1_score} - {m.team2_score}" if m.is_completed else "—"
-                m_rows.append(
-                    f"<div class='slide-row'><div class='name'>{n1}</div><div class='slide-score'>{score}</div><div class='name'>{n2}</div></div>"
-                )
-            st.markdown("""
-                <div class='slide-card'>
-                  <div class='slide-list'>
-                    {rows}
-                  </div>
-                </div>
-            """.replace("{rows}", "\n".join(m_rows)), unsafe_allow_html=True)
-        else:
-            st.info("لا توجد مباريات في هذه المجموعة")
-    elif kind == 'knockout':
-        st.markdown(f"<div class='section-title'>🏆 دور الإقصاء</div>", unsafe_allow_html=True)
-        rounds = {}
-        for match in tournament.knockout_matches.values():
-            rounds.setdefault(match.round_type, []).append(match)
-        for round_type in ["semi", "final"]:
-            if round_type in rounds:
-                st.markdown(f"<div class='subsection-title'>{get_round_name(round_type)}</div>", unsafe_allow_html=True)
-                k_rows = []
-                for match in rounds[round_type]:
-                    team1 = tournament.teams.get(match.team1_id)
-                    team2 = tournament.teams.get(match.team2_id)
-                    team1_name = team1.name if team1 else '—'
-                    team2_name = team2.name if team2 else '—'
-                    score = f"{match.team1_score} - {match.team2_score}" if match.is_completed else "—"
-                    k_rows.append(
-                        f"<div class='slide-row'><div class='name'>{team1_name}</div><div class='slide-score'>{score}</div><div class='name'>{team2_name}</div></div>"
-                    )
-                st.markdown("""
-                    <div class='slide-card'>
-                      <div class='slide-list'>
-                        {rows}
-                      </div>
-                    </div>
-                """.replace("{rows}", "\n".join(k_rows)), unsafe_allow_html=True)
-    else:
-        st.info("لا توجد بيانات للعرض")
-
-def _compute_overall_standings(tournament):
-    stats = {}
-    # init teams
-    for team_id, team in tournament.teams.items():
-        stats[team_id] = {
-            'team_id': team_id,
-            'team_name': team.name,
-            'played': 0,
-            'won': 0,
-            'drawn': 0,
-            'lost': 0,
-            'goals_for': 0,
-            'goals_against': 0,
-            'goal_difference': 0,
-            'points': 0,
-        }
-    # accumulate from completed group matches
-    for match in tournament.matches.values():
-        if not match.is_completed:
-            continue
-        t1 = stats.get(match.team1_id)
-        t2 = stats.get(match.team2_id)
-        if not t1 or not t2:
-            continue
-        t1['played'] += 1
-        t2['played'] += 1
-        t1['goals_for'] += match.team1_score
-        t1['goals_against'] += match.team2_score
-        t2['goals_for'] += match.team2_score
-        t2['goals_against'] += match.team1_score
-        if match.team1_score > match.team2_score:
-            t1['won'] += 1
-            t1['points'] += 3
-            t2['lost'] += 1
-        elif match.team2_score > match.team1_score:
-            t2['won'] += 1
-            t2['points'] += 3
-            t1['lost'] += 1
-        else:
-            t1['drawn'] += 1
-            t2['drawn'] += 1
-            t1['points'] += 1
-            t2['points'] += 1
-        t1['goal_difference'] = t1['goals_for'] - t1['goals_against']
-        t2['goal_difference'] = t2['goals_for'] - t2['goals_against']
-    # sort
-    return sorted(stats.values(), key=lambda x: (x['points'], x['goal_difference'], x['goals_for']), reverse=True)
 
 def render_three_row_tournament_dashboard(tournament, full_screen: bool = False):
     """Three-row dashboard: 1) sport name, 2) overall points table, 3) per-group match results tables."""
@@ -542,54 +168,27 @@ def render_three_row_tournament_dashboard(tournament, full_screen: bool = False)
     )
     # Row 2: points table (overall) - only team and points
     st.markdown("<div class='section-title'>جدول النقاط</div>", unsafe_allow_html=True)
-    standings = _compute_overall_standings(tournament)
-    table = [
-        "<table class='pro-table'>",
-        "<thead><tr><th>الفريق</th><th>النقاط</th></tr></thead>",
-        "<tbody>"
-    ]
-    for row in standings:
-        table.append(f"<tr><td>{row['team_name']}</td><td>{row['points']}</td></tr>")
-    table.append("</tbody></table>")
-    st.markdown("\n".join(table), unsafe_allow_html=True)
+    st.markdown(
+        cached_fragment(tournament, "overall_points", None,
+                        lambda: _points_table_html(tournament.get_overall_standings())),
+        unsafe_allow_html=True,
+    )
     # Row 3: results per group (single row of tables)
     st.markdown("<div class='section-title'>نتائج المباريات حسب المجموعة</div>", unsafe_allow_html=True)
     if tournament.groups:
         cols = st.columns(max(1, min(4, len(tournament.groups))))
         for i, (gid, group) in enumerate(tournament.groups.items()):
             with cols[i % len(cols)]:
-                # Per-group container with sport-themed background tiles
-                scene_bg = _sport_scene_tile_data_uri(tournament.sport_type.value)
-                emoji_tile = _sport_tile_data_uri(get_sport_icon(tournament.sport_type.value))
-                st.markdown(f"<div class='subsection-title' style='margin-bottom:0.25rem;color:var(--text-strong);'>{group.name}</div>", unsafe_allow_html=True)
-                group_matches = [m for m in tournament.matches.values() if m.group_id == gid]
-                mtable = [
-                    "<table class='pro-table'>",
-                    "<thead><tr><th>الفريق</th><th>النتيجة</th><th>الفريق</th></tr></thead>",
-                    "<tbody>"
-                ]
-                for m in group_matches:
-                    t1 = tournament.teams.get(m.team1_id)
-                    t2 = tournament.teams.get(m.team2_id)
-                    n1 = t1.name if t1 else '—'
-                    n2 = t2.name if t2 else '—'
-                    score = f"{m.team1_score} - {m.team2_score}" if m.is_completed else "—"
-                    mtable.append(f"<tr><td>{n1}</td><td>{score}</td><td>{n2}</td></tr>")
-                mtable.append("</tbody></table>")
-                matches_html = "\n".join(mtable)
+                st.markdown(f"<div class='subsection-title' style='margin-bottom:0.25rem;color:var(--text-strong);'>{escape(group.name)}</div>", unsafe_allow_html=True)
                 st.markdown(
-                    f"""
-                    <div style='padding:8px;border-radius:12px; background-image: {scene_bg}, {emoji_tile};
-                                background-repeat: repeat, repeat; background-size: 180px 180px, 90px 90px; background-color: rgba(255,255,255,0.92);
-                                box-shadow: 0 2px 8px rgba(0,0,0,0.06);'>
-                        {matches_html}
-                    </div>
-                    """,
+                    cached_fragment(tournament, "group_results_tile", gid,
+                                    lambda gid=gid: _group_results_tile_html(tournament, gid)),
                     unsafe_allow_html=True,
                 )
     else:
         st.info("لا توجد مجموعات")
 
+@profiled("page.navbar")
 def render_top_navbar():
     """Render a top navigation bar to replace the right sidebar."""
     nav_label_to_page = {
@@ -651,6 +250,105 @@ def render_top_navbar():
                         st.session_state.page = nav_label_to_page[label]
                         st.rerun()
 
+def _grid_score(value):
+    """Normalize a data_editor score cell: None for empty, else the raw value"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _render_batch_results_grid(tournaments, pending_matches, selected_filter_id):
+    """Editable grid of pending matches submitted as one batch"""
+    group_filter_id = None
+    if selected_filter_id:
+        tournament = tournaments[selected_filter_id]
+        group_options = {"كل المجموعات": None}
+        for gid, grp in tournament.groups.items():
+            group_options[grp.name] = gid
+        if tournament.knockout_matches:
+            group_options["دور الإقصاء"] = "knockout"
+        group_filter_id = group_options[st.selectbox("المجموعة", list(group_options.keys()), key="batch_group_filter")]
+
+    items = []
+    for item in pending_matches:
+        match = item['match']
+        if group_filter_id == "knockout" and item['stage'] != 'knockout':
+            continue
+        if group_filter_id not in (None, "knockout") and match.group_id != group_filter_id:
+            continue
+        items.append(item)
+    if not items:
+        st.info("لا توجد مباريات معلقة مطابقة للمرشح")
+        return
+
+    rows = []
+    for item in items:
+        tournament = tournaments[item['tournament_id']]
+        match = item['match']
+        team1 = tournament.teams.get(match.team1_id)
+        team2 = tournament.teams.get(match.team2_id)
+        if item['stage'] == 'group':
+            group = tournament.groups.get(match.group_id)
+            stage_name = group.name if group else "دور المجموعات"
+        else:
+            stage_name = get_round_name(match.round_type)
+        rows.append({
+            "الدوري": item['tournament_name'],
+            "المرحلة": stage_name,
+            "الفريق 1": team1.name if team1 else 'فريق غير معروف',
+            "نتيجة 1": None,
+            "نتيجة 2": None,
+            "الفريق 2": team2.name if team2 else 'فريق غير معروف',
+        })
+
+    st.caption("أدخل نتائج المباريات التي انتهت ثم احفظ مرة واحدة. الصفوف الفارغة تبقى معلقة.")
+    # A form keeps cell edits client-side until submit (no rerun per keystroke)
+    with st.form(key="batch_results_form"):
+        edited = st.data_editor(
+            rows,
+            key=f"batch_results_grid_{selected_filter_id}_{group_filter_id}",
+            hide_index=True,
+            use_container_width=True,
+            disabled=["الدوري", "المرحلة", "الفريق 1", "الفريق 2"],
+            column_config={
+                "نتيجة 1": st.column_config.NumberColumn(min_value=0, step=1),
+                "نتيجة 2": st.column_config.NumberColumn(min_value=0, step=1),
+            },
+        )
+        submitted = st.form_submit_button("حفظ جميع النتائج", type="primary", use_container_width=True)
+    if not submitted:
+        return
+
+    results = []
+    incomplete = []
+    for item, row in zip(items, edited):
+        score1 = _grid_score(row.get("نتيجة 1"))
+        score2 = _grid_score(row.get("نتيجة 2"))
+        if score1 is None and score2 is None:
+            continue
+        if score1 is None or score2 is None:
+            incomplete.append(f"{row['الفريق 1']} ضد {row['الفريق 2']}")
+            continue
+        results.append((item['tournament_id'], item['match_id'], score1, score2))
+    if incomplete:
+        st.error("يجب إدخال نتيجتي الفريقين: " + "، ".join(incomplete))
+        return
+    if not results:
+        st.warning("لم يتم إدخال أي نتيجة.")
+        return
+    applied, errors = tm.update_match_results(results)
+    if errors:
+        # Nothing was saved; the grid keeps its edits so the rows can be fixed and resubmitted
+        labels = {item['match_id']: f"{row['الفريق 1']} ضد {row['الفريق 2']}" for item, row in zip(items, rows)}
+        st.error("لم يتم حفظ أي نتيجة. صحح التالي ثم أعد الحفظ: "
+                 + "، ".join(f"{labels.get(mid, mid)} ({reason})" for mid, reason in errors))
+        return
+    if applied:
+        st.success(f"تم حفظ {applied} نتيجة.")
+        st.rerun()
+
+@profiled("page.add_results")
 def render_add_results_page():
     """Render add results page"""
     st.title("📝 أضف نتائج")
@@ -707,6 +405,11 @@ def render_add_results_page():
     if not pending_matches:
         st.info("جميع المباريات مكتملة! لا توجد مباريات معلقة.")
         return
+
+    entry_mode = st.radio("طريقة الإدخال", ["مباراة واحدة", "إدخال جماعي"], horizontal=True, key="addres_entry_mode")
+    if entry_mode == "إدخال جماعي":
+        _render_batch_results_grid(tournaments, pending_matches, selected_filter_id)
+        return
     
     st.subheader("اختر المباراة")
 
@@ -763,19 +466,15 @@ def render_add_results_page():
                     st.session_state.addres_idx = (labels.index(selected_match_label) + 1) % len(labels)
                     st.session_state.page = "dashboard"
                     st.rerun()
-                else:
-                    st.error("فشل في تحديث النتيجة")
         
         with col2:
-            if st.button("🤝 تعادل", key="draw", use_container_width=True, type="secondary"):
+            if tournament.sport_type not in NO_DRAW_SPORTS and st.button("🤝 تعادل", key="draw", use_container_width=True, type="secondary"):
                 # Draw: 0-0
                 if tm.update_match_result(selected_item['tournament_id'], match.id, 0, 0):
                     st.success("تم تسجيل التعادل!")
                     st.session_state.addres_idx = (labels.index(selected_match_label) + 1) % len(labels)
                     st.session_state.page = "dashboard"
                     st.rerun()
-                else:
-                    st.error("فشل في تحديث النتيجة")
         
         with col3:
             if st.button(f"🏆 فوز {team2_name}", key="team2_win", use_container_width=True, type="primary"):
@@ -785,8 +484,15 @@ def render_add_results_page():
                     st.session_state.addres_idx = (labels.index(selected_match_label) + 1) % len(labels)
                     st.session_state.page = "dashboard"
                     st.rerun()
-                else:
-                    st.error("فشل في تحديث النتيجة")
+
+        if tournament.sport_type in SET_SPORTS:
+            with st.expander("نتيجة الأشواط", expanded=True):
+                if tm.render_set_entry(tournament, match, f"addres_sets_{match.id}"):
+                    st.success("تم تحديث النتيجة!")
+                    st.session_state.addres_idx = (labels.index(selected_match_label) + 1) % len(labels)
+                    st.session_state.page = "dashboard"
+                    st.rerun()
+            return
 
         # Mobile-responsive custom score section
         with st.expander("نتيجة مخصصة"):
@@ -803,9 +509,68 @@ def render_add_results_page():
                     st.session_state.addres_idx = (labels.index(selected_match_label) + 1) % len(labels)
                     st.session_state.page = "dashboard"
                     st.rerun()
-                else:
-                    st.error("فشل في تحديث النتيجة")
 
+def _step_slide(delta):
+    """Move the slideshow by delta slides and restart the interval timer"""
+    st.session_state.current_slide += delta
+    st.session_state.last_advance_time = time.time()
+
+def _render_slideshow_region():
+    """Render the current auto slide; run as a fragment every slideshow interval."""
+    # After its first run a kiosk only runs this fragment, so keep it counted
+    # as active (main() is not called again) and its process's snapshot fresh
+    metrics.session_seen(kiosk=True)
+    metrics.publish()
+    interval = max(1, int(st.session_state.slideshow_interval))
+    # Timer-driven runs arrive once per interval; allow for scheduling jitter
+    now = time.time()
+    if st.session_state.get("last_advance_time", 0) + interval * 0.9 <= now:
+        if "last_advance_time" in st.session_state:
+            st.session_state.current_slide += 1
+        st.session_state.last_advance_time = now
+    tournaments = tm.get_all_tournaments()
+    tournament_list = list(tournaments.values())
+    if not tournament_list:
+        return
+    # Slide sequence (groups + knockout per tournament), cached per tournament version
+    slides = get_slide_deck(tournament_list)
+    if not slides:
+        st.info("لا توجد شرائح للعرض")
+        return
+    # Determine current slide
+    if st.session_state.get("randomize_slideshow", False):
+        slide = random.choice(slides)
+    else:
+        slide = slides[st.session_state.current_slide % len(slides)]
+    # Apply fullscreen chrome and sport background for slide feel
+    apply_sport_background(slide.sport, fullscreen=True)
+    apply_fullscreen_chrome()
+    # Scale and density were fixed when the slide was built
+    st.markdown(
+        style_tag(slide_canvas_css(slide.scale, slide.cell_padding, slide.font_size, slide.card_padding)),
+        unsafe_allow_html=True,
+    )
+    # Render slide content without overlay
+    _render_auto_slide(slide)
+
+    # Control buttons in normal flow; prev/next only re-run this fragment
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.button("⬅️ السابق", key="prev_btn", on_click=_step_slide, args=(-1,))
+
+    with col2:
+        st.button("التالي ➡️", key="next_btn", on_click=_step_slide, args=(1,))
+
+    with col3:
+        if st.button("⤴️ خروج", key="exit_btn"):
+            st.session_state.auto_mode_running = False
+            st.session_state.viewing_mode = "manual"
+            st.session_state.pop("last_advance_time", None)
+            st.rerun(scope="app")
+
+@profiled("page.view_results")
 def render_view_results_page():
     """Render view results page"""
     if not (st.session_state.viewing_mode == "automatic" and st.session_state.auto_mode_running):
@@ -938,156 +703,9 @@ def render_view_results_page():
                 st.session_state.randomize_slideshow = randomize
         
         if st.session_state.auto_mode_running:
-            tournament_list = list(tournaments.values())
-            if tournament_list:
-                # Build slide sequence (groups + knockout per tournament)
-                slides = _build_auto_slides(tournament_list)
-                if not slides:
-                    st.info("لا توجد شرائح للعرض")
-                    return
-                # Determine current slide
-                if st.session_state.get("randomize_slideshow", False):
-                    tid, kind, payload = random.choice(slides)
-                    # keep current_slide moving for counter feel
-                    st.session_state.current_slide += 1
-                else:
-                    idx = st.session_state.current_slide % len(slides)
-                    tid, kind, payload = slides[idx]
-                current_tournament = tournaments.get(tid)
-                if not current_tournament:
-                    # Skip invalid and advance
-                    st.session_state.current_slide += 1
-                    st.rerun()
-                # Apply fullscreen chrome and sport background for slide feel
-                apply_sport_background(current_tournament.sport_type.value, fullscreen=True)
-                apply_fullscreen_chrome()
-                # Determine scale to fit into one viewport without scrolling
-                s_count = 0
-                m_count = 0
-                if kind == 'group' and payload in current_tournament.groups:
-                    try:
-                        s_count = len(current_tournament.get_group_standings(payload))
-                        m_count = sum(1 for m in current_tournament.matches.values() if m.group_id == payload)
-                    except Exception:
-                        s_count = 0
-                        m_count = 0
-                elif kind == 'knockout':
-                    try:
-                        m_count = len(current_tournament.knockout_matches)
-                    except Exception:
-                        m_count = 0
-                elif kind == 'groups_chunk':
-                    try:
-                        s_count = sum(len(current_tournament.get_group_standings(gid)) for gid in payload)
-                        m_count = sum(1 for m in current_tournament.matches.values())
-                    except Exception:
-                        s_count = 0
-                        m_count = 0
-                total_rows = s_count + m_count
-                scale_val = 1.0
-                if total_rows > 18:
-                    scale_val = 0.95
-                if total_rows > 26:
-                    scale_val = 0.9
-                if total_rows > 34:
-                    scale_val = 0.85
-                if total_rows > 42:
-                    scale_val = 0.8
-                if total_rows > 50:
-                    scale_val = 0.75
-                if total_rows > 60:
-                    scale_val = 0.7
-                if total_rows > 75:
-                    scale_val = 0.65
-                if total_rows > 90:
-                    scale_val = 0.6
-                if total_rows > 110:
-                    scale_val = 0.55
-                if total_rows > 140:
-                    scale_val = 0.5
-                # Dynamic compact table/card styles based on density
-                comp_pad = 6
-                comp_font = 12
-                card_pad = 10
-                if total_rows > 60:
-                    comp_pad = 5
-                    comp_font = 11
-                    card_pad = 8
-                if total_rows > 90:
-                    comp_pad = 4
-                    comp_font = 10
-                    card_pad = 6
-                # Slide styling: fade-in and animated progress bar matching interval
-                interval = max(1, int(st.session_state.slideshow_interval))
-                total_slides = len(slides)
-                current_number = (st.session_state.current_slide % total_slides) + 1 if total_slides else 1
-                st.markdown(
-                    f"""
-                    <style>
-                    @keyframes slideFadeIn {{
-                        from {{ opacity: 0; transform: translateY(6px); }}
-                        to {{ opacity: 1; transform: translateY(0); }}
-                    }}
-                    @keyframes slideProgress {{
-                        from {{ width: 0%; }}
-                        to {{ width: 100%; }}
-                    }}
-                    .autoslide-overlay {{
-                        position: fixed; inset: 0; z-index: 9999;
-                        display: flex; flex-direction: column; align-items: center; justify-content: flex-start;
-                        overflow: hidden; padding: 0 8px 0 8px;
-                    }}
-                    .autoslide-canvas {{
-                        width: 100%; max-width: 1200px;
-                        transform: scale({scale_val}); transform-origin: top center;
-                        animation: slideFadeIn 300ms ease both;
-                    }}
-
-                    /* Compact overrides for group cards/tables to reduce height */
-                    .group-card {{ padding: {card_pad}px; }}
-                    .group-card .pro-table.compact th, .group-card .pro-table.compact td {{ padding: {comp_pad}px 6px; font-size: {comp_font}px; }}
-                    .section-title {{ margin: 0.2rem 0; }}
-                    .subsection-title {{ margin: 0.2rem 0; }}
-                    </style>
-                    """,
-                    unsafe_allow_html=True,
-                )
-                # Render slide content without overlay
-                _render_auto_slide(current_tournament, kind, payload)
-                
-                # Control buttons in normal flow
-                st.markdown("---")
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    if st.button("⬅️ السابق", key="prev_btn"):
-                        st.session_state.current_slide -= 1
-                        # Reset timer to sync with manual navigation
-                        st.session_state.last_advance_time = time.time()
-                        st.rerun()
-                
-                with col2:
-                    if st.button("التالي ➡️", key="next_btn"):
-                        st.session_state.current_slide += 1
-                        # Reset timer to sync with manual navigation
-                        st.session_state.last_advance_time = time.time()
-                        st.rerun()
-                
-                with col3:
-                    if st.button("⤴️ خروج", key="exit_btn"):
-                        st.session_state.auto_mode_running = False
-                        st.session_state.viewing_mode = "manual"
-                        st.rerun()
-                
-                # Synchronized auto-advance timer
-                if st.session_state.get("last_advance_time", 0) + interval <= time.time():
-                    st.session_state.current_slide += 1
-                    st.session_state.last_advance_time = time.time()
-                    st.rerun()
-                else:
-                    # Keep the page responsive by using a short sleep
-                    time.sleep(0.1)
-                    st.rerun()
+            # Only the slide region re-runs on the timer; the page script runs once
+            interval = max(1, int(st.session_state.slideshow_interval))
+            st.fragment(_render_slideshow_region, run_every=interval)()
         else:
             st.info("اضغط على 'بدء العرض التلقائي' لبدء العرض التلقائي للدوريات")
             st.subheader("الدوريات المتاحة")
@@ -1101,6 +719,7 @@ def render_view_results_page():
                     unsafe_allow_html=True,
                 )
 
+@profiled("page.add_teams")
 def render_add_teams_page():
     """Render add teams page"""
     st.title("👥 أضف فرق")
@@ -1122,8 +741,9 @@ def render_add_teams_page():
                     team_name_label = get_team_name_label(selected_sport)
                     team_name = st.text_input(team_name_label, key="team_name_create")
                 else:
-                    st.caption("أدخل كل اسم في سطر منفصل")
+                    st.caption("أدخل كل اسم في سطر منفصل أو ارفع ملف CSV")
                     bulk_names = st.text_area("الأسماء", height=150, key="bulk_names_create")
+                    bulk_csv = st.file_uploader("ملف CSV", type=["csv", "txt"], key="bulk_csv_create")
             
             # Live preview card
             preview_cols = st.columns([2, 1])
@@ -1146,7 +766,7 @@ def render_add_teams_page():
                     st.error("يرجى إدخال اسم الدوري")
                 elif add_mode == "فريق واحد" and not team_name.strip():
                     st.error("يرجى إدخال اسم الفريق/اللاعب")
-                elif add_mode == "عدة فرق" and not bulk_names.strip():
+                elif add_mode == "عدة فرق" and not bulk_names.strip() and bulk_csv is None:
                     st.error("يرجى إدخال الأسماء")
                 else:
                     sport_type = SportType(selected_sport)
@@ -1160,24 +780,28 @@ def render_add_teams_page():
                                 break
                         success_count = 0
                         total = 0
+                        rows, errors = [], []
                         if created_tournament:
                             if add_mode == "فريق واحد":
                                 total = 1
                                 if tm.add_team_to_tournament(created_tournament.id, team_name.strip()):
                                     success_count = 1
                             else:
-                                names = [n.strip() for n in bulk_names.splitlines() if n.strip()]
-                                total = len(names)
-                                for name in names:
-                                    if tm.add_team_to_tournament(created_tournament.id, name):
-                                        success_count += 1
+                                rows = [(f"سطر {n}", name) for n, name in parse_team_names(bulk_names)]
+                                if bulk_csv is not None:
+                                    rows += [(f"CSV صف {n}", name) for n, name in parse_team_csv(bulk_csv.getvalue())]
+                                total = len(rows)
+                                success_count, errors = tm.add_teams_to_tournament(created_tournament.id, [name for _, name in rows])
                         if success_count > 0:
                             st.success(f"تم إنشاء الدوري '{tournament_name}' وإضافة {success_count} من {total} بنجاح!")
-                            st.rerun()
+                            if errors:
+                                tm.render_bulk_errors(rows, errors)
+                            else:
+                                st.rerun()
                         else:
                             st.error("فشل في إضافة أي فريق")
-                    else:
-                        st.error("فشل في إنشاء الدوري")
+                            if errors:
+                                tm.render_bulk_errors(rows, errors)
     
     with tab2:
         st.subheader("إدارة الفرق الموجودة")
@@ -1205,35 +829,31 @@ def render_add_teams_page():
                             if tm.add_team_to_tournament(selected_tournament_id, new_team_name.strip()):
                                 st.success("تم إضافة الفريق بنجاح!")
                                 st.rerun()
-                            else:
-                                st.error("فشل في إضافة الفريق")
                         else:
                             st.error("يرجى إدخال اسم الفريق")
 
                 # Bulk add teams
                 with st.expander("إضافة عدة فرق دفعة واحدة"):
-                    st.caption("أدخل كل اسم في سطر منفصل")
-                    bulk_text = st.text_area("الأسماء", height=150, key="bulk_team_text")
-                    if st.button("إضافة الكل", type="primary", key="bulk_add_btn", use_container_width=True):
-                        names = [n.strip() for n in bulk_text.splitlines() if n.strip()]
-                        if not names:
-                            st.warning("لم يتم العثور على أسماء.")
-                        else:
-                            success_count = 0
-                            for name in names:
-                                if tm.add_team_to_tournament(selected_tournament_id, name):
-                                    success_count += 1
-                            st.success(f"تمت إضافة {success_count} من {len(names)}.")
-                            st.rerun()
+                    tm.render_bulk_team_registration(selected_tournament_id, "bulk_team")
                 
                 # Display and manage existing teams
                 if tournament.teams:
                     st.subheader("الفرق المسجلة")
                     search_query = st.text_input("ابحث عن فريق", key="team_search")
+                    orphan_policy = st.selectbox(
+                        "مباريات الفريق المحذوف",
+                        list(OrphanPolicy),
+                        format_func=lambda p: p.value,
+                        key="team_remove_policy",
+                    )
                     
+                    matching_ids = (
+                        get_search_index(tm.get_all_tournaments()).team_ids(selected_tournament_id, search_query)
+                        if search_query.strip() else None
+                    )
                     # Keep insertion order; only filter
                     for team_id, team in tournament.teams.items():
-                        if search_query and search_query.strip() not in team.name:
+                        if matching_ids is not None and team_id not in matching_ids:
                             continue
                         col1, col2 = st.columns([3, 1])
                         
@@ -1242,7 +862,7 @@ def render_add_teams_page():
                         
                         with col2:
                             if st.button("حذف", key=f"delete_team_{team_id}", type="secondary", use_container_width=True):
-                                if tm.remove_team_from_tournament(selected_tournament_id, team_id):
+                                if tm.remove_team_from_tournament(selected_tournament_id, team_id, orphan_policy):
                                     st.success("تم حذف الفريق بنجاح!")
                                     st.rerun()
                 
@@ -1323,7 +943,7 @@ def render_add_teams_page():
                         
                         for group_id, group in tournament.groups.items():
                             with st.expander(f"{group.name}"):
-                                group_matches = [m for m in tournament.matches.values() if m.group_id == group_id]
+                                group_matches = tournament.get_group_matches(group_id)
                                 
                                 for match in group_matches:
                                     team1 = tournament.teams.get(match.team1_id)
@@ -1383,6 +1003,7 @@ def render_add_teams_page():
         else:
             st.info("لا توجد دوريات متاحة")
 
+@profiled("page.edit_mode")
 def render_edit_mode_page():
     """Render edit mode page"""
     st.title("⚙️ تعديل")
@@ -1431,8 +1052,6 @@ def render_edit_mode_page():
                         if tm.delete_tournament(tournament_id):
                             st.success("تم حذف الدوري بنجاح!")
                             st.rerun()
-                        else:
-                            st.error("فشل في حذف الدوري")
     else:
         st.info("لا توجد دوريات للتعديل")
 
@@ -1441,7 +1060,7 @@ def render_tournament_display(tournament, full_screen=False):
     # Header
     header_tag = "h1" if full_screen else "h2"
     st.markdown(
-        f"<{header_tag} style='text-align:center;margin-bottom:0.5rem;'>{get_sport_icon(tournament.sport_type.value)} {tournament.name}</{header_tag}>",
+        f"<{header_tag} style='text-align:center;margin-bottom:0.5rem;'>{get_sport_icon(tournament.sport_type.value)} {escape(tournament.name)}</{header_tag}>",
         unsafe_allow_html=True,
     )
     st.markdown(f"<div style='text-align:center;margin-bottom:1rem;'><span class='chip chip-accent'>{tournament.sport_type.value}</span></div>", unsafe_allow_html=True)
@@ -1450,37 +1069,22 @@ def render_tournament_display(tournament, full_screen=False):
     if tournament.groups:
         st.markdown("<div class='section-title'>🏁 دور المجموعات</div>", unsafe_allow_html=True)
         for group_id, group in tournament.groups.items():
-            st.markdown(f"<div class='subsection-title'>{group.name}</div>", unsafe_allow_html=True)
-            standings = tournament.get_group_standings(group_id)
-            # Standings table (Team, Points)
-            table = [
-                "<table class='pro-table'>",
-                "<thead><tr><th>الفريق</th><th>النقاط</th></tr></thead>",
-                "<tbody>"
-            ]
-            for row in standings:
-                table.append(f"<tr><td>{row['team_name']}</td><td>{row['points']}</td></tr>")
-            table.append("</tbody></table>")
-            st.markdown("\n".join(table), unsafe_allow_html=True)
+            st.markdown(f"<div class='subsection-title'>{escape(group.name)}</div>", unsafe_allow_html=True)
+            st.markdown(
+                cached_fragment(tournament, "group_standings", group_id,
+                                lambda group_id=group_id: _points_table_html(tournament.get_group_standings(group_id))),
+                unsafe_allow_html=True,
+            )
 
             # Group matches table
-            group_matches = [m for m in tournament.matches.values() if m.group_id == group_id]
+            group_matches = _group_matches(tournament, group_id)
             st.markdown(f"<div class='subsection-title'>نتائج المباريات</div>", unsafe_allow_html=True)
             if group_matches:
-                mtable = [
-                    "<table class='pro-table'>",
-                    "<thead><tr><th>الفريق 1</th><th>النتيجة</th><th>الفريق 2</th></tr></thead>",
-                    "<tbody>"
-                ]
-                for m in group_matches:
-                    t1 = tournament.teams.get(m.team1_id)
-                    t2 = tournament.teams.get(m.team2_id)
-                    n1 = t1.name if t1 else '—'
-                    n2 = t2.name if t2 else '—'
-                    score = f"{m.team1_score} - {m.team2_score}" if m.is_completed else "—"
-                    mtable.append(f"<tr><td>{n1}</td><td>{score}</td><td>{n2}</td></tr>")
-                mtable.append("</tbody></table>")
-                st.markdown("\n".join(mtable), unsafe_allow_html=True)
+                st.markdown(
+                    cached_fragment(tournament, "group_matches", group_id,
+                                    lambda group_matches=group_matches: _matches_table_html(tournament, group_matches)),
+                    unsafe_allow_html=True,
+                )
             else:
                 st.info("لا توجد مباريات في هذه المجموعة")
 
@@ -1493,28 +1097,19 @@ def render_tournament_display(tournament, full_screen=False):
         for round_type in ["semi", "final"]:
             if round_type in rounds:
                 st.markdown(f"<div class='subsection-title'>{get_round_name(round_type)}</div>", unsafe_allow_html=True)
-                ktable = [
-                    "<table class='pro-table'>",
-                    "<thead><tr><th>الفريق 1</th><th>النتيجة</th><th>الفريق 2</th></tr></thead>",
-                    "<tbody>"
-                ]
-                for m in rounds[round_type]:
-                    t1 = tournament.teams.get(m.team1_id)
-                    t2 = tournament.teams.get(m.team2_id)
-                    n1 = t1.name if t1 else '—'
-                    n2 = t2.name if t2 else '—'
-                    score = f"{m.team1_score} - {m.team2_score}" if m.is_completed else "—"
-                    ktable.append(f"<tr><td>{n1}</td><td>{score}</td><td>{n2}</td></tr>")
-                ktable.append("</tbody></table>")
-                st.markdown("\n".join(ktable), unsafe_allow_html=True)
+                st.markdown(
+                    cached_fragment(tournament, "knockout_round", round_type,
+                                    lambda matches=rounds[round_type]: _matches_table_html(tournament, matches)),
+                    unsafe_allow_html=True,
+                )
 
-def render_dashboard():
-    """Render main dashboard"""
-    # Always render dashboard in a single view with auto-compact scaling
-    tournaments = tm.get_all_tournaments()
-    num_tournaments = len(tournaments)
-    num_groups = sum(len(t.groups) for t in tournaments.values())
-    # Heuristic scale to fit content in one view
+# Dashboard sort labels -> summary_index sort keys
+DASHBOARD_SORTS = {"الاسم": "name", "عدد الفرق": "teams", "نسبة الإنجاز": "completion"}
+DASHBOARD_PAGE_SIZES = [6, 9, 12, 24]
+
+
+def _dashboard_scale(num_tournaments, num_groups):
+    """Heuristic scale to fit the visible cards and group tables in one view"""
     scale = 90
     if num_tournaments > 3 or num_groups > 6:
         scale = 85
@@ -1528,7 +1123,20 @@ def render_dashboard():
         scale = 65
     if num_tournaments > 15 or num_groups > 26:
         scale = 60
-    apply_compact_no_scroll(scale)
+    return scale
+
+
+def _set_dashboard_page(page):
+    st.session_state.dash_page = page
+
+
+@profiled("page.dashboard")
+def render_dashboard():
+    """Render main dashboard"""
+    tournaments = tm.get_all_tournaments()
+    # Counts, filters and sort keys come from per-version summaries; only the
+    # visible page touches the tournaments themselves
+    summaries = get_summaries(tournaments)
     # Zero top spacing for a flush top and tighten heading spacing
     st.markdown(
         """
@@ -1572,22 +1180,18 @@ def render_dashboard():
             st.rerun()
     
     # Show quick stats if tournaments exist
-    if tournaments:
+    if summaries:
         # No top separator; go straight to content
         st.subheader("نظرة سريعة")
         
         # Quick statistics
-        total_teams = sum(len(t.teams) for t in tournaments.values())
-        total_matches = sum(len(t.matches) + len(t.knockout_matches) for t in tournaments.values())
-        completed_matches = sum(
-            sum(1 for m in t.matches.values() if m.is_completed) +
-            sum(1 for m in t.knockout_matches.values() if m.is_completed)
-            for t in tournaments.values()
-        )
+        total_teams = sum(s.teams for s in summaries)
+        total_matches = sum(s.total_matches for s in summaries)
+        completed_matches = sum(s.completed for s in summaries)
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("عدد الدوريات", len(tournaments))
+            st.metric("عدد الدوريات", len(summaries))
         with col2:
             st.metric("إجمالي الفرق", total_teams)
         with col3:
@@ -1599,7 +1203,7 @@ def render_dashboard():
         with control_cols[0]:
             search_query = st.text_input("ابحث عن دوري", key="dash_search")
         with control_cols[1]:
-            sort_by = st.selectbox("ترتيب حسب", ["الاسم", "عدد الفرق", "نسبة الإنجاز"], key="dash_sort_by")
+            sort_by = st.selectbox("ترتيب حسب", list(DASHBOARD_SORTS), key="dash_sort_by")
         with control_cols[2]:
             sort_dir_desc = st.checkbox("تنازلي", value=False, key="dash_sort_desc")
         with control_cols[3]:
@@ -1607,54 +1211,51 @@ def render_dashboard():
         with control_cols[4]:
             only_pending = st.checkbox("مباريات معلّقة فقط", value=False, key="dash_only_pending")
 
-        tournaments_list = list(tournaments.values())
-        if search_query:
-            q = search_query.strip()
-            tournaments_list = [t for t in tournaments_list if q in t.name]
-        if sport_filter != "الكل":
-            tournaments_list = [t for t in tournaments_list if t.sport_type.value == sport_filter]
-        def completion_ratio(t):
-            total = len(t.matches) + len(t.knockout_matches)
-            if total == 0:
-                return 0
-            done = sum(1 for m in t.matches.values() if m.is_completed) + sum(1 for m in t.knockout_matches.values() if m.is_completed)
-            return done/total
-        if only_pending:
-            tournaments_list = [t for t in tournaments_list if completion_ratio(t) < 1]
-        if sort_by == "الاسم":
-            tournaments_list.sort(key=lambda t: t.name, reverse=sort_dir_desc)
-        elif sort_by == "عدد الفرق":
-            tournaments_list.sort(key=lambda t: len(t.teams), reverse=sort_dir_desc)
-        else:
-            tournaments_list.sort(key=completion_ratio, reverse=sort_dir_desc)
-        view_mode = st.radio("العرض", ["شبكة", "قائمة"], index=0, key="dash_view_mode")
+        view_cols = st.columns([3, 1])
+        with view_cols[0]:
+            view_mode = st.radio("العرض", ["شبكة", "قائمة"], index=0, key="dash_view_mode", horizontal=True)
+        with view_cols[1]:
+            page_size = st.selectbox("لكل صفحة", DASHBOARD_PAGE_SIZES, index=1, key="dash_page_size")
+
+        # Any filter change starts again from the first page
+        filters = (search_query, sort_by, sort_dir_desc, sport_filter, only_pending, page_size)
+        if st.session_state.get("dash_page_filters") != filters:
+            st.session_state.dash_page_filters = filters
+            st.session_state.dash_page = 0
+        # Tournament names and team/player names, with Arabic spelling variants folded
+        search_ids = get_search_index(tournaments).tournament_ids(search_query) if search_query.strip() else None
+        page_items, matching, page_count = query(
+            summaries,
+            ids=search_ids,
+            sport=None if sport_filter == "الكل" else sport_filter,
+            only_pending=only_pending,
+            sort_by=DASHBOARD_SORTS[sort_by],
+            descending=sort_dir_desc,
+            page=st.session_state.get("dash_page", 0),
+            page_size=page_size,
+        )
+        page = min(st.session_state.get("dash_page", 0), page_count - 1)
+        st.session_state.dash_page = page
+        apply_compact_no_scroll(_dashboard_scale(len(page_items), sum(s.groups for s in page_items)))
+
         num_cols = 3 if view_mode == "شبكة" else 1
-        rows = (len(tournaments_list) + num_cols - 1) // num_cols
-        idx = 0
-        for _ in range(rows):
+        for row_start in range(0, len(page_items), num_cols):
             cols = st.columns(num_cols)
-            for c in range(num_cols):
-                if idx >= len(tournaments_list):
-                    break
-                t = tournaments_list[idx]
+            for c, s in enumerate(page_items[row_start:row_start + num_cols]):
                 with cols[c]:
-                    group_matches_completed = sum(1 for m in t.matches.values() if match_completed(m))
-                    knockout_matches_completed = sum(1 for m in t.knockout_matches.values() if match_completed(m))
-                    total_matches = len(t.matches) + len(t.knockout_matches)
-                    done = group_matches_completed + knockout_matches_completed
-                    ratio = (done / total_matches) if total_matches else 0
+                    ratio = s.completion
                     size_style = "" if view_mode == "شبكة" else "display:flex;align-items:center;gap:1rem;"
                     st.markdown(f"""
                         <div class='ux-card ux-card-accent' style='{size_style}'>
                             <div style='flex:1;'>
                                 <div style='display:flex;align-items:center;justify-content:space-between;'>
-                                    <div style='font-weight:800;'>{get_sport_icon(t.sport_type.value)} {t.name}</div>
-                                    <span class='chip chip-accent'>{t.sport_type.value}</span>
+                                    <div style='font-weight:800;'>{get_sport_icon(s.sport)} {escape(s.name)}</div>
+                                    <span class='chip chip-accent'>{s.sport}</span>
                                 </div>
                                 <div style='margin-top:0.5rem; display:flex; gap:0.75rem; font-size:0.9rem; flex-wrap:wrap;'>
-                                    <div>👥 {len(t.teams)} فريق</div>
-                                    <div>📊 المجموعات: {group_matches_completed}/{len(t.matches)}</div>
-                                    <div>🥇 الإقصاء: {knockout_matches_completed}/{len(t.knockout_matches)}</div>
+                                    <div>👥 {s.teams} فريق</div>
+                                    <div>📊 المجموعات: {s.group_completed}/{s.group_matches}</div>
+                                    <div>🥇 الإقصاء: {s.knockout_completed}/{s.knockout_matches}</div>
                                 </div>
                                 <div style='margin-top:0.5rem;'>
                                     <div style='height:8px;background:var(--border);border-radius:999px;overflow:hidden;'>
@@ -1667,70 +1268,70 @@ def render_dashboard():
                     """, unsafe_allow_html=True)
                     b1, b2 = st.columns(2)
                     with b1:
-                        if st.button("📺 عرض", key=f"dash_view_{t.id}", use_container_width=True):
-                            st.session_state.preselect_tournament = t.id
+                        if st.button("📺 عرض", key=f"dash_view_{s.id}", use_container_width=True):
+                            st.session_state.preselect_tournament = s.id
                             st.session_state.page = "view_results"
                             st.rerun()
                     with b2:
-                        if st.button("📝 إضافة نتيجة", key=f"dash_addres_{t.id}", use_container_width=True):
-                            st.session_state.preselect_add_results_tournament = t.id
+                        if st.button("📝 إضافة نتيجة", key=f"dash_addres_{s.id}", use_container_width=True):
+                            st.session_state.preselect_add_results_tournament = s.id
                             st.session_state.page = "add_results"
                             st.rerun()
                     b3, b4 = st.columns(2)
                     with b3:
-                        if st.button("👥 إدارة الفرق", key=f"dash_team_{t.id}", use_container_width=True):
-                            st.session_state.current_tournament = t.id
+                        if st.button("👥 إدارة الفرق", key=f"dash_team_{s.id}", use_container_width=True):
+                            st.session_state.current_tournament = s.id
                             st.session_state.page = "team_management"
                             st.rerun()
                     with b4:
-                        if st.button("🤝 إدارة المباريات", key=f"dash_match_{t.id}", use_container_width=True):
-                            st.session_state.current_tournament = t.id
+                        if st.button("🤝 إدارة المباريات", key=f"dash_match_{s.id}", use_container_width=True):
+                            st.session_state.current_tournament = s.id
                             st.session_state.page = "match_management"
                             st.rerun()
-                idx += 1
-        # Group tables section on dashboard
+        if not page_items:
+            st.info("لا توجد دوريات مطابقة")
+
+        # Pagination controls
+        if page_count > 1:
+            nav_prev, nav_label, nav_next = st.columns([1, 2, 1])
+            with nav_prev:
+                st.button("→ السابق", key="dash_page_prev", use_container_width=True,
+                          disabled=page == 0, on_click=_set_dashboard_page, args=(page - 1,))
+            with nav_label:
+                st.markdown(
+                    f"<div style='text-align:center;'>صفحة {page + 1} من {page_count} · {matching} دوري</div>",
+                    unsafe_allow_html=True,
+                )
+            with nav_next:
+                st.button("التالي ←", key="dash_page_next", use_container_width=True,
+                          disabled=page >= page_count - 1, on_click=_set_dashboard_page, args=(page + 1,))
+
+        # Group tables section on dashboard, for the tournaments on this page
         st.markdown("---")
         st.subheader("جداول المجموعات")
-        for t_id, t in tournaments.items():
-            if t.groups:
+        for s in page_items:
+            t = tournaments.get(s.id)
+            if t and t.groups:
                 with st.container():
                     st.markdown(
-                        f"<div class='section-title'>{get_sport_icon(t.sport_type.value)} {t.name}</div>",
+                        f"<div class='section-title'>{get_sport_icon(t.sport_type.value)} {escape(t.name)}</div>",
                         unsafe_allow_html=True,
                     )
                     # Render this tournament's groups inside an isolated grid container
-                    scene_bg = _sport_scene_tile_data_uri(t.sport_type.value)
-                    emoji_tile = _sport_tile_data_uri(get_sport_icon(t.sport_type.value))
                     groups = list(t.groups.items())
                     per_row = max(1, min(4, len(groups)))
                     for row_start in range(0, len(groups), per_row):
                         cols = st.columns(per_row)
                         for j, (gid, group) in enumerate(groups[row_start:row_start+per_row]):
                             with cols[j]:
-                                standings = t.get_group_standings(gid)
-                                table_lines = [
-                                    "<table class='pro-table'>",
-                                    "<thead><tr><th>الفريق</th><th>النقاط</th></tr></thead>",
-                                    "<tbody>"
-                                ]
-                                for row in standings:
-                                    table_lines.append(f"<tr><td>{row['team_name']}</td><td>{row['points']}</td></tr>")
-                                table_lines.append("</tbody></table>")
-                                table_html = "\n".join(table_lines)
-                                container_html = f"""
-                                <div style='padding:8px;border-radius:12px;
-                                            background-image: {scene_bg}, {emoji_tile};
-                                            background-repeat: repeat, repeat;
-                                            background-size: 180px 180px, 90px 90px;
-                                            background-color: rgba(255,255,255,0.92);
-                                            box-shadow: 0 2px 8px rgba(0,0,0,0.06);'>
-                                    <div class='subsection-title' style='margin:0 0 0.25rem 0;color:var(--text-strong);'>{group.name}</div>
-                                    {table_html}
-                                </div>
-                                """
-                                st.markdown(container_html, unsafe_allow_html=True)
+                                st.markdown(
+                                    cached_fragment(t, "group_points_tile", gid,
+                                                    lambda t=t, gid=gid: _group_points_tile_html(t, gid)),
+                                    unsafe_allow_html=True,
+                                )
                 st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
     else:
+        apply_compact_no_scroll(_dashboard_scale(0, 0))
         st.markdown("---")
         st.markdown(
             """
@@ -1747,8 +1348,8 @@ def render_dashboard():
                 st.session_state.page = "add_teams"
                 st.rerun()
 
-def main():
-    """Main application function"""
+def _render_app():
+    """Render the navbar and the current page"""
     # Global UI baseline
     inject_global_styles()
     # Only show navbar on interactive pages, not on dashboard or auto slideshow
@@ -1764,6 +1365,16 @@ def main():
         render_top_navbar()
     # (Top back button removed to avoid whitespace)
 
+    # Display pages follow other sessions' commits without a DB read per viewer
+    if st.session_state.page == "dashboard" or (
+        st.session_state.page == "view_results" and st.session_state.viewing_mode == "manual"
+    ):
+        live = get_live_scoring()
+        st.session_state.live_generation = live.generation
+        _watch_for_changes()
+        if live.live():
+            st.fragment(_render_live_strip, run_every=LIVE_REFRESH_INTERVAL)()
+
     # Route to appropriate page
     if st.session_state.page == "dashboard":
         render_dashboard()
@@ -1823,5 +1434,14 @@ def main():
                 del st.session_state.current_tournament
             st.rerun()
 
+def main():
+    """Main application function"""
+    metrics.reruns.inc()
+    metrics.session_seen(kiosk=st.session_state.page == "view_results" and st.session_state.auto_mode_running)
+    with rerun(st.session_state.page):
+        _render_app()
+    render_panel()
+    metrics.publish()
+
 if __name__ == "__main__":
     main()
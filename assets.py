@@ -0,0 +1,115 @@
+"""Content-hashed static assets (CSS and SVG backgrounds).
+
+The theme's large, unchanging pieces are written once per process as
+files named <name>.<hash>.<ext>, so browsers can cache them forever and
+a new deploy changes the URL. Streamlit serves them from ./static at
+app/static/... when server.enableStaticServing is on; the kiosk export
+writes the same files next to its index.html.
+
+Streamlit releases that serve app static files as text/plain with
+nosniff (only images, fonts, pdf, json and xml get their real type)
+would block CSS and SVG, so static_serving_available() reports False
+there and pages keep the inline, memoized theme.
+"""
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+from models import SportType
+from theme import GLOBAL_CSS, SLIDE_CSS, GROUPS_GRID_CSS, sport_scene_svg, sport_tile_svg
+from utils import get_sport_icon
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+
+
+def asset_sources() -> Dict[str, tuple]:
+    """Logical asset name -> (extension, content)"""
+    sources = {
+        "global": ("css", GLOBAL_CSS),
+        "slides": ("css", SLIDE_CSS + GROUPS_GRID_CSS),
+    }
+    for sport in SportType:
+        sources[f"scene-{sport.value}"] = ("svg", sport_scene_svg(sport.value))
+        sources[f"tile-{sport.value}"] = ("svg", sport_tile_svg(get_sport_icon(sport.value)))
+    return sources
+
+
+def _file_stem(name: str) -> str:
+    """ASCII file stem for a logical name (sport names are Arabic)"""
+    if name.isascii():
+        return name
+    prefix = name.split("-", 1)[0]
+    return f"{prefix}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+
+def write_assets(out_dir: str) -> Dict[str, str]:
+    """Write every asset as <stem>.<hash>.<ext> into out_dir; return name -> file name.
+
+    Files are only written when missing, and older hashes of the same
+    stem are removed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    existing = set(os.listdir(out_dir))
+    files: Dict[str, str] = {}
+    for name, (ext, content) in asset_sources().items():
+        data = content.encode("utf-8")
+        stem = _file_stem(name)
+        file_name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+        if file_name not in existing:
+            tmp_path = os.path.join(out_dir, f".{file_name}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(out_dir, file_name))
+        for old in existing:
+            if old != file_name and old.startswith(f"{stem}.") and old.endswith(f".{ext}"):
+                try:
+                    os.remove(os.path.join(out_dir, old))
+                except OSError:
+                    pass
+        files[name] = file_name
+    return files
+
+
+_files: Optional[Dict[str, str]] = None
+_lock = threading.Lock()
+
+
+def static_serving_available() -> bool:
+    """True if Streamlit serves ./static with real CSS/SVG content types"""
+    try:
+        from streamlit import config
+        if not config.get_option("server.enableStaticServing"):
+            return False
+    except Exception:
+        return False
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        # Servers without the allow-list send the guessed content type
+        return True
+    return ".css" in SAFE_APP_STATIC_FILE_EXTENSIONS and ".svg" in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+
+def static_asset_url(name: str) -> Optional[str]:
+    """app/static URL of an asset, or None when pages must inline it"""
+    global _files
+    if _files is None:
+        with _lock:
+            if _files is None:
+                try:
+                    _files = write_assets(STATIC_DIR) if static_serving_available() else {}
+                except OSError as e:
+                    print(f"Static assets unavailable: {e}")
+                    _files = {}
+    file_name = _files.get(name)
+    return f"{STATIC_URL}/{file_name}" if file_name else None
+
+
+def stylesheet(name: str, inline_css: str) -> str:
+    """A <style> block importing the static stylesheet, or inlining it as a fallback"""
+    url = static_asset_url(name)
+    if url:
+        return f"<style>@import url('{url}');</style>"
+    return f"<style>\n{inline_css}</style>"
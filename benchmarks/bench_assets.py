@@ -0,0 +1,84 @@
+"""Per-rerun theme payload and build time: inline CSS/SVG vs hashed static assets.
+
+Measures the style markup one slideshow rerun sends (global styles,
+sport background, slide styles) and one dashboard group tile, built the
+old way (data URIs rebuilt and URL-encoded on every call), memoized
+inline, and as references to the static files written by assets.py:
+
+    python benchmarks/bench_assets.py [--number 2000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import theme  # noqa: E402
+from assets import STATIC_URL, write_assets  # noqa: E402
+from models import SportType  # noqa: E402
+from utils import get_sport_icon  # noqa: E402
+
+SPORT = SportType.FOOTBALL.value
+
+
+def legacy_payload() -> str:
+    """Rebuild everything per call, as app.py did before the assets pipeline"""
+    scene = f"url('data:image/svg+xml;utf8,{urllib.parse.quote(theme.sport_scene_svg(SPORT))}')"
+    tile = f"url('data:image/svg+xml;utf8,{urllib.parse.quote(theme.sport_tile_svg(get_sport_icon(SPORT)))}')"
+    background = theme._sport_background_style.__wrapped__(SPORT, True, None)
+    return (
+        theme.style_tag(theme.GLOBAL_CSS)
+        + theme.style_tag(background)
+        + theme.style_tag(theme.SLIDE_CSS)
+        + f"<div style='background-image: {scene}, {tile};'></div>"
+    )
+
+
+def inline_payload() -> str:
+    scene, tile = theme.sport_tile_layers(SPORT)
+    return (
+        theme.style_tag(theme.GLOBAL_CSS)
+        + theme.style_tag(theme.sport_background_style(SPORT, True))
+        + theme.style_tag(theme.SLIDE_CSS)
+        + f"<div style='background-image: {scene}, {tile};'></div>"
+    )
+
+
+def make_static_payload(files):
+    def asset_url(name):
+        return f"{STATIC_URL}/{files[name]}" if name in files else None
+
+    def static_payload() -> str:
+        scene, tile = theme.sport_tile_layers(SPORT, asset_url)
+        return (
+            f"<style>@import url('{asset_url('global')}');</style>"
+            + theme.style_tag(theme.sport_background_style(SPORT, True, asset_url))
+            + f"<style>@import url('{asset_url('slides')}');</style>"
+            + f"<div style='background-image: {scene}, {tile};'></div>"
+        )
+    return static_payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    out_dir = tempfile.mkdtemp()
+    files = write_assets(out_dir)
+    for label, func in (
+        ("legacy inline", legacy_payload),
+        ("memoized inline", inline_payload),
+        ("static assets", make_static_payload(files)),
+    ):
+        payload = func()
+        best = min(timeit.repeat(func, repeat=5, number=args.number)) / args.number * 1e6
+        print(f"{label:>16}: {len(payload.encode('utf-8')):6d} bytes per rerun, {best:7.1f} µs to build")
+    total = sum(os.path.getsize(os.path.join(out_dir, name)) for name in files.values())
+    print(f"{'static files':>16}: {len(files)} files, {total} bytes, fetched once and cached by the browser")
+
+
+if __name__ == "__main__":
+    main()
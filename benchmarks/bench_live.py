@@ -0,0 +1,111 @@
+"""Live scoring under load: taps on several matches next to normal result commits.
+
+    python benchmarks/bench_live.py --matches 4 --rate 30 --duration 10
+
+Each live match gets its own thread tapping +1 at --rate taps per second,
+as a scorekeeper would, while another thread commits ordinary results
+through TournamentService (a full-store write each). Reports tap and
+commit p50/p99 latencies, the taps actually sustained per match, and
+how often a viewing session reloaded the store: at most once per commit,
+since live events do not touch the tournaments blob.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from load_test import percentile  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=4, help="matches scored live at once")
+    parser.add_argument("--rate", type=float, default=30.0, help="taps per second per match")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--tournaments", type=int, default=10, help="store size, for the cost of ordinary commits")
+    args = parser.parse_args()
+
+    # utils resolves the database path at import time
+    os.environ["TOURNAMENT_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="tournament-live-"), "live.db")
+    from synthetic import make_store
+    from utils import save_tournaments
+    from change_feed import get_change_feed
+    from live_scoring import get_live_scoring
+    from tournament_service import TournamentService
+
+    store = make_store(args.tournaments, 16, 4, completion=0.0)
+    save_tournaments(store)
+    matches = [(tid, mid) for tid, t in store.items() for mid in t.matches]
+    live_matches, other_matches = matches[:args.matches], matches[args.matches:]
+    feed = get_change_feed()
+    live = get_live_scoring()
+    scorekeeper = TournamentService(watch_mtime=lambda: feed.store_mtime)
+    for tournament_id, match_id in live_matches:
+        live.start(scorekeeper, tournament_id, match_id)
+
+    stop = threading.Event()
+    tap_latencies, commit_latencies = [], []
+    taps = [0] * len(live_matches)
+    reloads = [0]
+
+    def tapper(index: int, match_id: str):
+        interval = 1.0 / args.rate
+        due = time.perf_counter()
+        while not stop.is_set():
+            start = time.perf_counter()
+            live.point(match_id, 1 + index % 2)
+            tap_latencies.append(time.perf_counter() - start)
+            taps[index] += 1
+            due += interval
+            wait = due - time.perf_counter()
+            if wait > 0 and stop.wait(wait):
+                break
+
+    def committer():
+        # Its own service, like another Streamlit session entering results
+        service = TournamentService(watch_mtime=lambda: feed.store_mtime)
+        for round_no, (tournament_id, match_id) in enumerate(other_matches * 100):
+            if stop.is_set():
+                break
+            start = time.perf_counter()
+            service.refresh_if_changed()
+            service.update_match_result(tournament_id, match_id, round_no % 5, 1)
+            commit_latencies.append(time.perf_counter() - start)
+            stop.wait(0.2)
+
+    def viewer():
+        # A display session checking for changes, as _watch_for_changes does
+        service = TournamentService(watch_mtime=lambda: feed.store_mtime)
+        while not stop.wait(0.05):
+            if service.refresh_if_changed():
+                reloads[0] += 1
+
+    threads = [threading.Thread(target=tapper, args=(i, mid), daemon=True) for i, (_, mid) in enumerate(live_matches)]
+    threads.append(threading.Thread(target=committer, daemon=True))
+    threads.append(threading.Thread(target=viewer, daemon=True))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=10)
+    elapsed = time.perf_counter() - started
+
+    print(f"{'taps':>10}: {len(tap_latencies)} in {elapsed:.1f} s, "
+          f"{min(taps) / elapsed:.1f}-{max(taps) / elapsed:.1f}/s per match (target {args.rate:g}), "
+          f"p50 {percentile(tap_latencies, 50) * 1000:.2f} ms, p99 {percentile(tap_latencies, 99) * 1000:.2f} ms")
+    print(f"{'commits':>10}: {len(commit_latencies)}, "
+          f"p50 {percentile(commit_latencies, 50) * 1000:.1f} ms, p99 {percentile(commit_latencies, 99) * 1000:.1f} ms")
+    print(f"{'live':>10}: " + ", ".join(f"{score.team1}-{score.team2}" for score in live.live()))
+    print(f"{'reloads':>10}: {reloads[0]} by a viewing session for {len(commit_latencies)} commits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Model-layer benchmarks with a JSON baseline.
+
+Times serialization, storage, standings, slide building and group
+generation on synthetic tournaments (benchmarks/synthetic.py):
+
+    python benchmarks/bench_model.py                        # compare with the baseline
+    python benchmarks/bench_model.py --output results.json  # also write the results
+    python benchmarks/bench_model.py --update-baseline      # record a new baseline
+
+Each case reports the best and median time per call over --repeat runs.
+A case whose median is more than --tolerance slower than the baseline
+(and by at least 0.05 ms) is a regression, and the script exits with
+status 1. The baseline is only compared when it was recorded with the
+same sizes. Timings are machine-specific, so record the baseline on the
+machine that runs the comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+DEFAULT_BASELINE = os.path.join(HERE, "baseline_model.json")
+# Regressions smaller than this are timer noise
+MIN_DELTA_MS = 0.05
+
+
+def build_cases(args):
+    """name -> zero-argument callable; imports utils only after the DB path is set"""
+    from html_cache import get_fragment_cache
+    from models import Tournament
+    from slides import build_tournament_slides
+    from synthetic import make_store, make_tournament
+    from utils import save_tournaments, load_tournaments
+
+    tournament = make_tournament(args.teams, args.groups, args.completion, args.knockout_depth, seed=1)
+    data = tournament.to_dict()
+    store = make_store(args.tournaments, args.teams, args.groups, args.completion, args.knockout_depth)
+    save_tournaments(store)
+    fragments = get_fragment_cache()
+    teams_per_group = -(-args.teams // args.groups)
+
+    def group_standings():
+        for group_id in tournament.groups:
+            tournament.get_group_standings(group_id)
+
+    def slides():
+        # Slide bodies are cached per version; time a cold build
+        fragments.clear()
+        build_tournament_slides(tournament)
+
+    def regroup():
+        tournament.create_groups(teams_per_group)
+        tournament.generate_group_matches()
+
+    return {
+        "tournament.to_dict": tournament.to_dict,
+        "tournament.from_dict": lambda: Tournament.from_dict(data),
+        "store.save": lambda: save_tournaments(store),
+        "store.load": load_tournaments,
+        "standings.group_all": group_standings,
+        "standings.overall": tournament.get_overall_standings,
+        "slides.build_tournament": slides,
+        # Runs last: it replaces the groups and matches of the shared tournament
+        "groups.create_and_generate": regroup,
+    }
+
+
+def run_case(func, repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    runs = [t / number * 1000 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best_ms": round(min(runs), 4), "median_ms": round(statistics.median(runs), 4), "number": number}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Print a comparison table and return the names of regressed cases"""
+    regressions = []
+    print(f"\n{'case':<28}{'baseline':>12}{'now':>12}{'change':>10}")
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<28}{'—':>12}{now['median_ms']:>10.3f}ms{'new':>10}")
+            continue
+        change = now["median_ms"] / before["median_ms"] - 1 if before["median_ms"] else 0.0
+        regressed = change > tolerance and now["median_ms"] - before["median_ms"] >= MIN_DELTA_MS
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<28}{before['median_ms']:>10.3f}ms{now['median_ms']:>10.3f}ms{change:>+9.0%}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=20)
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--groups", type=int, default=8)
+    parser.add_argument("--completion", type=float, default=0.75)
+    parser.add_argument("--knockout-depth", type=int, default=0, choices=(0, 1, 2))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a regression")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args()
+
+    # utils resolves the database path at import time
+    os.environ["TOURNAMENT_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="tournament-bench-"), "bench.db")
+    sizes = {
+        "tournaments": args.tournaments, "teams": args.teams, "groups": args.groups,
+        "completion": args.completion, "knockout_depth": args.knockout_depth,
+    }
+    results = {}
+    for name, func in build_cases(args).items():
+        results[name] = run_case(func, args.repeat, args.min_time)
+        print(f"{name:<28} best {results[name]['best_ms']:9.3f} ms, median {results[name]['median_ms']:9.3f} ms")
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f"no baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+    if baseline.get("meta", {}).get("sizes") != sizes:
+        print(f"baseline was recorded with sizes {baseline.get('meta', {}).get('sizes')}; not comparing")
+        return
+    regressions = compare(results, baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
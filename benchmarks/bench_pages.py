@@ -0,0 +1,270 @@
+"""End-to-end rerun benchmark of every page through streamlit.testing.v1.AppTest.
+
+Loads a synthetic store (benchmarks/synthetic.py) into a temporary
+database and, for each page route in app.main(), measures the full script
+rerun time, the number of widgets on the page and the bytes of the delta
+messages sent to the browser:
+
+    python benchmarks/bench_pages.py
+    python benchmarks/bench_pages.py --tournaments 60 --budget dashboard=800 --output pages.json
+
+Each page gets its own session. The first run is a warmup (it fills the
+process-wide caches as a real server would); the reported time is the
+median and worst of --runs reruns after it. Message bytes come from the
+render profiler (profiling.py), which this script turns on.
+
+A page whose median rerun time or payload is over its budget fails the
+run with exit status 1. Budgets are deliberately loose defaults for a
+laptop; tighten them with --budget PAGE=MS and --budget-kib PAGE=KIB.
+
+--kiosk-cpu SECONDS instead measures the process CPU one slideshow kiosk
+costs over that wall-clock window, twice. "busy-wait" replays the loop
+the automatic view used before it moved to a timer fragment: a full
+script run, time.sleep(0.1), rerun. "fragment" is what a browser's
+run_every timer does now: one run of the slideshow fragment per
+--kiosk-interval. Both include AppTest's own per-run overhead.
+
+    python benchmarks/bench_pages.py --kiosk-cpu 20
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+# page name -> session state that routes app.main() to it
+PAGES = {
+    "dashboard": {"page": "dashboard"},
+    "add_results": {"page": "add_results"},
+    "view_results_manual": {"page": "view_results", "viewing_mode": "manual"},
+    "view_results_auto": {"page": "view_results", "viewing_mode": "automatic", "auto_mode_running": True},
+    "add_teams": {"page": "add_teams"},
+    "edit_mode": {"page": "edit_mode"},
+    "team_management": {"page": "team_management", "current_tournament": None},
+    "match_management": {"page": "match_management", "current_tournament": None},
+    "match_hub": {"page": "match_hub"},
+}
+
+# page -> (median rerun ms, payload KiB) for the default store sizes
+DEFAULT_BUDGETS = {
+    "dashboard": (1000, 400),
+    "add_results": (1500, 400),
+    "view_results_manual": (1000, 300),
+    "view_results_auto": (600, 200),
+    "add_teams": (1000, 300),
+    "edit_mode": (1000, 300),
+    "team_management": (1000, 300),
+    "match_management": (1000, 300),
+    "match_hub": (500, 100),
+}
+
+WIDGET_KINDS = (
+    "button", "checkbox", "color_picker", "date_input", "multiselect", "number_input", "radio",
+    "select_slider", "selectbox", "slider", "text_area", "text_input", "time_input", "toggle",
+)
+
+
+def widget_count(at) -> int:
+    return sum(len(getattr(at, kind)) for kind in WIDGET_KINDS)
+
+
+def run_page(name: str, state: dict, runs: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    times, payloads = [], []
+    for _ in range(runs):
+        if name == "view_results_auto":
+            # Due for the next slide, as when the fragment timer fires
+            at.session_state.last_advance_time = 0
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        last = at.session_state["_profile_last"] if "_profile_last" in at.session_state else {}
+        payloads.append(last.get("payload_bytes", 0))
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 1),
+        "max_ms": round(max(times) * 1000, 1),
+        "widgets": widget_count(at),
+        "payload_kib": round(statistics.median(payloads) / 1024, 1),
+        "errors": [str(e.value) for e in at.exception][:3],
+        # A page that bounced elsewhere (e.g. to the dashboard) measured the wrong thing
+        "routed": at.session_state.page == state["page"],
+    }
+
+
+# The pre-fragment automatic view slept this long before every st.rerun()
+BUSY_WAIT_SLEEP = 0.1
+
+
+def fragment_rerun(at, fragment_id: str):
+    """Run only one fragment, as its run_every timer does in a browser session"""
+    from streamlit.testing.v1 import local_script_runner
+
+    rerun_data = local_script_runner.RerunData
+    local_script_runner.RerunData = functools.partial(rerun_data, fragment_id_queue=[fragment_id], is_auto_rerun=True)
+    try:
+        at.run()
+    finally:
+        local_script_runner.RerunData = rerun_data
+
+
+def kiosk_cpu(window: float, interval: int) -> dict:
+    """Process CPU share of one slideshow kiosk over window seconds, busy-wait loop vs timer fragment"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    for key, value in PAGES["view_results_auto"].items():
+        at.session_state[key] = value
+    at.session_state.slideshow_interval = interval
+    at.run()
+    # The automatic view registers a single fragment: the slideshow region
+    fragment_id = next(iter(at._fragment_storage._fragments))
+    start_slide = at.session_state.current_slide
+
+    def measure(tick) -> dict:
+        runs, run_cpu = 0, []
+        wall, cpu = time.perf_counter(), time.process_time()
+        while time.perf_counter() - wall < window:
+            before = time.process_time()
+            tick()
+            run_cpu.append(time.process_time() - before)
+            runs += 1
+        elapsed, used = time.perf_counter() - wall, time.process_time() - cpu
+        return {
+            "runs": runs,
+            "cpu_per_run_ms": round(statistics.median(run_cpu) * 1000, 1),
+            "cpu_share": round(used / elapsed, 4),
+        }
+
+    def busy_wait():
+        at.run()
+        time.sleep(BUSY_WAIT_SLEEP)
+
+    def timer_tick():
+        due = time.perf_counter() + interval
+        fragment_rerun(at, fragment_id)
+        time.sleep(max(0.0, min(due, time.perf_counter() + window) - time.perf_counter()))
+
+    busy = measure(busy_wait)
+    fragment = measure(timer_tick)
+    fragment["advanced"] = at.session_state.current_slide != start_slide
+    fragment["errors"] = [str(e.value) for e in at.exception][:3]
+    return {"busy_wait": busy, "fragment": fragment}
+
+
+def parse_budgets(values, parser) -> dict:
+    budgets = {}
+    for value in values or ():
+        page, _, amount = value.partition("=")
+        if page not in PAGES:
+            parser.error(f"unknown page {page!r}; pages: {', '.join(PAGES)}")
+        try:
+            budgets[page] = float(amount)
+        except ValueError:
+            parser.error(f"budget for {page} must be a number")
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=30)
+    parser.add_argument("--teams", type=int, default=16)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--completion", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=5, help="measured reruns per page after one warmup")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--budget", action="append", metavar="PAGE=MS", help="median rerun budget in ms")
+    parser.add_argument("--budget-kib", action="append", metavar="PAGE=KIB", help="payload budget in KiB")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--kiosk-cpu", type=float, metavar="SECONDS",
+                        help="measure one slideshow kiosk's CPU over this window instead of the pages")
+    parser.add_argument("--kiosk-interval", type=int, default=10, help="slideshow seconds per slide for --kiosk-cpu")
+    args = parser.parse_args()
+    time_budgets = {page: ms for page, (ms, _) in DEFAULT_BUDGETS.items()}
+    time_budgets.update(parse_budgets(args.budget, parser))
+    size_budgets = {page: kib for page, (_, kib) in DEFAULT_BUDGETS.items()}
+    size_budgets.update(parse_budgets(args.budget_kib, parser))
+
+    workdir = tempfile.mkdtemp(prefix="tournament-pages-")
+    # utils resolves the database path and profiling its switch at import time
+    os.environ["TOURNAMENT_DB_PATH"] = os.path.join(workdir, "pages.db")
+    os.environ["TOURNAMENT_PROFILE"] = "1"
+    os.environ["TOURNAMENT_PROFILE_LOG"] = os.path.join(workdir, "profile.log")
+    os.chdir(ROOT)
+    try:
+        from streamlit.runtime.scriptrunner_utils import script_run_context
+        from synthetic import make_store
+        from utils import save_tournaments
+
+        logging.getLogger(script_run_context.__name__).addFilter(lambda record: record.levelno >= logging.ERROR)
+        store = make_store(args.tournaments, args.teams, args.groups, args.completion)
+        save_tournaments(store)
+        first_id = next(iter(store))
+
+        if args.kiosk_cpu:
+            report = kiosk_cpu(args.kiosk_cpu, args.kiosk_interval)
+            for mode, result in report.items():
+                print(f"{mode:<10} {result['runs']:>5} runs in {args.kiosk_cpu:g} s, "
+                      f"{result['cpu_per_run_ms']:>7.1f} ms CPU per run, {result['cpu_share'] * 100:6.1f}% of a core")
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(report, f, indent=2)
+            fragment = report["fragment"]
+            if fragment["errors"] or not fragment["advanced"]:
+                print(f"FAIL fragment run: {fragment['errors'][:1] or 'the slide did not advance'}")
+                sys.exit(1)
+            return
+
+        results, failures = {}, []
+        print(f"{'page':<22}{'median':>10}{'max':>10}{'widgets':>9}{'payload':>12}")
+        for name in args.pages:
+            state = {key: first_id if value is None else value for key, value in PAGES[name].items()}
+            result = run_page(name, state, args.runs)
+            results[name] = result
+            over = []
+            if result["median_ms"] > time_budgets[name]:
+                over.append(f"{result['median_ms']:.0f} ms > {time_budgets[name]:.0f} ms")
+            if result["payload_kib"] > size_budgets[name]:
+                over.append(f"{result['payload_kib']:.0f} KiB > {size_budgets[name]:.0f} KiB")
+            if result["errors"]:
+                over.append(f"exception: {result['errors'][0]}")
+            if not result["routed"]:
+                over.append("did not stay on the page")
+            if over:
+                failures.append(f"{name}: {'; '.join(over)}")
+            print(f"{name:<22}{result['median_ms']:>8.0f}ms{result['max_ms']:>8.0f}ms{result['widgets']:>9}"
+                  f"{result['payload_kib']:>8.1f} KiB{'  OVER BUDGET' if over else ''}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        report = {
+            "sizes": {"tournaments": args.tournaments, "teams": args.teams, "groups": args.groups,
+                      "completion": args.completion, "runs": args.runs},
+            "budgets": {page: {"ms": time_budgets[page], "kib": size_budgets[page]} for page in args.pages},
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Search latency: trigram index (search.py) vs a linear normalized scan.
+
+Indexes a synthetic store of tournaments with Arabic team names
+(about 40 entries per tournament) and times typical dashboard queries:
+
+    python benchmarks/bench_search.py [--tournaments 1000] [--number 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Tournament, Team, SportType  # noqa: E402
+from search import SearchIndex, normalize_arabic  # noqa: E402
+
+FIRST_NAMES = ["أحمد", "إبراهيم", "مصطفى", "فاطمة", "آمنة", "يوسف", "عائشة", "حمزة", "مريم", "عبد الله"]
+FAMILY_NAMES = ["الأمين", "السيد", "الحسيني", "القرشي", "المصري", "الشامي", "البغدادي", "النجار"]
+CLUBS = ["نادي", "مدرسة", "أكاديمية", "فريق"]
+QUERIES = ["ابراهيم", "مدرسه", "مصطفي", "امين", "حم", "دوري 12", "xyz"]
+
+
+def build_store(count: int):
+    rng = random.Random(41)
+    sports = list(SportType)
+    tournaments = {}
+    for k in range(count):
+        sport = sports[k % len(sports)]
+        tournament = Tournament(id="", name=f"دوري {rng.choice(CLUBS)} {k}", sport_type=sport)
+        for _ in range(40):
+            name = f"{rng.choice(CLUBS)} {rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)} {rng.randint(1, 99)}"
+            tournament.teams[str(len(tournament.teams))] = Team(id="", name=name, sport_type=sport)
+        tournaments[tournament.id] = tournament
+    return tournaments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+    tournaments = build_store(args.tournaments)
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.sync(tournaments)
+    print(f"indexed {len(index)} entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    changed = next(iter(tournaments.values()))
+    changed.teams["new"] = Team(id="", name="فريق جديد", sport_type=changed.sport_type)
+    changed.version += 1
+    start = time.perf_counter()
+    index.sync(tournaments)
+    print(f"re-sync after one tournament changed: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    names = [normalize_arabic(t.name) for t in tournaments.values()]
+    names += [normalize_arabic(team.name) for t in tournaments.values() for team in t.teams.values()]
+    for query in QUERIES:
+        needle = normalize_arabic(query)
+        hits = len(index.search(query))
+
+        def best(func):
+            return min(timeit.repeat(func, repeat=3, number=args.number)) / args.number * 1000
+
+        ids = best(lambda: index.tournament_ids(query))
+        top = best(lambda: index.search(query, limit=20))
+        ranked = best(lambda: index.search(query))
+        linear = best(lambda: [n for n in names if needle in n])
+        print(f"{query:>10}: {hits:6d} hits | tournament ids {ids:6.2f} ms, top 20 {top:6.2f} ms, "
+              f"all ranked {ranked:6.2f} ms | linear scan {linear:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
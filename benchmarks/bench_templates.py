@@ -0,0 +1,133 @@
+"""Micro-benchmark: table rendering with templates.py vs the previous f-string code.
+
+Renders every group standings table, group matches table and knockout
+table of a 32-team tournament (8 groups of 4, all results entered):
+
+    python benchmarks/bench_templates.py [--repeat 7] [--number 200]
+
+Standings are computed once up front so only the HTML assembly is timed.
+The templates escape every team name, which the legacy code did not.
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Tournament, Team, SportType, MatchStatus  # noqa: E402
+from templates import points_table, matches_table, team_names  # noqa: E402
+from html_cache import FragmentCache  # noqa: E402
+
+
+def build_tournament(num_teams: int = 32, teams_per_group: int = 4) -> Tournament:
+    rng = random.Random(32)
+    tournament = Tournament(id="", name="دوري القياس", sport_type=SportType.FOOTBALL)
+    for i in range(num_teams):
+        tournament.add_team(Team(id="", name=f"فريق {i + 1}", sport_type=SportType.FOOTBALL))
+    tournament.create_groups(teams_per_group)
+    tournament.generate_group_matches()
+    for match in tournament.matches.values():
+        match.team1_score, match.team2_score = rng.randint(0, 4), rng.randint(0, 4)
+        match.status = MatchStatus.COMPLETED
+    tournament.generate_knockout_matches()
+    return tournament
+
+
+# --- previous implementation, as it was inlined in app.py ---
+
+def legacy_points_table(standings):
+    table = [
+        "<table class='pro-table'>",
+        "<thead><tr><th>الفريق</th><th>النقاط</th></tr></thead>",
+        "<tbody>"
+    ]
+    for row in standings:
+        table.append(f"<tr><td>{row['team_name']}</td><td>{row['points']}</td></tr>")
+    table.append("</tbody></table>")
+    return "\n".join(table)
+
+
+def legacy_matches_table(tournament, matches):
+    mtable = [
+        "<table class='pro-table'>",
+        "<thead><tr><th>الفريق 1</th><th>النتيجة</th><th>الفريق 2</th></tr></thead>",
+        "<tbody>"
+    ]
+    for m in matches:
+        t1 = tournament.teams.get(m.team1_id)
+        t2 = tournament.teams.get(m.team2_id)
+        n1 = t1.name if t1 else '—'
+        n2 = t2.name if t2 else '—'
+        score = f"{m.team1_score} - {m.team2_score}" if m.is_completed else "—"
+        mtable.append(f"<tr><td>{n1}</td><td>{score}</td><td>{n2}</td></tr>")
+    mtable.append("</tbody></table>")
+    return "\n".join(mtable)
+
+
+def render_legacy(tournament, standings, group_matches, knockout):
+    parts = []
+    for gid in tournament.groups:
+        parts.append(legacy_points_table(standings[gid]))
+        parts.append(legacy_matches_table(tournament, group_matches[gid]))
+    parts.append(legacy_matches_table(tournament, knockout))
+    return parts
+
+
+def render_templates(tournament, standings, group_matches, knockout):
+    names = team_names(tournament)
+    parts = []
+    for gid in tournament.groups:
+        parts.append(points_table(standings[gid], names=names))
+        parts.append(matches_table(tournament, group_matches[gid], names=names))
+    parts.append(matches_table(tournament, knockout, names=names))
+    return parts
+
+
+def render_cached(cache, tournament, standings, group_matches, knockout):
+    """Warm-cache path: what a rerun costs once html_cache holds this version"""
+    key = (tournament.id, tournament.version)
+    parts = []
+    for gid in tournament.groups:
+        parts.append(cache.get_or_build(key + ("group_standings", gid), lambda: points_table(standings[gid])))
+        parts.append(cache.get_or_build(key + ("group_matches", gid),
+                                        lambda: matches_table(tournament, group_matches[gid])))
+    parts.append(cache.get_or_build(key + ("knockout", None), lambda: matches_table(tournament, knockout)))
+    return parts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    tournament = build_tournament()
+    standings = {gid: tournament.get_group_standings(gid) for gid in tournament.groups}
+    group_matches = {gid: [m for m in tournament.matches.values() if m.group_id == gid] for gid in tournament.groups}
+    knockout = list(tournament.knockout_matches.values())
+    fixture = (tournament, standings, group_matches, knockout)
+
+    # Same tables, only the whitespace between tags differs
+    legacy = [p.replace("\n", "") for p in render_legacy(*fixture)]
+    assert legacy == render_templates(*fixture), "template output differs from the legacy markup"
+
+    print(f"32 teams, {len(tournament.groups)} groups, {len(tournament.matches)} group matches, "
+          f"{len(knockout)} knockout matches")
+    cache = FragmentCache()
+    results = {}
+    for label, func in (
+        ("legacy f-strings", render_legacy),
+        ("templates.py", render_templates),
+        ("+ html_cache warm", lambda *f: render_cached(cache, *f)),
+    ):
+        best = min(timeit.repeat(lambda: func(*fixture), repeat=args.repeat, number=args.number))
+        results[label] = best / args.number * 1e6
+        print(f"{label:>18}: {results[label]:8.1f} µs per full render")
+    for label in ("templates.py", "+ html_cache warm"):
+        print(f"{'vs legacy':>18}: {results['legacy f-strings'] / results[label]:8.2f}x ({label})")
+
+
+if __name__ == "__main__":
+    main()
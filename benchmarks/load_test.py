@@ -0,0 +1,231 @@
+"""Headless load test: slideshow kiosks and scorekeepers on one SQLite file.
+
+Simulates N kiosk sessions running the automatic slideshow through
+streamlit.testing.v1.AppTest and M scorekeepers, each with its own
+TournamentService as a Streamlit session would have, entering results
+concurrently:
+
+    python benchmarks/load_test.py --kiosks 8 --scorekeepers 4 --duration 20
+
+Every kiosk is due for a slide each --interval seconds, which costs one
+full script run. AppTest runs cannot overlap in one process, and the GIL
+serializes reruns on a real server much the same way, so one driver
+thread serves the kiosks in due order. Rerun latency is measured from
+when the slide was due, so queueing shows up in p99. Driver utilization
+near 100% means the box cannot drive more screens at that interval.
+
+Each scorekeeper owns a disjoint set of matches and writes increasing
+scores to them, so the final store can be checked: a match whose stored
+result is not the last one its scorekeeper committed is a lost update.
+
+Reports kiosk rerun and scorekeeper commit throughput, p50/p99
+latencies, driver utilization, lost updates, stale commits refused
+(and redone), and the resident memory added per kiosk session. Runs against a temporary database unless --db is given.
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (Linux /proc; 0 where unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def seed_store(tournaments: int, teams: int):
+    from models import Tournament, Team, SportType
+    from utils import save_tournaments
+
+    store = {}
+    sports = list(SportType)
+    for k in range(tournaments):
+        sport = sports[k % len(sports)]
+        tournament = Tournament(id="", name=f"دوري الحمل {k + 1}", sport_type=sport)
+        for i in range(teams):
+            tournament.add_team(Team(id="", name=f"فريق {k + 1}-{i + 1}", sport_type=sport))
+        tournament.create_groups(4)
+        tournament.generate_group_matches()
+        store[tournament.id] = tournament
+    save_tournaments(store)
+    return [(tid, mid) for tid, t in store.items() for mid in t.matches]
+
+
+def new_kiosk():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.session_state.page = "view_results"
+    at.session_state.viewing_mode = "automatic"
+    at.session_state.auto_mode_running = True
+    at.run()
+    return at
+
+
+def run_kiosks(kiosks: list, interval: float, stop: threading.Event, latencies: list, busy: list,
+               errors: list, ready: threading.Barrier):
+    """Serve every kiosk once per interval, staggered, in due order"""
+    ready.wait()
+    start = time.perf_counter()
+    due = [start + interval * i / len(kiosks) for i in range(len(kiosks))]
+    while not stop.is_set():
+        index = min(range(len(kiosks)), key=due.__getitem__)
+        wait = due[index] - time.perf_counter()
+        if wait > 0 and stop.wait(wait):
+            break
+        at = kiosks[index]
+        # Due for the next slide, as when the fragment timer fires
+        at.session_state.last_advance_time = 0
+        run_start = time.perf_counter()
+        at.run()
+        finished = time.perf_counter()
+        busy[0] += finished - run_start
+        latencies.append(finished - due[index])
+        due[index] += interval
+        if at.exception:
+            errors.append(f"kiosk {index}: {at.exception[0].value}")
+
+
+def run_scorekeeper(index: int, matches: list, think: float, stop: threading.Event, latencies: list,
+                    written: dict, errors: list, conflicts: list, ready: threading.Barrier):
+    from change_feed import get_change_feed
+    from tournament_service import TournamentService, TournamentError, ConflictError
+
+    feed = get_change_feed()
+    service = TournamentService(watch_mtime=lambda: feed.store_mtime)
+    rng = random.Random(index)
+    ready.wait()
+    round_no = 0
+    while not stop.is_set():
+        round_no += 1
+        for tournament_id, match_id in matches:
+            if stop.is_set():
+                break
+            start = time.perf_counter()
+            try:
+                # What TournamentManager does before every mutation
+                service.refresh_if_changed()
+                while True:
+                    try:
+                        service.update_match_result(tournament_id, match_id, round_no, index)
+                        break
+                    except ConflictError:
+                        # Another scorekeeper committed first; the service has
+                        # reloaded, so redo it as the user would
+                        conflicts.append(match_id)
+            except TournamentError as e:
+                errors.append(f"scorekeeper {index}: {e}")
+                continue
+            latencies.append(time.perf_counter() - start)
+            written[match_id] = (round_no, index)
+            # Jittered so scorekeepers do not commit in lockstep
+            if think and stop.wait(rng.uniform(0.5, 1.5) * think):
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kiosks", type=int, default=4)
+    parser.add_argument("--scorekeepers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of load")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds per slide on each kiosk")
+    parser.add_argument("--think", type=float, default=1.0, help="seconds a scorekeeper waits between results (0 = flat out)")
+    parser.add_argument("--tournaments", type=int, default=4)
+    parser.add_argument("--teams", type=int, default=16, help="teams per tournament (groups of 4)")
+    parser.add_argument("--db", help="SQLite file to use (default: a temporary file)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="tournament-load-"), "load.db")
+    # utils resolves the database path at import time
+    os.environ["TOURNAMENT_DB_PATH"] = db_path
+    os.chdir(ROOT)
+    from utils import load_tournaments
+
+    matches = seed_store(args.tournaments, args.teams)
+    if args.scorekeepers > len(matches):
+        parser.error(f"only {len(matches)} matches for {args.scorekeepers} scorekeepers")
+    shares = [matches[i::args.scorekeepers] for i in range(args.scorekeepers)]
+
+    from streamlit.runtime.scriptrunner_utils import script_run_context
+    # Driving sessions from plain threads is expected here
+    logging.getLogger(script_run_context.__name__).addFilter(lambda record: record.levelno >= logging.ERROR)
+    # Load Streamlit and the app's modules once so the memory figure is per session
+    new_kiosk()
+    rss_before = rss_bytes()
+    kiosks = [new_kiosk() for _ in range(args.kiosks)]
+    rss_sessions = rss_bytes()
+
+    stop = threading.Event()
+    ready = threading.Barrier(args.scorekeepers + (1 if kiosks else 0) + 1)
+    kiosk_latencies, commit_latencies, errors, conflicts, busy = [], [], [], [], [0.0]
+    written = {}
+    threads = [
+        threading.Thread(target=run_scorekeeper,
+                         args=(i, shares[i], args.think, stop, commit_latencies, written, errors, conflicts, ready), daemon=True)
+        for i in range(args.scorekeepers)
+    ]
+    if kiosks:
+        threads.append(threading.Thread(
+            target=run_kiosks, args=(kiosks, args.interval, stop, kiosk_latencies, busy, errors, ready), daemon=True,
+        ))
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    started = time.perf_counter()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=120)
+    elapsed = time.perf_counter() - started
+
+    stored = load_tournaments()
+    lost = 0
+    for tournament_id, match_id in matches:
+        expected = written.get(match_id)
+        if expected is None:
+            continue
+        match = stored[tournament_id].matches[match_id]
+        if (match.team1_score, match.team2_score) != expected:
+            lost += 1
+
+    def line(label, samples):
+        rate = len(samples) / elapsed if elapsed else 0.0
+        print(f"{label:>18}: {len(samples):6d} in {elapsed:5.1f} s = {rate:7.1f}/s, "
+              f"p50 {percentile(samples, 50) * 1000:7.1f} ms, p99 {percentile(samples, 99) * 1000:7.1f} ms")
+
+    print(f"database: {db_path}")
+    line("kiosk reruns", kiosk_latencies)
+    print(f"{'kiosk driver busy':>18}: {busy[0] / elapsed * 100 if elapsed else 0:.0f}% "
+          f"({args.kiosks} kiosks every {args.interval:g} s)")
+    line("result commits", commit_latencies)
+    print(f"{'lost updates':>18}: {lost} of {len(written)} matches written "
+          f"(stored result differs from the last committed one)")
+    print(f"{'conflicts':>18}: {len(conflicts)} commits refused as stale and redone")
+    if args.kiosks:
+        per_session = (rss_sessions - rss_before) / args.kiosks
+        print(f"{'memory / kiosk':>18}: {per_session / 1024 / 1024:.1f} MiB RSS added per session, "
+              f"{rss_bytes() / 1024 / 1024:.0f} MiB total at end")
+    for error in errors[:5]:
+        print(f"error: {error}")
+
+
+if __name__ == "__main__":
+    main()
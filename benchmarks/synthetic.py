@@ -0,0 +1,135 @@
+"""Synthetic tournaments of configurable size for benchmarks and load tests.
+
+    python benchmarks/synthetic.py --db /tmp/big.db --tournaments 50 --teams 32 --groups 8 --completion 0.6
+
+Team names are Arabic, results are random but reproducible from --seed
+(tennis and ping-pong results are recorded set by set),
+and knockout_depth adds the knockout stage on top of completed groups:
+0 none, 1 a final (needs 2 groups), 2 semi-finals and a final (needs 4 groups).
+"""
+import argparse
+import os
+import random
+import sys
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Tournament, Team, SportType, MatchStatus, MAX_SETS  # noqa: E402
+
+FIRST_NAMES = ["أحمد", "إبراهيم", "مصطفى", "فاطمة", "آمنة", "يوسف", "عائشة", "حمزة", "مريم", "عبد الله"]
+CLUBS = ["نادي", "مدرسة", "أكاديمية", "فريق"]
+KNOCKOUT_GROUPS = {1: 2, 2: 4}
+
+
+def group_sizes(teams: int, groups: int) -> list:
+    """Split teams into groups whose sizes differ by at most one"""
+    base, extra = divmod(teams, groups)
+    return [base + (1 if i < extra else 0) for i in range(groups)]
+
+
+def _play_sets(match, rng: random.Random, sport: SportType):
+    """Set-by-set result: best of three 6-game sets, or best of five 11-point games"""
+    max_sets = MAX_SETS[sport]
+    target = 6 if sport == SportType.TENNIS else 11
+    wins, sets = [0, 0], []
+    while max(wins) * 2 <= max_sets:
+        winner = rng.randint(0, 1)
+        loser_points = rng.randint(0, target - 2)
+        sets.append((target, loser_points) if winner == 0 else (loser_points, target))
+        wins[winner] += 1
+    match.record_sets(sets)
+    match.status = MatchStatus.COMPLETED
+
+
+def _play(match, rng: random.Random, allow_draw: bool = True, sport: SportType = SportType.FOOTBALL):
+    if sport in MAX_SETS:
+        _play_sets(match, rng, sport)
+        return
+    team1, team2 = rng.randint(0, 4), rng.randint(0, 4)
+    if not allow_draw and team1 == team2:
+        team1 += 1
+    match.team1_score, match.team2_score = team1, team2
+    match.status = MatchStatus.COMPLETED
+
+
+def make_tournament(
+    teams: int = 16,
+    groups: int = 4,
+    completion: float = 1.0,
+    knockout_depth: int = 0,
+    sport: SportType = SportType.FOOTBALL,
+    name: str = "دوري تجريبي",
+    seed: Optional[int] = 0,
+) -> Tournament:
+    """One tournament; completion is the fraction of group matches with a result"""
+    if groups < 1 or teams < 3 or teams < groups * 2:
+        raise ValueError("need at least 3 teams and 2 teams per group")
+    if knockout_depth and KNOCKOUT_GROUPS.get(knockout_depth) != groups:
+        raise ValueError(f"knockout depth {knockout_depth} needs {KNOCKOUT_GROUPS.get(knockout_depth)} groups")
+    rng = random.Random(seed)
+    tournament = Tournament(id="", name=name, sport_type=sport)
+    for i in range(teams):
+        team_name = f"{rng.choice(CLUBS)} {rng.choice(FIRST_NAMES)} {i + 1}"
+        tournament.add_team(Team(id="", name=team_name, sport_type=sport))
+    tournament.create_custom_groups(group_sizes(teams, groups))
+    tournament.generate_group_matches()
+    group_matches = list(tournament.matches.values())
+    to_play = group_matches if knockout_depth else rng.sample(group_matches, round(len(group_matches) * completion))
+    for match in to_play:
+        _play(match, rng, sport=sport)
+    if knockout_depth:
+        tournament.generate_knockout_matches()
+        if completion >= 1:
+            for match in list(tournament.knockout_matches.values()):
+                _play(match, rng, allow_draw=False, sport=sport)
+            tournament.advance_knockout_stage()
+            for match in tournament.knockout_matches.values():
+                if not match.is_completed:
+                    _play(match, rng, allow_draw=False, sport=sport)
+    return tournament
+
+
+def make_store(
+    tournaments: int = 10,
+    teams: int = 16,
+    groups: int = 4,
+    completion: float = 1.0,
+    knockout_depth: int = 0,
+    seed: int = 0,
+) -> Dict[str, Tournament]:
+    """Several tournaments cycling through the sports"""
+    sports = list(SportType)
+    store = {}
+    for k in range(tournaments):
+        tournament = make_tournament(
+            teams, groups, completion, knockout_depth,
+            sport=sports[k % len(sports)], name=f"دوري تجريبي {k + 1}", seed=seed + k,
+        )
+        store[tournament.id] = tournament
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic tournament store")
+    parser.add_argument("--db", required=True, help="SQLite file to write (replaces its tournaments)")
+    parser.add_argument("--tournaments", type=int, default=10)
+    parser.add_argument("--teams", type=int, default=16)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--completion", type=float, default=1.0)
+    parser.add_argument("--knockout-depth", type=int, default=0, choices=(0, 1, 2))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    # utils resolves the database path at import time
+    os.environ["TOURNAMENT_DB_PATH"] = os.path.abspath(args.db)
+    from utils import save_tournaments
+
+    store = make_store(args.tournaments, args.teams, args.groups, args.completion, args.knockout_depth, args.seed)
+    if not save_tournaments(store):
+        sys.exit("could not write the store")
+    matches = sum(len(t.matches) + len(t.knockout_matches) for t in store.values())
+    print(f"{len(store)} tournaments, {matches} matches written to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
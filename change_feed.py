@@ -0,0 +1,113 @@
+"""Process-wide watcher of the store's change log.
+
+One background thread polls the change_log table (a single indexed
+query per interval, whatever the number of listeners) and wakes every
+waiting subscriber. Each event is (seq, change) where change is a dict
+produced by TournamentService.build_changes.
+
+Streamlit sessions read store_mtime instead of querying the database on
+every rerun, so DB polling stays constant in the number of viewers.
+Live scoring changes (live_scoring.py) ride the same log but do not come
+from a store commit, so they leave store_mtime alone.
+"""
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+from utils import read_changes, get_latest_change_seq, get_store_mtime
+
+# Seconds between two change_log polls; keeps push latency well under 100 ms
+POLL_INTERVAL = 0.05
+# Events kept in memory for subscribers that reconnect with an older seq
+BUFFER_SIZE = 2000
+# Change types written without a store commit; they must not trigger reloads
+TRANSIENT_TYPES = frozenset({"live_score"})
+
+
+def is_commit(change: dict) -> bool:
+    return change.get('type') not in TRANSIENT_TYPES
+
+
+class ChangeFeed:
+    def __init__(self, poll_interval: float = POLL_INTERVAL, buffer_size: int = BUFFER_SIZE):
+        self.poll_interval = poll_interval
+        self._events: Deque[Tuple[int, dict]] = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._listeners: List[Callable[[List[Tuple[int, dict]]], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.latest_seq = get_latest_change_seq()
+        # mtime of the newest commit seen; every commit writes at least one change
+        self.store_mtime = get_store_mtime()
+        self.subscribers = 0
+
+    def start(self) -> "ChangeFeed":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def add_listener(self, callback: Callable[[List[Tuple[int, dict]]], None]):
+        """Call callback(events) from the poller thread whenever new events arrive"""
+        self._listeners.append(callback)
+
+    def subscribe(self):
+        """Count a connected stream; handler threads call this concurrently"""
+        with self._cond:
+            self.subscribers += 1
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            events = read_changes(self.latest_seq)
+            if not events:
+                continue
+            with self._cond:
+                self._events.extend(events)
+                self.latest_seq = events[-1][0]
+                commit_ts = [change.get('ts', 0.0) for _, change in events if is_commit(change)]
+                if commit_ts:
+                    self.store_mtime = max(self.store_mtime, commit_ts[-1])
+                self._cond.notify_all()
+            for callback in list(self._listeners):
+                try:
+                    callback(events)
+                except Exception as e:
+                    print(f"Change listener failed: {e}")
+
+    def events_since(self, since_seq: int) -> List[Tuple[int, dict]]:
+        """Buffered events newer than since_seq; falls back to the DB if the buffer is too short"""
+        with self._cond:
+            if since_seq >= self.latest_seq:
+                return []
+            if self._events and self._events[0][0] <= since_seq + 1:
+                return [e for e in self._events if e[0] > since_seq]
+        return read_changes(since_seq)
+
+    def wait_for(self, since_seq: int, timeout: float) -> List[Tuple[int, dict]]:
+        """Block until events newer than since_seq exist (or timeout); return them"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.latest_seq > since_seq or self._stop.is_set(), timeout)
+        return self.events_since(since_seq)
+
+
+_feed: Optional[ChangeFeed] = None
+_feed_lock = threading.Lock()
+
+
+def get_change_feed() -> ChangeFeed:
+    """The started, process-wide ChangeFeed"""
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = ChangeFeed().start()
+    return _feed
@@ -0,0 +1,81 @@
+"""Process-wide cache of rendered HTML fragments.
+
+Fragments are keyed by (tournament id, version, view kind, group id), so
+a commit that bumps a tournament's version naturally misses and the old
+entries age out. The cache is bounded by total string size with LRU
+eviction and shared by every Streamlit session in the process.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from models import Tournament
+
+# Upper bound on the memory held by cached fragments
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+FragmentKey = Tuple[str, int, str, Optional[Hashable]]
+
+
+class FragmentCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[FragmentKey, Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key: FragmentKey, build: Callable[[], str]) -> str:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        html = build()
+        size = sys.getsizeof(html)
+        if size > self.max_bytes:
+            return html
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+            self._entries[key] = (html, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_cache = FragmentCache()
+
+
+def get_fragment_cache() -> FragmentCache:
+    return _cache
+
+
+def cached_fragment(tournament: Tournament, view: str, group_id: Optional[Hashable], build: Callable[[], str]) -> str:
+    """Return the HTML for one view of a tournament, building it at most once per version"""
+    return _cache.get_or_build((tournament.id, tournament.version, view, group_id), build)
@@ -0,0 +1,344 @@
+"""Static kiosk bundle for the hall TVs.
+
+Writes a self-contained HTML/JS/CSS slideshow from a store snapshot:
+
+    python kiosk_export.py --out kiosk
+    python kiosk_export.py --out kiosk --watch   # re-export on every change
+
+The bundle reuses the slideshow deck (slides.py) and theme (theme.py),
+so it looks like the Streamlit automatic view. The page polls the small
+version.json and reloads deck.json only when the version moves. When
+opened from disk (file://, where fetch is blocked) it reloads deck.js
+instead. Any static file server can host it; no Python session runs
+per screen.
+
+Opened as index.html?events=http://<api-host>:8600 the page also follows
+the scoreboard API's /api/events stream and applies match_updated and
+standings_changed deltas to its slides in place. A tournament counts as
+current once all of a commit's deltas applied cleanly. The poll then
+skips deck.json when version.json lists only versions the deck already
+has. A commit it cannot patch (new matches, renamed or removed teams, a
+missed event) leaves the tournament behind, and the poll refetches as
+without the stream.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from assets import write_assets
+from change_feed import get_change_feed
+from models import Tournament, MatchStatus
+from slides import get_slide_deck
+from theme import (
+    GLOBAL_CSS, SLIDE_CSS, GROUPS_GRID_CSS, sport_accent_color, sport_background_layers, slide_canvas_css,
+)
+from tournament_service import TournamentService
+
+# Seconds between two version.json polls on the TV
+KIOSK_POLL_SECONDS = 5
+DEFAULT_INTERVAL = 10
+
+KIOSK_CSS = GLOBAL_CSS + SLIDE_CSS + GROUPS_GRID_CSS + """
+html, body { margin: 0; height: 100%; overflow: hidden; }
+body { background-repeat: no-repeat, repeat, repeat; background-size: cover, 240px 240px, 120px 120px; background-position: center top, left top, left top; }
+#stage { box-sizing: border-box; height: 100vh; padding: 12px; display: flex; justify-content: center; }
+#stage .autoslide-canvas { background: rgba(255,255,255,0.85); border-radius: 12px; box-shadow: 0 8px 24px rgba(0,0,0,0.10); padding: 8px 12px; }
+#empty { text-align: center; margin-top: 20vh; font-size: 2rem; color: #fff; }
+"""
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="ar" dir="rtl">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>دوريات نادي الأمين</title>
+<link rel="stylesheet" href="kiosk.css">
+<style id="slide-style"></style>
+</head>
+<body>
+<div id="stage"><div id="empty">🏆</div></div>
+<script src="kiosk.js"></script>
+<script src="deck.js"></script>
+</body>
+</html>
+"""
+
+KIOSK_JS = """(function () {
+  var POLL_MS = %(poll_ms)d;
+  var COMPLETED = %(completed)s;
+  var deck = null, index = 0, timer = null;
+  // tournament id -> {version, ok, matches}: the commit whose deltas are arriving
+  var pending = {};
+  var stage = document.getElementById('stage');
+  var slideStyle = document.getElementById('slide-style');
+
+  function render() {
+    if (!deck || !deck.slides.length) {
+      stage.innerHTML = '<div id="empty">🏆</div>';
+      return;
+    }
+    var slide = deck.slides[index %% deck.slides.length];
+    var theme = deck.themes[slide.sport] || {};
+    document.body.style.backgroundImage = theme.background || '';
+    document.documentElement.style.setProperty('--brand-primary', theme.accent || '#1f4e79');
+    slideStyle.textContent = slide.css;
+    stage.innerHTML = '<div class="autoslide-canvas">' + slide.html + '</div>';
+  }
+
+  function schedule() {
+    if (timer) clearInterval(timer);
+    timer = setInterval(function () { index += 1; render(); }, (deck.interval || 10) * 1000);
+  }
+
+  window.kioskLoad = function (next) {
+    if (deck && next.version === deck.version) return;
+    var first = !deck;
+    deck = next;
+    pending = {};
+    if (first) index = 0;
+    render();
+    if (first) schedule();
+  };
+
+  function reloadScript() {
+    var s = document.createElement('script');
+    s.src = 'deck.js?v=' + Date.now();
+    s.onload = s.onerror = function () { s.remove(); };
+    document.body.appendChild(s);
+  }
+
+  // True if the export has a tournament the deck lacks or a newer version of one
+  function behind(versions) {
+    if (!deck || !versions || !deck.tournaments) return true;
+    for (var tid in deck.tournaments) if (!(tid in versions)) return true;
+    for (tid in versions) if (!(tid in deck.tournaments) || versions[tid] > deck.tournaments[tid]) return true;
+    return false;
+  }
+
+  function poll() {
+    if (location.protocol === 'file:' || !window.fetch) { reloadScript(); return; }
+    fetch('version.json?t=' + Date.now(), {cache: 'no-store'})
+      .then(function (r) { return r.json(); })
+      .then(function (v) {
+        if (deck && v.version === deck.version) return;
+        if (!behind(v.tournaments)) {
+          // Deltas already brought the deck here (or past it, before the export)
+          for (var tid in v.tournaments) if (v.tournaments[tid] !== deck.tournaments[tid]) return;
+          deck.version = v.version;
+          return;
+        }
+        return fetch('deck.json?v=' + encodeURIComponent(v.version), {cache: 'no-store'})
+          .then(function (r) { return r.json(); })
+          .then(window.kioskLoad);
+      })
+      .catch(function () {});
+  }
+
+  function scoreHtml(m, cell) {
+    if (m.status !== COMPLETED) return '—';
+    var score = m.team1_score + ' - ' + m.team2_score;
+    if (!m.sets) return score;
+    var sets = [];
+    for (var i = 0; i + 1 < m.sets.length; i += 2) sets.push(m.sets[i] + '-' + m.sets[i + 1]);
+    return cell ? score + '<br><small>' + sets.join(' ') + '</small>' : score + ' (' + sets.join(' ') + ')';
+  }
+
+  // Run patch(box) on a parsed copy of each slide of the tournament; false if nothing matched
+  function patchSlides(tid, patch) {
+    var found = false;
+    deck.slides.forEach(function (slide) {
+      if (slide.tournament_id !== tid) return;
+      var box = document.createElement('div');
+      box.innerHTML = slide.html;
+      if (patch(box)) { slide.html = box.innerHTML; found = true; }
+    });
+    return found;
+  }
+
+  function applyMatch(tid, m) {
+    return patchSlides(tid, function (box) {
+      var rows = box.querySelectorAll('[data-match="' + m.id + '"]');
+      for (var i = 0; i < rows.length; i++) {
+        var cell = rows[i].children[1];
+        cell.innerHTML = scoreHtml(m, cell.tagName === 'TD');
+      }
+      return rows.length > 0;
+    });
+  }
+
+  function applyStandings(tid, groupId, rows) {
+    var complete = true;
+    var found = patchSlides(tid, function (box) {
+      var lists = box.querySelectorAll('[data-standings="' + groupId + '"]');
+      for (var i = 0; i < lists.length; i++) {
+        var byTeam = {};
+        for (var j = 0; j < lists[i].children.length; j++) {
+          byTeam[lists[i].children[j].getAttribute('data-team')] = lists[i].children[j];
+        }
+        for (j = 0; j < rows.length; j++) {
+          var row = byTeam[rows[j].team_id];
+          if (!row) { complete = false; continue; }
+          row.lastElementChild.textContent = rows[j].points;
+          // Appending in ranked order reorders the rows
+          lists[i].appendChild(row);
+        }
+      }
+      return lists.length > 0;
+    });
+    return found && complete;
+  }
+
+  function onDelta(e) {
+    var change = JSON.parse(e.data), tid = change.tournament_id;
+    if (!deck || !deck.tournaments || !(tid in deck.tournaments)) return;
+    var known = deck.tournaments[tid];
+    if (change.version <= known) return;
+    var commit = pending[tid];
+    if (!commit || commit.version !== change.version) {
+      // A gap in versions means a missed commit: never mark this one applied
+      commit = pending[tid] = {version: change.version, ok: change.version === known + 1, matches: 0};
+    }
+    if (change.type === 'match_updated') {
+      commit.matches += 1;
+      if (commit.ok && !applyMatch(tid, change.match)) commit.ok = false;
+    } else if (change.type === 'standings_changed') {
+      if (commit.ok && !applyStandings(tid, change.group_id, change.standings)) commit.ok = false;
+    } else if (change.type === 'tournament_changed') {
+      delete pending[tid];
+      // A commit with no result deltas changed something else (teams, groups...)
+      if (commit.ok && commit.matches) {
+        deck.tournaments[tid] = change.version;
+        render();
+      }
+    }
+  }
+
+  var events = /[?&]events=([^&]+)/.exec(location.search);
+  if (events && window.EventSource) {
+    var source = new EventSource(decodeURIComponent(events[1]).replace(/\/$/, '') + '/api/events');
+    ['match_updated', 'standings_changed', 'tournament_changed'].forEach(function (type) {
+      source.addEventListener(type, onDelta);
+    });
+  }
+
+  setInterval(poll, POLL_MS);
+})();
+"""
+
+
+def deck_version(tournaments: Dict[str, Tournament]) -> str:
+    """Short digest of every tournament id and version; moves on any commit"""
+    digest = hashlib.sha1()
+    for tid in sorted(tournaments):
+        digest.update(f"{tid}:{tournaments[tid].version};".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def deck_payload(
+    tournaments: Dict[str, Tournament],
+    interval: int = DEFAULT_INTERVAL,
+    asset_files: Optional[Dict[str, str]] = None,
+) -> dict:
+    """Deck JSON; asset_files (from assets.write_assets) makes backgrounds reference SVG files"""
+    slides = get_slide_deck(list(tournaments.values()))
+    asset_url = asset_files.get if asset_files else None
+    return {
+        'version': deck_version(tournaments),
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'interval': interval,
+        # Lets the page's delta client tell whether it is current without deck.json
+        'tournaments': {tid: tournament.version for tid, tournament in tournaments.items()},
+        'slides': [
+            {
+                'tournament_id': s.tournament_id,
+                'sport': s.sport,
+                'html': s.html,
+                'css': slide_canvas_css(s.scale, s.cell_padding, s.font_size, s.card_padding),
+            }
+            for s in slides
+        ],
+        'themes': {
+            sport: {'background': sport_background_layers(sport, asset_url), 'accent': sport_accent_color(sport)}
+            for sport in {s.sport for s in slides}
+        },
+    }
+
+
+def _write_if_changed(path: str, content: str):
+    """Atomically replace path with content unless it already holds it"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+    except OSError:
+        pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def export_kiosk(out_dir: str, tournaments: Dict[str, Tournament], interval: int = DEFAULT_INTERVAL) -> str:
+    """Write the bundle into out_dir and return the deck version"""
+    os.makedirs(out_dir, exist_ok=True)
+    # Hashed SVG backgrounds are cached by the TV; deck.json only carries their names
+    payload = deck_payload(tournaments, interval, write_assets(out_dir))
+    deck_json = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    _write_if_changed(os.path.join(out_dir, 'index.html'), INDEX_HTML)
+    _write_if_changed(os.path.join(out_dir, 'kiosk.css'), KIOSK_CSS)
+    _write_if_changed(os.path.join(out_dir, 'kiosk.js'), KIOSK_JS % {
+        'poll_ms': KIOSK_POLL_SECONDS * 1000,
+        'completed': json.dumps(MatchStatus.COMPLETED.value, ensure_ascii=False),
+    })
+    _write_if_changed(os.path.join(out_dir, 'deck.json'), deck_json)
+    _write_if_changed(os.path.join(out_dir, 'deck.js'), f"window.kioskLoad({deck_json});\n")
+    # Written last so a polling TV never sees a version whose deck is not on disk yet
+    _write_if_changed(os.path.join(out_dir, 'version.json'),
+                      json.dumps({'version': payload['version'], 'tournaments': payload['tournaments']}))
+    return payload['version']
+
+
+def watch(out_dir: str, interval: int = DEFAULT_INTERVAL, service: Optional[TournamentService] = None):
+    """Re-export whenever the change feed reports a commit"""
+    feed = get_change_feed()
+    service = service or TournamentService(watch_mtime=lambda: feed.store_mtime)
+    version = export_kiosk(out_dir, service.tournaments, interval)
+    print(f"Kiosk bundle {version} written to {out_dir}")
+    seq = feed.latest_seq
+    while True:
+        events = feed.wait_for(seq, 30.0)
+        if not events:
+            continue
+        seq = events[-1][0]
+        # Let a burst of commits settle into one export
+        time.sleep(0.2)
+        service.refresh_if_changed()
+        new_version = export_kiosk(out_dir, service.tournaments, interval)
+        if new_version != version:
+            version = new_version
+            print(f"Kiosk bundle {version} written to {out_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a static kiosk slideshow")
+    parser.add_argument("--out", default="kiosk")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL, help="seconds per slide")
+    parser.add_argument("--watch", action="store_true", help="keep running and re-export on changes")
+    args = parser.parse_args()
+    interval = max(5, min(60, args.interval))
+    if args.watch:
+        try:
+            watch(args.out, interval)
+        except KeyboardInterrupt:
+            pass
+        return
+    version = export_kiosk(args.out, TournamentService().tournaments, interval)
+    print(f"Kiosk bundle {version} written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
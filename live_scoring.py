@@ -0,0 +1,262 @@
+"""Live point-by-point scoring for matches being played.
+
+A tap on +1 appends one row to the live_events table and one live_score
+change (the match's whole live score) to the change log, in a single
+small transaction on a kept-open connection. The tournaments blob is not
+rewritten and no version is bumped, so no session reloads the store and
+dozens of taps per second on a match cost other sessions next to nothing.
+
+Viewers follow the change feed: the API streams each live_score change
+as an SSE event, and every process keeps get_live_scoring() current from
+the feed, so Streamlit pages read live scores from memory. Each change
+carries the full score, so applying the newest one is enough.
+
+Finishing a match folds its live score into the Match with one normal
+commit (set by set for tennis and ping-pong) and clears its log. A
+process that starts or restarts mid-match resumes by replaying the log.
+"""
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from change_feed import get_change_feed
+from models import Match, SET_SPORTS
+from tournament_service import TournamentService, NotFoundError, ValidationError, StorageError, ConflictError
+from utils import append_live_event, read_live_events, clear_live_events
+
+LIVE_SCORE = "live_score"
+
+KIND_START = "start"
+KIND_POINT = "point"
+# Closes the current set (tennis and ping-pong)
+KIND_SET = "set"
+
+
+@dataclass
+class LiveScore:
+    tournament_id: str
+    match_id: str
+    # Points (or goals) in the current set
+    team1: int = 0
+    team2: int = 0
+    # Finished sets as (team1, team2) points
+    sets: List[Tuple[int, int]] = field(default_factory=list)
+    # Change-log seq of the latest event applied
+    seq: int = 0
+    finished: bool = False
+
+    def apply(self, kind: str, side: int, delta: int):
+        if kind == KIND_SET:
+            self.sets.append((self.team1, self.team2))
+            self.team1 = self.team2 = 0
+        elif kind == KIND_POINT:
+            if side == 1:
+                self.team1 = max(0, self.team1 + delta)
+            else:
+                self.team2 = max(0, self.team2 + delta)
+
+    def set_scores(self) -> List[Tuple[int, int]]:
+        """Finished sets plus the current one if it has been played"""
+        if self.team1 or self.team2:
+            return self.sets + [(self.team1, self.team2)]
+        return list(self.sets)
+
+    def to_change(self) -> dict:
+        return {
+            'type': LIVE_SCORE,
+            'tournament_id': self.tournament_id,
+            'match_id': self.match_id,
+            'team1': self.team1,
+            'team2': self.team2,
+            'sets': [list(s) for s in self.sets],
+            'finished': self.finished,
+        }
+
+    @classmethod
+    def from_change(cls, seq: int, change: dict) -> 'LiveScore':
+        return cls(
+            tournament_id=change['tournament_id'],
+            match_id=change['match_id'],
+            team1=change.get('team1', 0),
+            team2=change.get('team2', 0),
+            sets=[tuple(s) for s in change.get('sets', [])],
+            seq=seq,
+            finished=change.get('finished', False),
+        )
+
+
+class LiveScoring:
+    """Live matches of this process: written by scorekeepers, kept current from the change feed"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scores: Dict[str, LiveScore] = {}
+        # Bumped whenever a match goes live or ends, so pages know to add or drop their live panel
+        self.generation = 0
+
+    def load(self):
+        """Replay the live log, for a process that starts while matches are live"""
+        with self._lock:
+            for tournament_id, match_id, kind, side, delta in read_live_events():
+                score = self._scores.get(match_id)
+                if score is None:
+                    score = self._scores[match_id] = LiveScore(tournament_id, match_id)
+                score.apply(kind, side, delta)
+            self.generation += 1
+
+    def on_changes(self, events):
+        """Change-feed listener: apply live_score changes written by any process"""
+        for seq, change in events:
+            if change.get('type') != LIVE_SCORE:
+                continue
+            with self._lock:
+                current = self._scores.get(change['match_id'])
+                if current is not None and current.seq >= seq:
+                    continue
+                self._put(LiveScore.from_change(seq, change))
+
+    def _put(self, score: LiveScore):
+        """Store or drop a score; caller holds the lock"""
+        if score.finished:
+            if self._scores.pop(score.match_id, None) is not None:
+                self.generation += 1
+            return
+        if score.match_id not in self._scores:
+            self.generation += 1
+        self._scores[score.match_id] = score
+
+    def get(self, match_id: str) -> Optional[LiveScore]:
+        return self._scores.get(match_id)
+
+    def live(self, tournament_id: Optional[str] = None) -> List[LiveScore]:
+        return [s for s in list(self._scores.values()) if tournament_id is None or s.tournament_id == tournament_id]
+
+    def _record(self, score: LiveScore, kind: str, side: int = 0, delta: int = 0) -> LiveScore:
+        """Persist one event and return the score with it applied; caller holds the lock.
+
+        The event is applied to a copy, so a failed write leaves the shown
+        score matching the log.
+        """
+        updated = replace(score, sets=list(score.sets))
+        updated.apply(kind, side, delta)
+        seq = append_live_event(updated.tournament_id, updated.match_id, kind, side, delta, updated.to_change())
+        if not seq:
+            raise StorageError("تعذر حفظ النقطة")
+        updated.seq = max(updated.seq, seq)
+        self._put(updated)
+        return updated
+
+    def start(self, service: TournamentService, tournament_id: str, match_id: str) -> LiveScore:
+        """Put a pending match in live mode, resuming its log if it has one"""
+        tournament = service.require_tournament(tournament_id)
+        match = service.require_match(tournament, match_id)
+        if match.is_completed:
+            raise ValidationError("المباراة مكتملة بالفعل")
+        with self._lock:
+            score = self._scores.get(match_id)
+            if score is not None:
+                return score
+            score = LiveScore(tournament_id, match_id)
+            for _, _, kind, side, delta in read_live_events(match_id):
+                score.apply(kind, side, delta)
+            return self._record(score, KIND_START)
+
+    def _require(self, match_id: str) -> LiveScore:
+        score = self._scores.get(match_id)
+        if score is None:
+            raise NotFoundError("المباراة ليست في وضع التسجيل المباشر")
+        return score
+
+    def point(self, match_id: str, side: int, delta: int = 1) -> LiveScore:
+        """+1 (or -1 to undo) for side 1 or 2 in the current set"""
+        if side not in (1, 2) or delta not in (1, -1):
+            raise ValidationError("نقطة غير صالحة")
+        with self._lock:
+            return self._record(self._require(match_id), KIND_POINT, side, delta)
+
+    def end_set(self, match_id: str) -> LiveScore:
+        with self._lock:
+            score = self._require(match_id)
+            if score.team1 == score.team2:
+                raise ValidationError("لا يمكن أن ينتهي الشوط بالتعادل")
+            return self._record(score, KIND_SET)
+
+    def finish(self, service: TournamentService, match_id: str) -> Match:
+        """Fold the live score into the match with one commit and end live mode.
+
+        Taps only rerun the scorekeeper's panel, so the service may still
+        hold the store as it was when the match started: refresh it first.
+        The change feed can lag a commit that just landed, so a refused
+        stale commit is redone once on the reloaded copy. The lock is held
+        only to read the score and to end it, never across the commit; a
+        retry after the end failed finds the result already in the match
+        and does not commit it again.
+        """
+        with self._lock:
+            score = self._require(match_id)
+        service.refresh_if_changed()
+        try:
+            match = self._settle(service, score)
+        except ConflictError:
+            match = self._settle(service, score)
+        with self._lock:
+            current = self._scores.get(match_id)
+            if current is not None:
+                self._end(current)
+        return match
+
+    @classmethod
+    def _settle(cls, service: TournamentService, score: LiveScore) -> Match:
+        """The match holding the live result, committing it unless it already does"""
+        tournament = service.require_tournament(score.tournament_id)
+        match = service.require_match(tournament, score.match_id)
+        if cls._holds(match, score, tournament.sport_type in SET_SPORTS):
+            return match
+        return cls._fold(service, score)
+
+    @staticmethod
+    def _holds(match: Match, score: LiveScore, in_sets: bool) -> bool:
+        """True if the match is already completed with exactly this live result"""
+        if not match.is_completed:
+            return False
+        if in_sets:
+            return list(match.sets or ()) == [points for pair in score.set_scores() for points in pair]
+        return (match.team1_score, match.team2_score) == (score.team1, score.team2)
+
+    @staticmethod
+    def _fold(service: TournamentService, score: LiveScore) -> Match:
+        tournament = service.require_tournament(score.tournament_id)
+        if tournament.sport_type in SET_SPORTS:
+            return service.update_match_sets(score.tournament_id, score.match_id, score.set_scores())
+        return service.update_match_result(score.tournament_id, score.match_id, score.team1, score.team2)
+
+    def cancel(self, match_id: str):
+        """Leave live mode without recording a result"""
+        with self._lock:
+            self._end(self._require(match_id))
+
+    def _end(self, score: LiveScore):
+        ended = replace(score, finished=True)
+        seq = clear_live_events(ended.match_id, ended.to_change())
+        if not seq:
+            # The log still holds the match; keep it live so ending can be retried
+            raise StorageError("تعذر إنهاء التسجيل المباشر")
+        ended.seq = max(ended.seq, seq)
+        self._put(ended)
+
+
+_live: Optional[LiveScoring] = None
+_live_lock = threading.Lock()
+
+
+def get_live_scoring() -> LiveScoring:
+    """The process-wide LiveScoring, subscribed to the change feed"""
+    global _live
+    if _live is None:
+        with _live_lock:
+            if _live is None:
+                live = LiveScoring()
+                live.load()
+                get_change_feed().add_listener(live.on_changes)
+                _live = live
+    return _live
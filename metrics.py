@@ -0,0 +1,314 @@
+"""Prometheus text metrics for storage and session health.
+
+Counters and histograms are plain attribute updates with no lock, so the
+hot paths (every save, load and rerun) stay cheap. Under the GIL a rare
+concurrent increment can be lost, which is fine for monitoring.
+
+Values that are cheap to read on demand (cache ratios, sessions, SSE
+subscribers) are collectors run at scrape time rather than counters.
+
+The Streamlit app and scoreboard_api.py are separate processes. The app
+calls publish() after each rerun, which at most every PUBLISH_INTERVAL
+seconds writes its snapshot as JSON into metrics_dir(). The API's /metrics
+renders its own registry merged with every fresh snapshot, each sample
+labelled with its process, plus the DB and WAL file sizes.
+"""
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Defaults to a metrics/ directory next to the database (see metrics_dir)
+METRICS_DIR = os.environ.get("TOURNAMENT_METRICS_DIR")
+PUBLISH_INTERVAL = 10.0
+# Snapshots older than this belong to a process that is gone
+SNAPSHOT_MAX_AGE = 60.0
+# A session counts as active if it reran (or polled for changes) this recently
+SESSION_TTL = 120.0
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7)
+
+# family -> {"type", "help", "samples": [[suffix, labels, value], ...]}
+Snapshot = Dict[str, dict]
+
+
+class Counter:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help: str):
+        self.name, self.help, self.value = name, help, 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def collect(self) -> Snapshot:
+        return {self.name: {"type": "counter", "help": self.help, "samples": [["", {}, self.value]]}}
+
+
+class Gauge(Counter):
+    __slots__ = ()
+
+    def set(self, value: float):
+        self.value = value
+
+    def collect(self) -> Snapshot:
+        return {self.name: {"type": "gauge", "help": self.help, "samples": [["", {}, self.value]]}}
+
+
+class Histogram:
+    __slots__ = ("name", "help", "buckets", "counts", "sum", "count")
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name, self.help, self.buckets = name, help, buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def collect(self) -> Snapshot:
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            samples.append(["_bucket", {"le": "+Inf" if bound == float("inf") else repr(bound)}, cumulative])
+        samples.append(["_sum", {}, self.sum])
+        samples.append(["_count", {}, self.count])
+        return {self.name: {"type": "histogram", "help": self.help, "samples": samples}}
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Snapshot]] = []
+
+    def add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self.add(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self.add(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.add(Histogram(name, help, buckets))
+
+    def register_collector(self, collector: Callable[[], Snapshot]):
+        """collector() runs at scrape/publish time and returns extra families"""
+        self._collectors.append(collector)
+
+    def collect(self) -> Snapshot:
+        families: Snapshot = {}
+        for metric in self._metrics:
+            families.update(metric.collect())
+        for collector in self._collectors:
+            try:
+                families.update(collector())
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        return families
+
+
+REGISTRY = Registry()
+
+save_seconds = REGISTRY.histogram("tournament_store_save_seconds", "Time to serialize and write all tournaments")
+load_seconds = REGISTRY.histogram("tournament_store_load_seconds", "Time to read and parse all tournaments")
+payload_bytes = REGISTRY.histogram(
+    "tournament_store_payload_bytes", "Serialized size of the tournaments blob per save/load", SIZE_BUCKETS,
+)
+reruns = REGISTRY.counter("tournament_reruns_total", "Full Streamlit script runs; use rate() for reruns per second")
+
+
+def gauge_family(name: str, help: str, samples: Iterable[Tuple[dict, float]], type: str = "gauge") -> Snapshot:
+    """A family of labelled samples read at collect time"""
+    return {name: {"type": type, "help": help, "samples": [["", labels, value] for labels, value in samples]}}
+
+
+def _cache_families() -> Snapshot:
+    from html_cache import get_fragment_cache
+    from slides import get_deck_cache
+
+    html = get_fragment_cache().stats()
+    deck = get_deck_cache()
+    caches = {
+        "html": (html["hits"], html["misses"]),
+        "slides": (deck.hits, deck.builds),
+    }
+    families: Snapshot = {}
+    families.update(gauge_family("tournament_cache_hits_total", "Cache hits since start",
+                                 (({"cache": c}, h) for c, (h, _) in caches.items()), "counter"))
+    families.update(gauge_family("tournament_cache_misses_total", "Cache misses (builds) since start",
+                                 (({"cache": c}, m) for c, (_, m) in caches.items()), "counter"))
+    families.update(gauge_family("tournament_cache_hit_ratio", "hits / (hits + misses)",
+                                 (({"cache": c}, h / (h + m) if h + m else 0.0) for c, (h, m) in caches.items())))
+    families.update(gauge_family("tournament_html_cache_bytes", "Bytes held by the HTML fragment cache",
+                                 [({}, html["bytes"])]))
+    return families
+
+
+REGISTRY.register_collector(_cache_families)
+
+
+class SessionTracker:
+    """Last-seen time per Streamlit session, and whether it is a slideshow kiosk"""
+
+    def __init__(self):
+        self._seen: Dict[str, Tuple[float, bool]] = {}
+
+    def seen(self, session_id: str, kiosk: bool = False):
+        self._seen[session_id] = (time.monotonic(), kiosk)
+
+    def counts(self) -> Tuple[int, int]:
+        cutoff = time.monotonic() - SESSION_TTL
+        for sid in [sid for sid, (ts, _) in list(self._seen.items()) if ts < cutoff]:
+            self._seen.pop(sid, None)
+        entries = list(self._seen.values())
+        return len(entries), sum(1 for _, kiosk in entries if kiosk)
+
+    def collect(self) -> Snapshot:
+        if not self._seen:
+            return {}
+        active, kiosks = self.counts()
+        families = gauge_family("tournament_active_sessions", "Streamlit sessions seen in the last two minutes",
+                                [({}, active)])
+        families.update(gauge_family("tournament_slideshow_sessions", "Active sessions running the automatic slideshow",
+                                     [({}, kiosks)]))
+        return families
+
+
+sessions = SessionTracker()
+REGISTRY.register_collector(sessions.collect)
+
+
+def session_seen(kiosk: bool = False):
+    """Mark the current Streamlit session as active (call from reruns and polling fragments)"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        sessions.seen(ctx.session_id, kiosk)
+
+
+_process_label = f"{os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0]}-{os.getpid()}"
+_last_publish = 0.0
+_publish_lock = threading.Lock()
+
+
+def metrics_dir() -> str:
+    if METRICS_DIR:
+        return METRICS_DIR
+    from utils import DB_PATH
+    return os.path.join(os.path.dirname(DB_PATH), "metrics")
+
+
+def set_process_name(name: str):
+    global _process_label
+    _process_label = f"{name}-{os.getpid()}"
+
+
+def publish(force: bool = False):
+    """Write this process's snapshot for the /metrics endpoint (rate limited)"""
+    global _last_publish
+    now = time.monotonic()
+    if not force and now - _last_publish < PUBLISH_INTERVAL:
+        return
+    if not _publish_lock.acquire(blocking=False):
+        return
+    try:
+        _last_publish = now
+        directory = metrics_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{_process_label}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(REGISTRY.collect(), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Metrics snapshot not written: {e}")
+    finally:
+        _publish_lock.release()
+
+
+def _published_snapshots() -> Dict[str, Snapshot]:
+    snapshots: Dict[str, Snapshot] = {}
+    directory = metrics_dir()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return snapshots
+    cutoff = time.time() - SNAPSHOT_MAX_AGE
+    for name in names:
+        if not name.endswith(".json") or name[:-5] == _process_label:
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                snapshots[name[:-5]] = json.load(f)
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _storage_families() -> Snapshot:
+    from utils import DB_PATH
+
+    def size(path: str) -> float:
+        try:
+            return float(os.path.getsize(path))
+        except OSError:
+            return 0.0
+
+    return gauge_family("tournament_db_file_bytes", "Size of the SQLite database files", [
+        ({"file": "db"}, size(DB_PATH)),
+        ({"file": "wal"}, size(f"{DB_PATH}-wal")),
+    ])
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render(snapshots: Optional[Dict[str, Snapshot]] = None) -> str:
+    """Prometheus text exposition of this process, fresh snapshots and the DB files"""
+    if snapshots is None:
+        snapshots = _published_snapshots()
+    sources = dict(snapshots)
+    sources[_process_label] = REGISTRY.collect()
+    merged: Dict[str, dict] = {}
+    for process, families in sorted(sources.items()):
+        for name, family in families.items():
+            target = merged.setdefault(name, {"type": family["type"], "help": family["help"], "samples": []})
+            for suffix, labels, value in family["samples"]:
+                target["samples"].append([suffix, {"process": process, **labels}, value])
+    merged.update(_storage_families())
+    lines = []
+    for name in sorted(merged):
+        family = merged[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for suffix, labels, value in family["samples"]:
+            lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
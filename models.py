@@ -1,9 +1,12 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 from enum import Enum
 import json
 import uuid
 
+from profiling import profiled
+
 class SportType(Enum):
     FOOTBALL = "كرة قدم"
     BASKETBALL = "كرة سلة"
@@ -14,6 +17,30 @@ class MatchStatus(Enum):
     PENDING = "معلقة"
     COMPLETED = "مكتملة"
 
+class OrphanPolicy(Enum):
+    """What happens to a removed team's matches"""
+    DELETE = "حذف المباريات"        # expunge every match of the team
+    # Played results stand either way; pending matches go to the opponent
+    FORFEIT = "خسارة بالانسحاب"     # at the sport's forfeit score
+    WALKOVER = "فوز إداري للخصم"    # at the minimal winning score
+
+# Scores recorded for matches settled without being played
+FORFEIT_SCORE = (3, 0)
+# FIBA awards a forfeited game 20-0
+SPORT_FORFEIT_SCORES = {SportType.BASKETBALL: (20, 0)}
+WALKOVER_SCORE = (1, 0)
+
+# Sports scored in sets; their match score is sets won, with per-set detail in Match.sets
+SET_SPORTS = (SportType.TENNIS, SportType.PING_PONG)
+# Sports where a match cannot end level
+NO_DRAW_SPORTS = SET_SPORTS + (SportType.BASKETBALL,)
+# Most sets a match can have (best of three in tennis, best of five in ping-pong)
+MAX_SETS = {SportType.TENNIS: 3, SportType.PING_PONG: 5}
+# Most points (games in tennis) one side can score in a set; Match.sets holds unsigned shorts
+MAX_SET_POINTS = 999
+# A forfeit or walkover in a set sport is straight sets at this score each
+FORFEIT_SET_POINTS = {SportType.TENNIS: 6, SportType.PING_PONG: 11}
+
 @dataclass
 class Team:
     id: str
@@ -34,11 +61,26 @@ class Match:
     status: MatchStatus = MatchStatus.PENDING
     group_id: Optional[str] = None
     round_type: str = "group"  # "group", "quarter", "semi", "final"
+    # Per-set points packed flat as team1, team2, team1, team2, ...; None
+    # when only the set count was entered (or the sport has no sets)
+    sets: Optional[array] = None
     
     def __post_init__(self):
         if not self.id:
             self.id = str(uuid.uuid4())
     
+    def set_scores(self) -> List[Tuple[int, int]]:
+        """(team1, team2) points of each set, in order"""
+        if not self.sets:
+            return []
+        return list(zip(self.sets[0::2], self.sets[1::2]))
+    
+    def record_sets(self, set_scores: List[Tuple[int, int]]):
+        """Store per-set points and set the match score to sets won"""
+        self.sets = array('H', [points for pair in set_scores for points in pair])
+        self.team1_score = sum(1 for team1, team2 in set_scores if team1 > team2)
+        self.team2_score = sum(1 for team1, team2 in set_scores if team2 > team1)
+    
     @property
     def is_completed(self) -> bool:
         return self.status == MatchStatus.COMPLETED and self.team1_score is not None and self.team2_score is not None
@@ -75,21 +117,201 @@ class Tournament:
     matches: Dict[str, Match] = field(default_factory=dict)
     knockout_matches: Dict[str, Match] = field(default_factory=dict)
     is_active: bool = True
+    # Bumped on every committed change; drives ETags and cache keys
+    version: int = 0
+    # Unordered pair index: (min_team_id, max_team_id, scope) -> match ids in
+    # insertion order (legacy data can hold the same pairing twice).
+    # scope is the group id for group matches and the round type for knockout.
+    _pair_index: Dict[Tuple[str, str, str], Dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # team_id -> ids of the groups / matches (group and knockout) it appears in
+    _team_groups: Dict[str, Set[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _team_matches: Dict[str, Set[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # group_id -> ids of its matches; a dict keeps them in insertion (display) order
+    _group_matches: Dict[str, Dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if not self.id:
             self.id = str(uuid.uuid4())
+        self.rebuild_indexes()
+    
+    @staticmethod
+    def _match_scope(match: Match) -> str:
+        return match.group_id if match.round_type == "group" else match.round_type
+    
+    @staticmethod
+    def _pair_key(team1_id: str, team2_id: str, scope: str) -> Tuple[str, str, str]:
+        if team1_id <= team2_id:
+            return team1_id, team2_id, scope
+        return team2_id, team1_id, scope
+    
+    def _index_match(self, match: Match):
+        key = self._pair_key(match.team1_id, match.team2_id, self._match_scope(match))
+        self._pair_index.setdefault(key, {})[match.id] = None
+        self._team_matches.setdefault(match.team1_id, set()).add(match.id)
+        self._team_matches.setdefault(match.team2_id, set()).add(match.id)
+        if match.round_type == "group":
+            self._group_matches.setdefault(match.group_id, {})[match.id] = None
+    
+    def _unindex_match(self, match: Match):
+        key = self._pair_key(match.team1_id, match.team2_id, self._match_scope(match))
+        match_ids = self._pair_index.get(key)
+        if match_ids is not None:
+            match_ids.pop(match.id, None)
+            if not match_ids:
+                del self._pair_index[key]
+        for team_id in (match.team1_id, match.team2_id):
+            match_ids = self._team_matches.get(team_id)
+            if match_ids is not None:
+                match_ids.discard(match.id)
+        if match.round_type == "group":
+            self._group_matches.get(match.group_id, {}).pop(match.id, None)
+    
+    def _index_groups(self):
+        self._team_groups.clear()
+        for group in self.groups.values():
+            for team_id in group.team_ids:
+                self._team_groups.setdefault(team_id, set()).add(group.id)
+    
+    def rebuild_indexes(self):
+        """Rebuild lookup indexes from the group and match dictionaries"""
+        self._pair_index.clear()
+        self._team_matches.clear()
+        self._group_matches.clear()
+        for match in self.matches.values():
+            self._index_match(match)
+        for match in self.knockout_matches.values():
+            self._index_match(match)
+        self._index_groups()
+    
+    def get_team_matches(self, team_id: str) -> List[Match]:
+        """All group and knockout matches a team plays in"""
+        found = []
+        for match_id in self._team_matches.get(team_id, ()):
+            match = self.matches.get(match_id) or self.knockout_matches.get(match_id)
+            if match is not None:
+                found.append(match)
+        return found
+    
+    def get_group_matches(self, group_id: str) -> List[Match]:
+        """Matches of a group in the order they were added"""
+        return [self.matches[match_id] for match_id in self._group_matches.get(group_id, ()) if match_id in self.matches]
+    
+    def find_pair_match(self, team1_id: str, team2_id: str, scope: str) -> Optional[Match]:
+        """Return the match between two teams in a group id or knockout round, if any"""
+        for match_id in self._pair_index.get(self._pair_key(team1_id, team2_id, scope), ()):
+            match = self.matches.get(match_id) or self.knockout_matches.get(match_id)
+            if match is not None:
+                return match
+        return None
+    
+    def get_head_to_head(self, team1_id: str, team2_id: str) -> List[Match]:
+        """All matches between two teams across groups and knockout rounds"""
+        scopes = list(self.groups.keys()) + ["semi", "final"]
+        found = []
+        for scope in scopes:
+            match = self.find_pair_match(team1_id, team2_id, scope)
+            if match is not None:
+                found.append(match)
+        return found
+    
+    def add_match(self, match: Match):
+        """Register a match in the right collection and the pair index"""
+        if match.round_type == "group":
+            self.matches[match.id] = match
+        else:
+            self.knockout_matches[match.id] = match
+        self._index_match(match)
+    
+    def remove_match(self, match_id: str) -> Optional[Match]:
+        """Delete a match from either collection and the pair index"""
+        match = self.matches.pop(match_id, None) or self.knockout_matches.pop(match_id, None)
+        if match is not None:
+            self._unindex_match(match)
+        return match
+    
+    def set_match_competitors(self, match: Match, team1_id: str, team2_id: str):
+        """Change the teams of a match and keep the pair index in sync"""
+        self._unindex_match(match)
+        match.team1_id = team1_id
+        match.team2_id = team2_id
+        self._index_match(match)
     
     def add_team(self, team: Team):
         self.teams[team.id] = team
     
-    def remove_team(self, team_id: str):
-        if team_id in self.teams:
-            del self.teams[team_id]
-            # Remove from groups
-            for group in self.groups.values():
-                if team_id in group.team_ids:
-                    group.team_ids.remove(team_id)
+    @staticmethod
+    def _name_key(name: str) -> str:
+        return " ".join(name.split()).casefold()
+    
+    def add_teams(self, names: List[str]) -> Tuple[List[Team], List[Tuple[int, str, str]]]:
+        """Add many teams at once, rejecting blanks and duplicate names.
+        
+        Returns (added_teams, errors) where each error is (index, name, reason).
+        """
+        seen = {self._name_key(team.name) for team in self.teams.values()}
+        batch = set()
+        added, errors = [], []
+        for index, raw_name in enumerate(names):
+            name = " ".join((raw_name or "").split())
+            key = name.casefold()
+            if not name:
+                errors.append((index, raw_name, "الاسم فارغ"))
+            elif key in batch:
+                errors.append((index, name, "اسم مكرر في القائمة"))
+            elif key in seen:
+                errors.append((index, name, "الاسم موجود مسبقاً في الدوري"))
+            else:
+                batch.add(key)
+                team = Team(id="", name=name, sport_type=self.sport_type)
+                self.add_team(team)
+                added.append(team)
+        return added, errors
+    
+    def remove_team(self, team_id: str, policy: OrphanPolicy = OrphanPolicy.DELETE) -> bool:
+        """Remove a team, its group memberships and settle its matches per policy"""
+        if team_id not in self.teams:
+            return False
+        del self.teams[team_id]
+        # Remove from the groups the team belongs to
+        for group_id in self._team_groups.pop(team_id, ()):
+            group = self.groups.get(group_id)
+            if group is not None:
+                group.team_ids = [tid for tid in group.team_ids if tid != team_id]
+        
+        knockout_changed = False
+        for match in self.get_team_matches(team_id):
+            if policy == OrphanPolicy.DELETE:
+                knockout_changed = knockout_changed or match.round_type != "group"
+                self.remove_match(match.id)
+                continue
+            # Played results stand: rewriting them would change the opponents' history
+            if match.is_completed:
+                continue
+            knockout_changed = knockout_changed or match.round_type != "group"
+            self._settle_unplayed(match, team_id, policy)
+        self._team_matches.pop(team_id, None)
+        
+        if knockout_changed and policy != OrphanPolicy.DELETE:
+            self.advance_knockout_stage()
+        return True
+    
+    def _settle_unplayed(self, match: Match, loser_id: str, policy: OrphanPolicy):
+        """Award a pending match to the opponent of loser_id with a score valid for the sport"""
+        if self.sport_type in SET_SPORTS:
+            won = (FORFEIT_SET_POINTS[self.sport_type], 0)
+            straight = [won if match.team2_id == loser_id else won[::-1]] * (MAX_SETS[self.sport_type] // 2 + 1)
+            match.record_sets(straight)
+        else:
+            if policy == OrphanPolicy.FORFEIT:
+                winner_score, loser_score = SPORT_FORFEIT_SCORES.get(self.sport_type, FORFEIT_SCORE)
+            else:
+                winner_score, loser_score = WALKOVER_SCORE
+            if match.team1_id == loser_id:
+                match.team1_score, match.team2_score = loser_score, winner_score
+            else:
+                match.team1_score, match.team2_score = winner_score, loser_score
+            match.sets = None
+        match.status = MatchStatus.COMPLETED
     
     def create_groups(self, teams_per_group: int = 4):
         """Create groups with specified number of teams per group"""
@@ -115,7 +337,8 @@ class Tournament:
             group_index = i % group_count
             group_id = list(self.groups.keys())[group_index]
             self.groups[group_id].team_ids.append(team_id)
-            
+        
+        self._index_groups()
         return True
     
     def create_custom_groups(self, group_sizes: list[int]):
@@ -146,11 +369,14 @@ class Tournament:
                     team_index += 1
             
             self.groups[group.id] = group
-            
+        
+        self._index_groups()
         return True
     
     def generate_group_matches(self):
         """Generate all possible matches within each group"""
+        for match in self.matches.values():
+            self._unindex_match(match)
         self.matches.clear()
         
         for group in self.groups.values():
@@ -165,69 +391,19 @@ class Tournament:
                         group_id=group.id,
                         round_type="group"
                     )
-                    self.matches[match.id] = match
+                    self.add_match(match)
     
+    @profiled("standings.group")
     def get_group_standings(self, group_id: str) -> List[Dict]:
         """Calculate standings for a specific group"""
-        if group_id not in self.groups:
-            return []
-            
-        group = self.groups[group_id]
-        standings = {}
-        
-        # Initialize standings for all teams in group
-        for team_id in group.team_ids:
-            standings[team_id] = {
-                'team_id': team_id,
-                'team_name': self.teams[team_id].name,
-                'played': 0,
-                'won': 0,
-                'drawn': 0,
-                'lost': 0,
-                'goals_for': 0,
-                'goals_against': 0,
-                'goal_difference': 0,
-                'points': 0
-            }
-        
-        # Calculate stats from completed matches
-        for match in self.matches.values():
-            if match.group_id == group_id and match.is_completed:
-                team1_stats = standings[match.team1_id]
-                team2_stats = standings[match.team2_id]
-                
-                team1_stats['played'] += 1
-                team2_stats['played'] += 1
-                team1_stats['goals_for'] += match.team1_score
-                team1_stats['goals_against'] += match.team2_score
-                team2_stats['goals_for'] += match.team2_score
-                team2_stats['goals_against'] += match.team1_score
-                
-                if match.team1_score > match.team2_score:
-                    team1_stats['won'] += 1
-                    team1_stats['points'] += 3
-                    team2_stats['lost'] += 1
-                elif match.team2_score > match.team1_score:
-                    team2_stats['won'] += 1
-                    team2_stats['points'] += 3
-                    team1_stats['lost'] += 1
-                else:
-                    team1_stats['drawn'] += 1
-                    team2_stats['drawn'] += 1
-                    team1_stats['points'] += 1
-                    team2_stats['points'] += 1
-                
-                team1_stats['goal_difference'] = team1_stats['goals_for'] - team1_stats['goals_against']
-                team2_stats['goal_difference'] = team2_stats['goals_for'] - team2_stats['goals_against']
-        
-        # Sort by points, then goal difference, then goals for
-        sorted_standings = sorted(
-            standings.values(),
-            key=lambda x: (x['points'], x['goal_difference'], x['goals_for']),
-            reverse=True
-        )
-        
-        return sorted_standings
+        from standings import group_standings
+        return group_standings(self, group_id)
+    
+    @profiled("standings.overall")
+    def get_overall_standings(self) -> List[Dict]:
+        """Standings of all teams over every completed group match"""
+        from standings import tournament_standings
+        return tournament_standings(self)
     
     def get_group_winners(self) -> List[str]:
         """Get the winner from each group"""
@@ -249,6 +425,8 @@ class Tournament:
         if len(winners) < 2:
             return False
             
+        for match in self.knockout_matches.values():
+            self._unindex_match(match)
         self.knockout_matches.clear()
         
         if len(winners) == 2:
@@ -259,7 +437,7 @@ class Tournament:
                 team2_id=winners[1],
                 round_type="final"
             )
-            self.knockout_matches[final_match.id] = final_match
+            self.add_match(final_match)
         elif len(winners) == 4:
             # Semi-finals
             semi1 = Match(
@@ -274,8 +452,8 @@ class Tournament:
                 team2_id=winners[2],
                 round_type="semi"
             )
-            self.knockout_matches[semi1.id] = semi1
-            self.knockout_matches[semi2.id] = semi2
+            self.add_match(semi1)
+            self.add_match(semi2)
         
         return True
     
@@ -299,8 +477,25 @@ class Tournament:
                     team2_id=semi_winners[1],
                     round_type="final"
                 )
-                self.knockout_matches[final_match.id] = final_match
+                self.add_match(final_match)
 
+    @staticmethod
+    def _match_dict(match: Match) -> dict:
+        data = {
+            'id': match.id,
+            'team1_id': match.team1_id,
+            'team2_id': match.team2_id,
+            'team1_score': match.team1_score,
+            'team2_score': match.team2_score,
+            'status': match.status.value,
+            'group_id': match.group_id,
+            'round_type': match.round_type
+        }
+        if match.sets:
+            # A flat list of small ints keeps hundreds of set matches compact
+            data['sets'] = match.sets.tolist()
+        return data
+    
     def to_dict(self) -> dict:
         """Convert tournament to dictionary for JSON serialization"""
         return {
@@ -308,6 +503,7 @@ class Tournament:
             'name': self.name,
             'sport_type': self.sport_type.value,
             'is_active': self.is_active,
+            'version': self.version,
             'teams': {k: {
                 'id': v.id,
                 'name': v.name,
@@ -318,26 +514,8 @@ class Tournament:
                 'name': v.name,
                 'team_ids': v.team_ids
             } for k, v in self.groups.items()},
-            'matches': {k: {
-                'id': v.id,
-                'team1_id': v.team1_id,
-                'team2_id': v.team2_id,
-                'team1_score': v.team1_score,
-                'team2_score': v.team2_score,
-                'status': v.status.value,
-                'group_id': v.group_id,
-                'round_type': v.round_type
-            } for k, v in self.matches.items()},
-            'knockout_matches': {k: {
-                'id': v.id,
-                'team1_id': v.team1_id,
-                'team2_id': v.team2_id,
-                'team1_score': v.team1_score,
-                'team2_score': v.team2_score,
-                'status': v.status.value,
-                'group_id': v.group_id,
-                'round_type': v.round_type
-            } for k, v in self.knockout_matches.items()}
+            'matches': {k: self._match_dict(v) for k, v in self.matches.items()},
+            'knockout_matches': {k: self._match_dict(v) for k, v in self.knockout_matches.items()}
         }
     
     @classmethod
@@ -347,7 +525,8 @@ class Tournament:
             id=data['id'],
             name=data['name'],
             sport_type=SportType(data['sport_type']),
-            is_active=data.get('is_active', True)
+            is_active=data.get('is_active', True),
+            version=data.get('version', 0)
         )
         
         # Load teams
@@ -378,7 +557,8 @@ class Tournament:
                 team2_score=match_data['team2_score'],
                 status=MatchStatus(match_data['status']),
                 group_id=match_data.get('group_id'),
-                round_type=match_data.get('round_type', 'group')
+                round_type=match_data.get('round_type', 'group'),
+                sets=array('H', match_data['sets']) if match_data.get('sets') else None
             )
             tournament.matches[match.id] = match
         
@@ -392,7 +572,8 @@ class Tournament:
                 team2_score=match_data['team2_score'],
                 status=MatchStatus(match_data['status']),
                 group_id=match_data.get('group_id'),
-                round_type=match_data.get('round_type', 'knockout')
+                round_type=match_data.get('round_type', 'knockout'),
+                sets=array('H', match_data['sets']) if match_data.get('sets') else None
             )
             tournament.knockout_matches[match.id] = match
         
@@ -411,4 +592,5 @@ class Tournament:
                     for m in unknown:
                         m.round_type = "semi"
 
+        tournament.rebuild_indexes()
         return tournament
@@ -0,0 +1,214 @@
+"""Opt-in render profiler.
+
+Off unless the TOURNAMENT_PROFILE environment variable is set (1/true/yes).
+When off, @profiled returns the function unchanged and rerun() does
+nothing, so the instrumented code runs at full speed.
+
+When on:
+- @profiled("page.dashboard") times a function. Page renders, storage
+  calls and standings computation are wrapped.
+- rerun(page) wraps one script run in main(). It records the run's
+  duration, the bytes of the messages sent to the browser, the session's
+  reruns per minute, and the profiled calls made during the run.
+- Totals per name are kept process-wide for the debug panel (render_panel,
+  shown with ?debug=1). Each rerun is appended as one JSON line to a
+  rotating log: TOURNAMENT_PROFILE_LOG, default profile.log next to this file.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Optional
+
+ENABLED = os.environ.get("TOURNAMENT_PROFILE", "").strip().lower() in ("1", "true", "yes")
+LOG_PATH = os.environ.get(
+    "TOURNAMENT_PROFILE_LOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "profile.log"),
+)
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+# Reruns per session kept for the per-minute rate
+RERUN_WINDOW_SECONDS = 60
+
+
+class CallStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def as_row(self, name: str) -> dict:
+        return {
+            "name": name,
+            "calls": self.count,
+            "total_ms": round(self.total * 1000, 1),
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+class Profiler:
+    """Process-wide call totals plus the calls of the rerun running on this thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, CallStats] = {}
+        self._local = threading.local()
+        self._logger: Optional[logging.Logger] = None
+
+    def record(self, name: str, elapsed: float):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = CallStats()
+            stats.add(elapsed)
+        current = getattr(self._local, "calls", None)
+        if current is not None:
+            current.setdefault(name, CallStats()).add(elapsed)
+
+    def rows(self) -> list:
+        with self._lock:
+            rows = [stats.as_row(name) for name, stats in self._stats.items()]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def begin_rerun(self):
+        self._local.calls = {}
+
+    def end_rerun(self) -> Dict[str, CallStats]:
+        calls = getattr(self._local, "calls", None) or {}
+        self._local.calls = None
+        return calls
+
+    def log(self, entry: dict):
+        if self._logger is None:
+            logger = logging.getLogger("tournament.profile")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            if not logger.handlers:
+                try:
+                    handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+                except OSError as e:
+                    print(f"Profile log unavailable: {e}")
+                    handler = logging.NullHandler()
+                logger.addHandler(handler)
+            self._logger = logger
+        self._logger.info(json.dumps(entry, ensure_ascii=False))
+
+
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    return _profiler
+
+
+def profiled(name: str):
+    """Time every call under name; a no-op decorator when profiling is off"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _profiler.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def _count_payload(ctx, sizes: list):
+    """Wrap the run context's message queue to add up the bytes sent"""
+    enqueue = ctx._enqueue
+
+    def counting_enqueue(msg):
+        sizes[0] += msg.ByteSize()
+        sizes[1] += 1
+        return enqueue(msg)
+
+    ctx._enqueue = counting_enqueue
+    return enqueue
+
+
+@contextmanager
+def rerun(page: str):
+    """Profile one script run of page (timing, payload, rerun rate, calls)"""
+    if not ENABLED:
+        yield
+        return
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    sizes = [0, 0]
+    original_enqueue = None
+    if ctx is not None and hasattr(ctx, "_enqueue"):
+        original_enqueue = _count_payload(ctx, sizes)
+    history = st.session_state.setdefault("_profile_reruns", deque())
+    now = time.time()
+    history.append(now)
+    while history and history[0] < now - RERUN_WINDOW_SECONDS:
+        history.popleft()
+    _profiler.begin_rerun()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if original_enqueue is not None:
+            ctx._enqueue = original_enqueue
+        calls = _profiler.end_rerun()
+        _profiler.record(f"rerun.{page}", elapsed)
+        entry = {
+            "ts": round(now, 3),
+            "session": ctx.session_id[:8] if ctx is not None else None,
+            "page": page,
+            "ms": round(elapsed * 1000, 1),
+            "payload_bytes": sizes[0],
+            "messages": sizes[1],
+            "reruns_per_min": len(history),
+            "calls": {name: [s.count, round(s.total * 1000, 1)] for name, s in calls.items()},
+        }
+        st.session_state["_profile_last"] = entry
+        _profiler.log(entry)
+
+
+def render_panel():
+    """Hidden debug panel: shown with ?debug=1 while profiling is on"""
+    if not ENABLED:
+        return
+    import streamlit as st
+
+    if st.query_params.get("debug") != "1":
+        return
+    with st.expander("🛠️ Profiler", expanded=False):
+        last = st.session_state.get("_profile_last")
+        if last:
+            cols = st.columns(4)
+            cols[0].metric("last rerun (ms)", last["ms"])
+            cols[1].metric("payload (bytes)", last["payload_bytes"])
+            cols[2].metric("messages", last["messages"])
+            cols[3].metric("reruns / min", last["reruns_per_min"])
+        st.dataframe(_profiler.rows(), use_container_width=True, hide_index=True)
+        st.caption(f"log: {LOG_PATH}")
+        if st.button("reset", key="profile_reset"):
+            _profiler.reset()
@@ -0,0 +1,315 @@
+"""Read-only JSON scoreboard API for display screens.
+
+Serves tournaments, standings, fixtures and brackets from the shared
+SQLite store without a Streamlit session per screen:
+
+    python scoreboard_api.py --port 8600
+
+Routes:
+    /api/tournaments
+    /api/tournaments/<id>
+    /api/tournaments/<id>/standings
+    /api/tournaments/<id>/fixtures
+    /api/tournaments/<id>/bracket
+    /api/events?since=<seq>      (Server-Sent Events)
+    /api/live                    (scores of matches being scored live)
+    /metrics                     (Prometheus text, see metrics.py)
+
+Every response carries an ETag derived from the tournament version (or
+the store mtime for the list), so a poll with a matching If-None-Match
+gets a 304 without any serialization. Serialized bodies are cached per
+version, so only the first request after a change pays for json.dumps.
+
+/api/events streams the change log as SSE: match_updated and
+standings_changed deltas a screen can apply in place, followed by a
+tournament_changed event with the new version. The stream resumes from
+the Last-Event-ID header (or ?since=) after a reconnect. Live scoring
+sends a live_score event per point with the match's whole live score;
+/api/live gives the current ones to a screen that has just connected.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import metrics
+from change_feed import get_change_feed, is_commit
+from live_scoring import get_live_scoring
+from models import Tournament
+from tournament_service import TournamentService
+from utils import get_round_name
+
+# Minimum seconds between two store mtime checks; bounds DB reads under load
+REFRESH_INTERVAL = 0.25
+# Seconds of silence before an SSE comment is sent to keep proxies from closing the stream
+SSE_KEEPALIVE = 15.0
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _team_name(tournament: Tournament, team_id: str) -> str:
+    team = tournament.teams.get(team_id)
+    return team.name if team else "—"
+
+
+def _match_payload(tournament: Tournament, match) -> dict:
+    return {
+        'id': match.id,
+        'team1_id': match.team1_id,
+        'team2_id': match.team2_id,
+        'team1_name': _team_name(tournament, match.team1_id),
+        'team2_name': _team_name(tournament, match.team2_id),
+        'team1_score': match.team1_score,
+        'team2_score': match.team2_score,
+        'sets': match.sets.tolist() if match.sets else None,
+        'status': match.status.value,
+        'completed': match.is_completed,
+        'group_id': match.group_id,
+        'round_type': match.round_type,
+    }
+
+
+def tournament_summary(tournament: Tournament) -> dict:
+    all_matches = list(tournament.matches.values()) + list(tournament.knockout_matches.values())
+    return {
+        'id': tournament.id,
+        'name': tournament.name,
+        'sport_type': tournament.sport_type.value,
+        'version': tournament.version,
+        'teams': len(tournament.teams),
+        'groups': len(tournament.groups),
+        'matches_total': len(all_matches),
+        'matches_completed': sum(1 for m in all_matches if m.is_completed),
+    }
+
+
+def standings_payload(tournament: Tournament) -> dict:
+    return {
+        'tournament_id': tournament.id,
+        'version': tournament.version,
+        'groups': [
+            {'id': gid, 'name': group.name, 'standings': tournament.get_group_standings(gid)}
+            for gid, group in tournament.groups.items()
+        ],
+    }
+
+
+def fixtures_payload(tournament: Tournament) -> dict:
+    return {
+        'tournament_id': tournament.id,
+        'version': tournament.version,
+        'matches': [_match_payload(tournament, m) for m in tournament.matches.values()],
+    }
+
+
+def bracket_payload(tournament: Tournament) -> dict:
+    rounds = {}
+    for match in tournament.knockout_matches.values():
+        rounds.setdefault(match.round_type, []).append(_match_payload(tournament, match))
+    return {
+        'tournament_id': tournament.id,
+        'version': tournament.version,
+        'rounds': [
+            {'round_type': rt, 'name': get_round_name(rt), 'matches': rounds[rt]}
+            for rt in ("semi", "final") if rt in rounds
+        ],
+    }
+
+
+TOURNAMENT_VIEWS: Dict[str, Callable[[Tournament], dict]] = {
+    '': lambda t: t.to_dict(),
+    'standings': standings_payload,
+    'fixtures': fixtures_payload,
+    'bracket': bracket_payload,
+}
+
+
+class ScoreboardStore:
+    """Shared read-only view of the store with per-version response caching"""
+
+    def __init__(self, service: Optional[TournamentService] = None):
+        feed = get_change_feed()
+        self.service = service or TournamentService(watch_mtime=lambda: feed.store_mtime)
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        # (tournament_id, view) -> (etag, body); '' tournament id is the list
+        self._bodies: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+
+    def refresh(self):
+        now = time.monotonic()
+        if now - self._last_check < REFRESH_INTERVAL:
+            return
+        with self._lock:
+            if now - self._last_check < REFRESH_INTERVAL:
+                return
+            self._last_check = now
+            if self.service.refresh_if_changed():
+                self._bodies.clear()
+
+    def mark_stale(self, events=None):
+        """Force the next request to check the store (called on change-feed events)"""
+        if events is None or any(is_commit(change) for _, change in events):
+            self._last_check = 0.0
+
+    def etag_for(self, tournament_id: str, view: str) -> Optional[str]:
+        """Compute the ETag for a route without building its body"""
+        if not tournament_id:
+            return f'"store-{self.service.data_mtime!r}"'
+        tournament = self.service.tournaments.get(tournament_id)
+        if tournament is None:
+            return None
+        return f'"{tournament.id}-{tournament.version}-{view or "full"}"'
+
+    def body_for(self, tournament_id: str, view: str, etag: str) -> bytes:
+        key = (tournament_id, view)
+        cached = self._bodies.get(key)
+        if cached and cached[0] == etag:
+            return cached[1]
+        tournaments = self.service.tournaments
+        if not tournament_id:
+            payload = {'tournaments': [tournament_summary(t) for t in tournaments.values()]}
+        else:
+            payload = TOURNAMENT_VIEWS[view](tournaments[tournament_id])
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self._bodies[key] = (etag, body)
+        return body
+
+
+def parse_route(path: str) -> Optional[Tuple[str, str]]:
+    """Map a request path to (tournament_id, view); None if unknown"""
+    parts = [p for p in path.split('?', 1)[0].split('/') if p]
+    if parts[:2] != ['api', 'tournaments']:
+        return None
+    if len(parts) == 2:
+        return '', ''
+    if len(parts) == 3:
+        return parts[2], ''
+    if len(parts) == 4 and parts[3] in TOURNAMENT_VIEWS:
+        return parts[2], parts[3]
+    return None
+
+
+class ScoreboardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer the response so headers and body leave in one write; separate
+    # small writes stall keep-alive clients on delayed ACKs
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    store: ScoreboardStore = None  # set by make_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"", etag: Optional[str] = None,
+              content_type: str = "application/json; charset=utf-8"):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _stream_events(self):
+        feed = get_change_feed()
+        query = parse_qs(urlsplit(self.path).query)
+        last_id = self.headers.get("Last-Event-ID") or (query.get("since") or [None])[0]
+        try:
+            last_seq = int(last_id) if last_id is not None else feed.latest_seq
+        except ValueError:
+            last_seq = feed.latest_seq
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.close_connection = True
+        feed.subscribe()
+        try:
+            self.wfile.write(f"retry: 1000\nid: {last_seq}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            while True:
+                events = feed.wait_for(last_seq, SSE_KEEPALIVE)
+                if events:
+                    chunks = []
+                    for seq, change in events:
+                        data = json.dumps(change, ensure_ascii=False, separators=(',', ':'))
+                        chunks.append(f"id: {seq}\nevent: {change.get('type', 'message')}\ndata: {data}\n\n")
+                    last_seq = events[-1][0]
+                    self.wfile.write("".join(chunks).encode("utf-8"))
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            feed.unsubscribe()
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip('/')
+        if path == '/api/events':
+            self._stream_events()
+            return
+        if path == '/api/live':
+            scores = [score.to_change() for score in get_live_scoring().live()]
+            self._send(200, json.dumps({'matches': scores}, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            return
+        if path == '/metrics':
+            self._send(200, metrics.render().encode("utf-8"), content_type=METRICS_CONTENT_TYPE)
+            return
+        route = parse_route(self.path)
+        if route is None:
+            self._send(404, b'{"error":"not found"}')
+            return
+        self.store.refresh()
+        tournament_id, view = route
+        etag = self.store.etag_for(tournament_id, view)
+        if etag is None:
+            self._send(404, b'{"error":"tournament not found"}')
+            return
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, etag=etag)
+            return
+        self._send(200, self.store.body_for(tournament_id, view, etag), etag=etag)
+
+
+def _sse_families() -> metrics.Snapshot:
+    return metrics.gauge_family(
+        "tournament_sse_subscribers", "Screens connected to /api/events", [({}, get_change_feed().subscribers)],
+    )
+
+
+def make_server(host: str = "0.0.0.0", port: int = 8600, store: Optional[ScoreboardStore] = None) -> ThreadingHTTPServer:
+    store = store or ScoreboardStore()
+    get_change_feed().add_listener(store.mark_stale)
+    metrics.set_process_name("api")
+    metrics.REGISTRY.register_collector(_sse_families)
+    handler = type("BoundScoreboardHandler", (ScoreboardHandler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only JSON scoreboard API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+    server = make_server(args.host, args.port)
+    print(f"Scoreboard API on http://{args.host}:{args.port}/api/tournaments")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Arabic-aware search over tournament and team names.
+
+Names are normalized before indexing and querying: diacritics and
+tatweel are dropped, alef forms fold to ا, taa marbuta to ه, alef
+maqsura to ي, hamza carriers to their base letter, Arabic-Indic digits
+to ASCII, and Latin text is case-folded. Normalized names are indexed by
+character trigram; a query intersects the trigram postings and checks
+the surviving candidates by substring. Queries shorter than three
+characters scan the normalized names directly.
+
+Teams in individual sports are the players, so team entries cover
+player names too. The index is process-wide and re-indexes only the
+tournaments whose version moved since the last sync().
+"""
+import heapq
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from models import Tournament
+
+KIND_TOURNAMENT = "tournament"
+KIND_TEAM = "team"
+
+_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+_SPACES = re.compile(r'\s+')
+_FOLD = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ة': 'ه',
+    'ى': 'ي',
+    'ؤ': 'و',
+    'ئ': 'ي',
+    **{chr(0x0660 + d): str(d) for d in range(10)},
+    **{chr(0x06F0 + d): str(d) for d in range(10)},
+})
+
+GRAM = 3
+
+
+def normalize_arabic(text: str) -> str:
+    """Fold spelling variants so equivalent Arabic spellings compare equal"""
+    text = _DIACRITICS.sub('', text or '').translate(_FOLD).casefold()
+    return _SPACES.sub(' ', text).strip()
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    kind: str
+    tournament_id: str
+    entity_id: str
+    name: str
+    normalized: str
+
+
+class SearchIndex:
+    """Trigram index over tournament and team names"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, SearchEntry] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._by_tournament: Dict[str, List[int]] = {}
+        self._versions: Dict[str, int] = {}
+        self._next_id = 0
+
+    def _add(self, entry: SearchEntry):
+        doc_id = self._next_id
+        self._next_id += 1
+        self._entries[doc_id] = entry
+        self._by_tournament.setdefault(entry.tournament_id, []).append(doc_id)
+        for gram in _grams(entry.normalized):
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def _remove_tournament(self, tournament_id: str):
+        for doc_id in self._by_tournament.pop(tournament_id, []):
+            entry = self._entries.pop(doc_id)
+            for gram in _grams(entry.normalized):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(doc_id)
+                    if not posting:
+                        del self._postings[gram]
+        self._versions.pop(tournament_id, None)
+
+    def _index_tournament(self, tournament: Tournament):
+        self._remove_tournament(tournament.id)
+        self._add(SearchEntry(KIND_TOURNAMENT, tournament.id, tournament.id,
+                              tournament.name, normalize_arabic(tournament.name)))
+        for team_id, team in tournament.teams.items():
+            self._add(SearchEntry(KIND_TEAM, tournament.id, team_id, team.name, normalize_arabic(team.name)))
+        self._versions[tournament.id] = tournament.version
+
+    def sync(self, tournaments: Dict[str, Tournament]):
+        """Re-index changed tournaments and drop deleted ones"""
+        with self._lock:
+            for tid in [tid for tid in self._versions if tid not in tournaments]:
+                self._remove_tournament(tid)
+            for tid, tournament in tournaments.items():
+                # Never replace a newer version indexed by another session
+                if self._versions.get(tid, -1) < tournament.version:
+                    self._index_tournament(tournament)
+
+    def _matches(
+        self,
+        needle: str,
+        kinds: Optional[Iterable[str]],
+        tournament_id: Optional[str],
+    ) -> List[SearchEntry]:
+        kinds = set(kinds) if kinds is not None else None
+        with self._lock:
+            if tournament_id is not None:
+                candidates = self._by_tournament.get(tournament_id, [])
+            elif len(needle) < GRAM:
+                candidates = self._entries.keys()
+            else:
+                postings = sorted((self._postings.get(g, set()) for g in _grams(needle)), key=len)
+                candidates = set.intersection(*postings) if postings[0] else ()
+            entries = [self._entries[doc_id] for doc_id in candidates]
+        return [
+            entry for entry in entries
+            if needle in entry.normalized and (kinds is None or entry.kind in kinds)
+        ]
+
+    def search(
+        self,
+        query: str,
+        kinds: Optional[Iterable[str]] = None,
+        tournament_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[SearchEntry]:
+        """Entries whose normalized name contains the normalized query.
+
+        Exact matches rank first, then name prefixes, then word prefixes,
+        then other substrings; ties are broken by name.
+        """
+        needle = normalize_arabic(query)
+        if not needle:
+            return []
+        word = f" {needle}"
+
+        def rank(entry: SearchEntry):
+            name = entry.normalized
+            if name == needle:
+                return (0, name)
+            if name.startswith(needle):
+                return (1, name)
+            return (2 if word in name else 3, name)
+
+        hits = self._matches(needle, kinds, tournament_id)
+        if limit is not None:
+            return heapq.nsmallest(limit, hits, key=rank)
+        return sorted(hits, key=rank)
+
+    def tournament_ids(self, query: str) -> Set[str]:
+        """Tournaments whose own name or one of whose team names matches"""
+        needle = normalize_arabic(query)
+        return {entry.tournament_id for entry in self._matches(needle, None, None)} if needle else set()
+
+    def team_ids(self, tournament_id: str, query: str) -> Set[str]:
+        needle = normalize_arabic(query)
+        if not needle:
+            return set()
+        return {entry.entity_id for entry in self._matches(needle, (KIND_TEAM,), tournament_id)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_index = SearchIndex()
+
+
+def get_search_index(tournaments: Optional[Dict[str, Tournament]] = None) -> SearchIndex:
+    """Process-wide index, synced with tournaments when given"""
+    if tournaments is not None:
+        _index.sync(tournaments)
+    return _index
@@ -0,0 +1,192 @@
+"""Slide deck for the automatic results slideshow.
+
+Slides are plain HTML built from a tournament snapshot. Decks are cached
+per process keyed by tournament id and version, so every kiosk session
+shares them and a commit only rebuilds the slides of the tournament it
+touched.
+"""
+import threading
+from html import escape
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from html_cache import cached_fragment
+from models import Tournament
+from templates import points_table, matches_table, slide_matches_list, team_names
+from theme import GROUPS_GRID_CSS, style_tag
+from utils import get_sport_icon, get_round_name
+
+# Target rows (standings + matches + headers) per groups slide
+MAX_SLIDE_ROWS = 28
+
+
+@dataclass
+class Slide:
+    tournament_id: str
+    kind: str  # 'groups_chunk' | 'knockout'
+    payload: Optional[List[str]]  # group ids of a chunk
+    sport: str
+    total_rows: int
+    scale: float
+    cell_padding: int
+    font_size: int
+    card_padding: int
+    html: str
+
+
+def slide_density(total_rows: int) -> Tuple[float, int, int, int]:
+    """Return (scale, cell padding, font size, card padding) fitting the rows in one viewport"""
+    scale = 1.0
+    for limit, value in ((18, 0.95), (26, 0.9), (34, 0.85), (42, 0.8), (50, 0.75),
+                         (60, 0.7), (75, 0.65), (90, 0.6), (110, 0.55), (140, 0.5)):
+        if total_rows > limit:
+            scale = value
+    comp_pad, comp_font, card_pad = 6, 12, 10
+    if total_rows > 60:
+        comp_pad, comp_font, card_pad = 5, 11, 8
+    if total_rows > 90:
+        comp_pad, comp_font, card_pad = 4, 10, 6
+    return scale, comp_pad, comp_font, card_pad
+
+
+def _title_html(tournament: Tournament) -> str:
+    title = f"{get_sport_icon(tournament.sport_type.value)} {escape(tournament.name)}"
+    return f"<h1 style='text-align:center;margin:0 0 0.5rem;'>{title}</h1>"
+
+
+def _group_card_html(group, standings: List[Dict], group_matches: list, tournament: Tournament, names: Dict[str, str]) -> str:
+    return (
+        "<div class='group-card'>"
+        f"<div class='group-title'>{escape(group.name)}</div>"
+        "<div class='slide-xs' style='margin:2px 0 4px 0'>الترتيب</div>"
+        + points_table(standings, "pro-table compact", "<tr><td>—</td><td>0</td></tr>", names, group.id)
+        + "<div class='slide-xs' style='margin:8px 0 4px 0'>المباريات</div>"
+        + matches_table(tournament, group_matches, css_class="pro-table compact",
+                        empty_row="<tr><td>—</td><td>—</td><td>—</td></tr>", names=names, tagged=True)
+        + "</div>"
+    )
+
+
+def _knockout_slide_html(tournament: Tournament) -> str:
+    parts = ["<div class='section-title'>🏆 دور الإقصاء</div>"]
+    rounds: Dict[str, list] = {}
+    for match in tournament.knockout_matches.values():
+        rounds.setdefault(match.round_type, []).append(match)
+    names = team_names(tournament)
+    for round_type in ("semi", "final"):
+        if round_type in rounds:
+            parts.append(f"<div class='subsection-title'>{get_round_name(round_type)}</div>")
+            parts.append(slide_matches_list(tournament, rounds[round_type], names))
+    return "".join(parts)
+
+
+def _make_slide(tournament: Tournament, kind: str, payload, total_rows: int, body_html: str) -> Slide:
+    scale, pad, font, card_pad = slide_density(total_rows)
+    return Slide(
+        tournament_id=tournament.id,
+        kind=kind,
+        payload=payload,
+        sport=tournament.sport_type.value,
+        total_rows=total_rows,
+        scale=scale,
+        cell_padding=pad,
+        font_size=font,
+        card_padding=card_pad,
+        html=_title_html(tournament) + body_html,
+    )
+
+
+def build_tournament_slides(tournament: Tournament) -> List[Slide]:
+    """Build the slides of one tournament: chunks of groups, then the knockout stage.
+
+    Standings and per-group matches are computed once per group and shared
+    by the row estimate and the rendered HTML.
+    """
+    slides: List[Slide] = []
+    if tournament.groups:
+        matches_by_group: Dict[str, list] = {gid: [] for gid in tournament.groups}
+        for match in tournament.matches.values():
+            if match.group_id in matches_by_group:
+                matches_by_group[match.group_id].append(match)
+        total_group_matches = len(tournament.matches)
+        names = team_names(tournament)
+        group_header = "<div class='section-title'>🏁 دور المجموعات</div>" + style_tag(GROUPS_GRID_CSS)
+
+        def flush(chunk: List[str], cards: List[str], standing_rows: int):
+            body = group_header + "<div class='groups-grid'>" + "\n".join(cards) + "</div>"
+            # Scale counts every group match of the tournament, as the slideshow always has
+            slides.append(_make_slide(tournament, 'groups_chunk', chunk, standing_rows + total_group_matches, body))
+
+        chunk: List[str] = []
+        cards: List[str] = []
+        chunk_rows = 0
+        standing_rows = 0
+        for gid, group in tournament.groups.items():
+            standings = tournament.get_group_standings(gid)
+            group_matches = matches_by_group[gid]
+            g_rows = max(2, len(standings)) + max(1, len(group_matches)) + 2  # include headers/margins
+            # If adding this group would overflow the target, flush current chunk
+            if chunk_rows > 0 and chunk_rows + g_rows > MAX_SLIDE_ROWS:
+                flush(chunk, cards, standing_rows)
+                chunk, cards, chunk_rows, standing_rows = [], [], 0, 0
+            chunk.append(gid)
+            cards.append(cached_fragment(
+                tournament, 'slide_group_card', gid,
+                lambda: _group_card_html(group, standings, group_matches, tournament, names),
+            ))
+            chunk_rows += g_rows
+            standing_rows += len(standings)
+        if chunk:
+            flush(chunk, cards, standing_rows)
+    if tournament.knockout_matches:
+        body = cached_fragment(tournament, 'slide_knockout', None, lambda: _knockout_slide_html(tournament))
+        slides.append(_make_slide(tournament, 'knockout', None, len(tournament.knockout_matches), body))
+    return slides
+
+
+class SlideDeckCache:
+    """Process-wide slides per tournament, rebuilt only when the tournament version moves"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._decks: Dict[str, Tuple[int, List[Slide]]] = {}
+        self.builds = 0
+        self.hits = 0
+
+    def slides_for(self, tournament: Tournament) -> List[Slide]:
+        with self._lock:
+            cached = self._decks.get(tournament.id)
+        if cached and cached[0] == tournament.version:
+            self.hits += 1
+            return cached[1]
+        slides = build_tournament_slides(tournament)
+        with self._lock:
+            self.builds += 1
+            current = self._decks.get(tournament.id)
+            # A session holding a stale snapshot must not evict the newer deck
+            if current is None or current[0] <= tournament.version:
+                self._decks[tournament.id] = (tournament.version, slides)
+        return slides
+
+    def deck(self, tournaments: List[Tournament]) -> List[Slide]:
+        """All slides of the given tournaments, in order"""
+        slides: List[Slide] = []
+        for tournament in tournaments:
+            slides.extend(self.slides_for(tournament))
+        live_ids = {t.id for t in tournaments}
+        with self._lock:
+            for tid in [tid for tid in self._decks if tid not in live_ids]:
+                del self._decks[tid]
+        return slides
+
+
+_deck_cache = SlideDeckCache()
+
+
+def get_deck_cache() -> SlideDeckCache:
+    return _deck_cache
+
+
+def get_slide_deck(tournaments: List[Tournament]) -> List[Slide]:
+    """Slides for the slideshow, shared by every session in the process"""
+    return _deck_cache.deck(tournaments)
@@ -0,0 +1,156 @@
+"""Standings aggregation shared by every table, slide and API response.
+
+One engine folds completed results into per-team rows in a single pass
+over the matches of a scope: a group or a whole tournament. Points per
+result and the tie-breaker order come from the PointRule of the
+tournament's sport; register_rule swaps one in.
+
+Rows are plain dicts with team_id, team_name, played, won, drawn, lost,
+goals_for, goals_against, goal_difference and points, the shape the
+templates and the API read. For tennis and ping-pong the scores are
+sets, so goals_for/goal_difference are sets won/set difference, and rows
+also carry points_won/points_lost (the points inside the sets; games in
+tennis) with set_ratio and point_ratio, each the share won (0-1).
+"""
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from models import Match, SportType, Tournament
+
+
+@dataclass(frozen=True)
+class PointRule:
+    win: int = 3
+    draw: int = 1
+    loss: int = 0
+    # Row fields compared in order, highest first
+    tiebreakers: Tuple[str, ...] = ("points", "goal_difference", "goals_for")
+    # Scores are sets: track in-set points and the set/point ratios
+    sets: bool = False
+
+    def sort_key(self) -> Callable[[Dict], tuple]:
+        return itemgetter(*self.tiebreakers)
+
+
+DEFAULT_RULE = PointRule()
+SET_TIEBREAKERS = ("points", "set_ratio", "point_ratio", "goals_for")
+
+RULES: Dict[SportType, PointRule] = {
+    SportType.FOOTBALL: DEFAULT_RULE,
+    # FIBA: a loss still scores a point; level scores are rejected on entry
+    SportType.BASKETBALL: PointRule(win=2, draw=1, loss=1),
+    # One point per match won, then share of sets and of games won
+    SportType.TENNIS: PointRule(win=1, draw=0, loss=0, tiebreakers=SET_TIEBREAKERS, sets=True),
+    # ITTF: 2 for a win, 1 for a played loss, then set ratio and point ratio
+    SportType.PING_PONG: PointRule(win=2, draw=1, loss=1, tiebreakers=SET_TIEBREAKERS, sets=True),
+}
+
+
+def rule_for(sport: SportType) -> PointRule:
+    return RULES.get(sport, DEFAULT_RULE)
+
+
+def register_rule(sport: SportType, rule: PointRule):
+    """Replace the point rule of a sport for every scope"""
+    RULES[sport] = rule
+
+
+class Table:
+    """Standings rows being accumulated, keyed by team id"""
+
+    __slots__ = ("rows", "with_sets")
+
+    def __init__(self, with_sets: bool = False):
+        self.rows: Dict[str, Dict] = {}
+        self.with_sets = with_sets
+
+    def add_team(self, key: str, name: str):
+        if key not in self.rows:
+            self.rows[key] = {
+                'team_id': key,
+                'team_name': name,
+                'played': 0,
+                'won': 0,
+                'drawn': 0,
+                'lost': 0,
+                'goals_for': 0,
+                'goals_against': 0,
+                'goal_difference': 0,
+                'points': 0,
+            }
+            if self.with_sets:
+                self.rows[key].update(points_won=0, points_lost=0, set_ratio=0.0, point_ratio=0.0)
+
+    def add_matches(self, matches: Iterable[Match], rule: PointRule):
+        """Fold the completed matches in"""
+        rows = self.rows
+        win, draw, loss = rule.win, rule.draw, rule.loss
+        with_sets = self.with_sets and rule.sets
+        for match in matches:
+            if not match.is_completed:
+                continue
+            score1, score2 = match.team1_score, match.team2_score
+            row1, row2 = rows.get(match.team1_id), rows.get(match.team2_id)
+            # A side whose team was removed (forfeit/walkover) is skipped but
+            # its opponent is credited
+            for row, scored, conceded in ((row1, score1, score2), (row2, score2, score1)):
+                if row is None:
+                    continue
+                row['played'] += 1
+                row['goals_for'] += scored
+                row['goals_against'] += conceded
+                if scored > conceded:
+                    row['won'] += 1
+                    row['points'] += win
+                elif scored < conceded:
+                    row['lost'] += 1
+                    row['points'] += loss
+                else:
+                    row['drawn'] += 1
+                    row['points'] += draw
+            if with_sets and match.sets:
+                team1_points, team2_points = sum(match.sets[0::2]), sum(match.sets[1::2])
+                for row, won, lost in ((row1, team1_points, team2_points), (row2, team2_points, team1_points)):
+                    if row is not None:
+                        row['points_won'] += won
+                        row['points_lost'] += lost
+
+    def ranked(self, rule: PointRule) -> List[Dict]:
+        rows = list(self.rows.values())
+        for row in rows:
+            row['goal_difference'] = row['goals_for'] - row['goals_against']
+            if self.with_sets:
+                sets_played = row['goals_for'] + row['goals_against']
+                points_played = row['points_won'] + row['points_lost']
+                row['set_ratio'] = row['goals_for'] / sets_played if sets_played else 0.0
+                row['point_ratio'] = row['points_won'] / points_played if points_played else 0.0
+        # Stable: teams level on every tie-breaker keep their entry order
+        return sorted(rows, key=rule.sort_key(), reverse=True)
+
+
+def group_standings(tournament: Tournament, group_id: str, rule: Optional[PointRule] = None) -> List[Dict]:
+    """Standings of one group over its completed matches"""
+    group = tournament.groups.get(group_id)
+    if group is None:
+        return []
+    rule = rule or rule_for(tournament.sport_type)
+    table = Table(rule.sets)
+    for team_id in group.team_ids:
+        table.add_team(team_id, tournament.teams[team_id].name)
+    table.add_matches(tournament.get_group_matches(group_id), rule)
+    return table.ranked(rule)
+
+
+def tournament_standings(tournament: Tournament, include_knockout: bool = False,
+                         rule: Optional[PointRule] = None) -> List[Dict]:
+    """Standings of every team over the group stage (and optionally the knockout rounds)"""
+    rule = rule or rule_for(tournament.sport_type)
+    table = Table(rule.sets)
+    for team_id, team in tournament.teams.items():
+        table.add_team(team_id, team.name)
+    table.add_matches(tournament.matches.values(), rule)
+    if include_knockout:
+        table.add_matches(tournament.knockout_matches.values(), rule)
+    return table.ranked(rule)
+
@@ -0,0 +1,125 @@
+"""Per-tournament summaries for the dashboard.
+
+A summary holds the counts the dashboard cards, filters and sort keys
+need, computed once per tournament version and shared by every session
+in the process. query() filters, sorts and paginates over summaries, so
+a page of cards never touches the matches of tournaments it does not show.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Optional, Tuple
+
+from models import Tournament
+
+SORT_KEYS = {
+    'name': lambda s: (s.name_key, s.id),
+    'teams': lambda s: (s.teams, s.name_key, s.id),
+    'completion': lambda s: (s.completion, s.name_key, s.id),
+}
+
+
+@dataclass(frozen=True)
+class TournamentSummary:
+    id: str
+    name: str
+    name_key: str
+    sport: str
+    version: int
+    teams: int
+    groups: int
+    group_matches: int
+    group_completed: int
+    knockout_matches: int
+    knockout_completed: int
+
+    @property
+    def total_matches(self) -> int:
+        return self.group_matches + self.knockout_matches
+
+    @property
+    def completed(self) -> int:
+        return self.group_completed + self.knockout_completed
+
+    @property
+    def completion(self) -> float:
+        return self.completed / self.total_matches if self.total_matches else 0.0
+
+
+def summarize(tournament: Tournament) -> TournamentSummary:
+    return TournamentSummary(
+        id=tournament.id,
+        name=tournament.name,
+        name_key=tournament.name.strip().casefold(),
+        sport=tournament.sport_type.value,
+        version=tournament.version,
+        teams=len(tournament.teams),
+        groups=len(tournament.groups),
+        group_matches=len(tournament.matches),
+        group_completed=sum(1 for m in tournament.matches.values() if m.is_completed),
+        knockout_matches=len(tournament.knockout_matches),
+        knockout_completed=sum(1 for m in tournament.knockout_matches.values() if m.is_completed),
+    )
+
+
+class SummaryIndex:
+    """Process-wide summaries, recomputed only for tournaments whose version moved"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, TournamentSummary] = {}
+
+    def summaries(self, tournaments: Dict[str, Tournament]) -> List[TournamentSummary]:
+        result = []
+        stale = []
+        with self._lock:
+            for tid, tournament in tournaments.items():
+                summary = self._summaries.get(tid)
+                if summary is None or summary.version != tournament.version:
+                    stale.append(tournament)
+                else:
+                    result.append(summary)
+        fresh = [summarize(t) for t in stale]
+        with self._lock:
+            for summary in fresh:
+                current = self._summaries.get(summary.id)
+                # A session holding a stale snapshot must not replace a newer summary
+                if current is None or current.version <= summary.version:
+                    self._summaries[summary.id] = summary
+            for tid in [tid for tid in self._summaries if tid not in tournaments]:
+                del self._summaries[tid]
+        return result + fresh
+
+
+_index = SummaryIndex()
+
+
+def get_summaries(tournaments: Dict[str, Tournament]) -> List[TournamentSummary]:
+    return _index.summaries(tournaments)
+
+
+def query(
+    summaries: List[TournamentSummary],
+    ids: Optional[Collection[str]] = None,
+    sport: Optional[str] = None,
+    only_pending: bool = False,
+    sort_by: str = 'name',
+    descending: bool = False,
+    page: int = 0,
+    page_size: int = 12,
+) -> Tuple[List[TournamentSummary], int, int]:
+    """Filter, sort and slice summaries; return (page items, matching count, page count).
+
+    ids restricts the result to those tournaments (e.g. search.py hits).
+    """
+    items = summaries
+    if ids is not None:
+        items = [s for s in items if s.id in ids]
+    if sport:
+        items = [s for s in items if s.sport == sport]
+    if only_pending:
+        items = [s for s in items if s.completion < 1]
+    items = sorted(items, key=SORT_KEYS[sort_by], reverse=descending)
+    page_count = max(1, -(-len(items) // page_size))
+    page = min(max(0, page), page_count - 1)
+    start = page * page_size
+    return items[start:start + page_size], len(items), page_count
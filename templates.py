@@ -0,0 +1,141 @@
+"""Precompiled HTML templates for standings and match tables.
+
+Table heads and tails are module constants; rows are f-string templates
+joined with ''.join over generators. Team names are escaped
+with html.escape once per tournament version (team_names) and reused by
+every table rendered from it.
+
+Slide tables are tagged for the kiosk's delta client (kiosk_export.py):
+match rows carry data-match, standings bodies data-standings (the group
+id) and their rows data-team, so a match_updated or standings_changed
+event can patch the score and points cells in place.
+"""
+from html import escape
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import Tournament
+
+MISSING = '—'
+
+_POINTS_HEAD = "<thead><tr><th>الفريق</th><th>النقاط</th></tr></thead>"
+_SLIDE_LIST_OPEN = "<div class='slide-card'><div class='slide-list'>"
+_SLIDE_LIST_CLOSE = "</div></div>"
+
+
+# (tournament id, version, team count) -> escaped names; small, versions move forward
+_NAMES_CACHE: Dict[Tuple[str, int, int], Dict[str, str]] = {}
+_NAMES_CACHE_SIZE = 256
+
+
+def team_names(tournament: Tournament) -> Dict[str, str]:
+    """Escaped display name per team id, computed once per tournament version"""
+    key = (tournament.id, tournament.version, len(tournament.teams))
+    names = _NAMES_CACHE.get(key)
+    if names is None:
+        names = {tid: escape(team.name) for tid, team in tournament.teams.items()}
+        if len(_NAMES_CACHE) >= _NAMES_CACHE_SIZE:
+            _NAMES_CACHE.clear()
+        _NAMES_CACHE[key] = names
+    return names
+
+
+def sets_text(match) -> str:
+    """Per-set points as '11-7 9-11 11-5', empty when none were recorded"""
+    if not match.sets:
+        return ''
+    return ' '.join(f"{team1}-{team2}" for team1, team2 in zip(match.sets[0::2], match.sets[1::2]))
+
+
+def score_text(match) -> str:
+    if not match.is_completed:
+        return MISSING
+    if match.sets:
+        return f"{match.team1_score} - {match.team2_score} ({sets_text(match)})"
+    return f"{match.team1_score} - {match.team2_score}"
+
+
+def _score_cell(match) -> str:
+    if not match.is_completed:
+        return MISSING
+    if match.sets:
+        return f"{match.team1_score} - {match.team2_score}<br><small>{sets_text(match)}</small>"
+    return f"{match.team1_score} - {match.team2_score}"
+
+
+def points_rows(standings: Iterable[Dict], names: Optional[Dict[str, str]] = None, tagged: bool = False) -> str:
+    if tagged:
+        return ''.join(
+            f"<tr data-team='{row['team_id']}'><td>{names[row['team_id']] if names else escape(row['team_name'])}</td>"
+            f"<td>{row['points']}</td></tr>"
+            for row in standings
+        )
+    if names is None:
+        return ''.join(f"<tr><td>{escape(row['team_name'])}</td><td>{row['points']}</td></tr>" for row in standings)
+    return ''.join(f"<tr><td>{names[row['team_id']]}</td><td>{row['points']}</td></tr>" for row in standings)
+
+
+def match_rows(names: Dict[str, str], matches: Iterable, tagged: bool = False) -> str:
+    if tagged:
+        return ''.join(
+            f"<tr data-match='{m.id}'><td>{names.get(m.team1_id, MISSING)}</td>"
+            f"<td>{_score_cell(m)}</td>"
+            f"<td>{names.get(m.team2_id, MISSING)}</td></tr>"
+            for m in matches
+        )
+    return ''.join(
+        f"<tr><td>{names.get(m.team1_id, MISSING)}</td>"
+        f"<td>{_score_cell(m)}</td>"
+        f"<td>{names.get(m.team2_id, MISSING)}</td></tr>"
+        for m in matches
+    )
+
+
+def points_table(
+    standings: List[Dict],
+    css_class: str = "pro-table",
+    empty_row: str = "",
+    names: Optional[Dict[str, str]] = None,
+    group_id: Optional[str] = None,
+) -> str:
+    """Team/points table; empty_row is used when there are no standings.
+
+    group_id tags the table for the kiosk's delta client.
+    """
+    if group_id is None:
+        rows = points_rows(standings, names) or empty_row
+        return f"<table class='{css_class}'>{_POINTS_HEAD}<tbody>{rows}</tbody></table>"
+    rows = points_rows(standings, names, tagged=True) or empty_row
+    return f"<table class='{css_class}'>{_POINTS_HEAD}<tbody data-standings='{group_id}'>{rows}</tbody></table>"
+
+
+def matches_table(
+    tournament: Tournament,
+    matches: Iterable,
+    team1_label: str = "الفريق 1",
+    team2_label: str = "الفريق 2",
+    css_class: str = "pro-table",
+    empty_row: str = "",
+    names: Optional[Dict[str, str]] = None,
+    tagged: bool = False,
+) -> str:
+    """Team/score/team table; empty_row is used when there are no matches.
+
+    Pass names (from team_names) when rendering several tables of one
+    tournament; tagged marks the rows for the kiosk's delta client.
+    """
+    rows = match_rows(names if names is not None else team_names(tournament), matches, tagged) or empty_row
+    return (
+        f"<table class='{css_class}'><thead><tr><th>{team1_label}</th><th>النتيجة</th>"
+        f"<th>{team2_label}</th></tr></thead><tbody>{rows}</tbody></table>"
+    )
+
+
+def slide_matches_list(tournament: Tournament, matches: Iterable, names: Optional[Dict[str, str]] = None) -> str:
+    if names is None:
+        names = team_names(tournament)
+    rows = ''.join(
+        f"<div class='slide-row' data-match='{m.id}'><div class='name'>{names.get(m.team1_id, MISSING)}</div>"
+        f"<div class='slide-score'>{score_text(m)}</div><div class='name'>{names.get(m.team2_id, MISSING)}</div></div>"
+        for m in matches
+    )
+    return f"{_SLIDE_LIST_OPEN}{rows}{_SLIDE_LIST_CLOSE}"
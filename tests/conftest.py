@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+# utils resolves its database path on import; keep it out of the project directory
+os.environ.setdefault("TOURNAMENT_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="tournament-tests-"), "tournaments.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from models import Tournament, SportType  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh, empty SQLite store for one test"""
+    monkeypatch.setattr(utils, "DB_PATH", str(tmp_path / "tournaments.db"))
+    # Per-thread reader connections would still point at the previous test's file
+    monkeypatch.setattr(utils, "_reader", threading.local())
+    return utils.DB_PATH
+
+
+@pytest.fixture
+def make_tournament(db):
+    """Save a group-stage tournament of 8 teams in 2 groups and return its id"""
+    def make(sport: SportType = SportType.FOOTBALL) -> str:
+        tournament = Tournament(id="", name="دوري الاختبار", sport_type=sport)
+        tournament.add_teams([f"فريق {i}" for i in range(1, 9)])
+        tournament.create_groups(4)
+        tournament.generate_group_matches()
+        stored = utils.load_tournaments()
+        stored[tournament.id] = tournament
+        assert utils.save_tournaments(stored)
+        return tournament.id
+    return make
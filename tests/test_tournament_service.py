@@ -0,0 +1,204 @@
+import pytest
+
+import utils
+from models import SportType, OrphanPolicy, MAX_SET_POINTS
+from tournament_service import TournamentService, ConflictError, ValidationError
+
+
+def score_of(match, team_id):
+    """(team's score, opponent's score) of a match"""
+    if match.team1_id == team_id:
+        return match.team1_score, match.team2_score
+    return match.team2_score, match.team1_score
+
+
+# ---------- Concurrent sessions ----------
+
+def test_stale_commit_raises_conflict_and_reloads(make_tournament):
+    tid = make_tournament()
+    first, second = TournamentService(), TournamentService()
+    m1, m2 = list(first.tournaments[tid].matches)[:2]
+
+    second.update_match_result(tid, m1, 2, 0)
+    with pytest.raises(ConflictError):
+        first.update_match_result(tid, m2, 1, 1)
+
+    # The refused copy was replaced by the store: it sees the other result, not its own
+    assert first.tournaments[tid].matches[m1].team1_score == 2
+    assert not first.tournaments[tid].matches[m2].is_completed
+    stored = utils.load_tournaments()[tid]
+    assert stored.matches[m1].is_completed
+    assert not stored.matches[m2].is_completed
+
+    # Redone on the reloaded copy, the change goes through without undoing the other
+    first.update_match_result(tid, m2, 1, 1)
+    stored = utils.load_tournaments()[tid]
+    assert stored.matches[m1].team1_score == 2
+    assert stored.matches[m2].is_completed
+
+
+# ---------- Batch results ----------
+
+def test_batch_applies_every_row_with_one_commit(make_tournament):
+    tid = make_tournament()
+    service = TournamentService()
+    m1, m2 = list(service.tournaments[tid].matches)[:2]
+    version = service.tournaments[tid].version
+
+    assert service.update_match_results([(tid, m1, 3, 1), (tid, m2, 0, 0)]) == (2, [])
+
+    stored = utils.load_tournaments()[tid]
+    assert (stored.matches[m1].team1_score, stored.matches[m1].team2_score) == (3, 1)
+    assert stored.matches[m2].is_completed
+    assert stored.version == version + 1
+
+
+def test_batch_with_an_invalid_row_changes_nothing(make_tournament):
+    tid = make_tournament(SportType.TENNIS)
+    service = TournamentService()
+    m1, m2 = list(service.tournaments[tid].matches)[:2]
+    mtime = utils.get_store_mtime()
+
+    applied, errors = service.update_match_results([(tid, m1, 2, 0), (tid, m2, 1, 1), (tid, "missing", 2, 0)])
+
+    assert applied == 0
+    assert [match_id for match_id, _ in errors] == [m2, "missing"]
+    assert not service.tournaments[tid].matches[m1].is_completed
+    assert utils.get_store_mtime() == mtime
+    assert not utils.load_tournaments()[tid].matches[m1].is_completed
+
+
+def test_batch_of_only_failures_reports_every_row(make_tournament):
+    tid = make_tournament()
+    service = TournamentService()
+    match_id = next(iter(service.tournaments[tid].matches))
+
+    applied, errors = service.update_match_results([("missing", match_id, 1, 0), (tid, match_id, -1, 0)])
+
+    assert applied == 0
+    assert len(errors) == 2
+    assert not utils.load_tournaments()[tid].matches[match_id].is_completed
+
+
+def test_basketball_result_cannot_be_a_draw(make_tournament):
+    tid = make_tournament(SportType.BASKETBALL)
+    service = TournamentService()
+    match_id = next(iter(service.tournaments[tid].matches))
+
+    with pytest.raises(ValidationError):
+        service.update_match_result(tid, match_id, 70, 70)
+    assert not service.tournaments[tid].matches[match_id].is_completed
+
+
+# ---------- Set results ----------
+
+@pytest.mark.parametrize("sets", [
+    [(MAX_SET_POINTS + 1, 3)],        # set points over the limit
+    [(6, 6)],                          # drawn set
+    [(6, 4), (4, 6)],                  # level on sets
+    [(6, 4), (6, 4), (6, 4), (6, 4)],  # more sets than best of three
+    [],
+])
+def test_invalid_sets_are_rejected_without_touching_the_match(make_tournament, sets):
+    tid = make_tournament(SportType.TENNIS)
+    service = TournamentService()
+    match_id = next(iter(service.tournaments[tid].matches))
+
+    with pytest.raises(ValidationError):
+        service.update_match_sets(tid, match_id, sets)
+
+    match = service.tournaments[tid].matches[match_id]
+    assert not match.is_completed
+    assert not match.sets
+
+
+def test_sets_record_sets_won_as_the_score(make_tournament):
+    tid = make_tournament(SportType.TENNIS)
+    service = TournamentService()
+    match_id = next(iter(service.tournaments[tid].matches))
+
+    service.update_match_sets(tid, match_id, [(6, 4), (3, 6), (7, 5)])
+
+    match = utils.load_tournaments()[tid].matches[match_id]
+    assert (match.team1_score, match.team2_score) == (2, 1)
+    assert list(match.sets) == [6, 4, 3, 6, 7, 5]
+
+
+def test_sets_are_only_for_set_sports(make_tournament):
+    tid = make_tournament()
+    service = TournamentService()
+    match_id = next(iter(service.tournaments[tid].matches))
+
+    with pytest.raises(ValidationError):
+        service.update_match_sets(tid, match_id, [(6, 4)])
+
+
+# ---------- Removing a team ----------
+
+def _team_with_a_played_match(service, tid):
+    """A team with one match played (won 2-1) and the rest pending; returns (team_id, played_id, pending_ids)"""
+    tournament = service.tournaments[tid]
+    team_id = next(iter(tournament.teams))
+    played, *pending = tournament.get_team_matches(team_id)
+    score = (2, 1) if played.team1_id == team_id else (1, 2)
+    service.update_match_result(tid, played.id, *score)
+    return team_id, played.id, [match.id for match in pending]
+
+
+def test_remove_team_delete_drops_all_its_matches(make_tournament):
+    tid = make_tournament()
+    service = TournamentService()
+    team_id, played_id, pending_ids = _team_with_a_played_match(service, tid)
+
+    service.remove_team(tid, team_id, OrphanPolicy.DELETE)
+
+    stored = utils.load_tournaments()[tid]
+    assert team_id not in stored.teams
+    assert not {played_id, *pending_ids} & stored.matches.keys()
+
+
+@pytest.mark.parametrize("policy, expected", [
+    (OrphanPolicy.FORFEIT, (0, 3)),
+    (OrphanPolicy.WALKOVER, (0, 1)),
+])
+def test_remove_team_settles_only_pending_matches(make_tournament, policy, expected):
+    tid = make_tournament()
+    service = TournamentService()
+    team_id, played_id, pending_ids = _team_with_a_played_match(service, tid)
+
+    service.remove_team(tid, team_id, policy)
+
+    stored = utils.load_tournaments()[tid]
+    assert score_of(stored.matches[played_id], team_id) == (2, 1)
+    for match_id in pending_ids:
+        assert stored.matches[match_id].is_completed
+        assert score_of(stored.matches[match_id], team_id) == expected
+
+
+def test_remove_team_forfeit_uses_the_sport_score(make_tournament):
+    tid = make_tournament(SportType.BASKETBALL)
+    service = TournamentService()
+    team_id, _, pending_ids = _team_with_a_played_match(service, tid)
+
+    service.remove_team(tid, team_id, OrphanPolicy.FORFEIT)
+
+    stored = utils.load_tournaments()[tid]
+    assert all(score_of(stored.matches[match_id], team_id) == (0, 20) for match_id in pending_ids)
+
+
+def test_remove_team_forfeit_in_a_set_sport_records_straight_sets(make_tournament):
+    tid = make_tournament(SportType.TENNIS)
+    service = TournamentService()
+    team_id = next(iter(service.tournaments[tid].teams))
+    match_ids = [match.id for match in service.tournaments[tid].get_team_matches(team_id)]
+
+    service.remove_team(tid, team_id, OrphanPolicy.FORFEIT)
+
+    stored = utils.load_tournaments()[tid]
+    for match_id in match_ids:
+        match = stored.matches[match_id]
+        assert score_of(match, team_id) == (0, 2)
+        team_points = match.sets[0::2] if match.team1_id == team_id else match.sets[1::2]
+        opponent_points = match.sets[1::2] if match.team1_id == team_id else match.sets[0::2]
+        assert list(team_points) == [0, 0]
+        assert list(opponent_points) == [6, 6]
@@ -0,0 +1,320 @@
+"""Shared look of the app: global styles, sport themes and slide CSS.
+
+Builders return plain CSS strings so the Streamlit pages and the static
+kiosk export (kiosk_export.py) render with the same theme.
+"""
+import urllib.parse
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from utils import get_sport_icon
+
+GLOBAL_CSS = """
+:root {
+    --brand-primary: #1f4e79;
+    --brand-primary-700: #153956;
+    --surface: #ffffff;
+    --surface-muted: #f8fafc;
+    --border: #e5e7eb;
+    --text: #111111;
+    --text-strong: #0f172a;
+}
+@import url('https://fonts.googleapis.com/css2?family=Cairo:wght@400;700;800&display=swap');
+html, body, [class*="css"] {
+    direction: rtl;
+    font-family: 'Cairo', -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Arial, "Apple Color Emoji", "Noto Color Emoji", sans-serif;
+}
+/* Core brand overrides */
+.stMarkdown h1, .stMarkdown h2, .stMarkdown h3 { color: var(--text-strong); }
+div.stButton>button[kind="primary"], div.stButton>button[data-baseweb="button"] {
+    background: var(--brand-primary) !important;
+    border-color: var(--brand-primary) !important;
+    color: #ffffff !important;
+}
+div.stButton>button[kind="secondary"] {
+    border-color: var(--brand-primary) !important;
+    color: var(--brand-primary) !important;
+}
+div.stButton>button { border-radius: 10px !important; }
+/* Buttons */
+button[kind="primary"], button[data-baseweb="button"] { border-radius: 10px !important; }
+/* Cards */
+.ux-card { 
+    border-radius: 12px; 
+    padding: 1rem; 
+    background: var(--surface); 
+    border: 1px solid var(--border); 
+    box-shadow: 0 1px 2px rgba(0,0,0,0.04);
+    color: var(--text);
+}
+.ux-card-accent {
+    background: linear-gradient(180deg, var(--surface-muted), var(--surface));
+}
+.ux-card, .ux-card * { color: var(--text) !important; }
+.ux-card:hover { box-shadow: 0 4px 10px rgba(0,0,0,0.08); border-color: var(--border); }
+.ux-muted { color: #6c757d; }
+.ux-section-title { color: var(--brand-primary); margin: 0.5rem 0 1rem 0; }
+.chip { display:inline-block; padding: 2px 8px; border-radius:999px; background:#eef2f7; color:var(--text); font-size:12px; border:1px solid var(--border); }
+.chip-accent { background: rgba(31,78,121,0.08); color: var(--brand-primary); border-color: rgba(31,78,121,0.25); }
+.chip-green { background:#e9fbe7; border-color:#b7f0b0; color:#0a5c2b; }
+.chip-amber { background:#fff8e1; border-color:#ffe08a; color:#7a5200; }
+/* Professional tables */
+.pro-table { width:100%; border-collapse:separate; border-spacing:0; background:var(--surface); border:1px solid var(--border); border-radius:12px; overflow:hidden; }
+.pro-table th, .pro-table td { padding:10px 12px; border-bottom:1px solid var(--border); text-align:center; color:var(--text); }
+.pro-table th { background:var(--surface-muted); font-weight:800; color:var(--text-strong); }
+.pro-table tbody tr:nth-child(even) { background:#f9fafb; }
+.pro-table tr:hover { background:#f5f7fa; }
+.section-title { text-align:center; color:var(--brand-primary); margin: 1rem 0 0.5rem; font-weight:800; }
+.subsection-title { text-align:center; color:#111111; margin: 0.5rem 0; font-weight:700; }
+
+/* Inputs & widgets */
+.stTextInput input, .stNumberInput input, .stSelectbox select, .stMultiSelect [role="combobox"], textarea {
+    border-radius: 10px !important;
+}
+[data-testid="stMetricValue"] { color: var(--brand-primary) !important; }
+[data-testid="stSidebar"] { background: var(--surface-muted) !important; }
+/* Remove top whitespace globally */
+html, body { margin-top: 0 !important; padding-top: 0 !important; }
+[data-testid="stHeader"], header { display: none !important; height: 0 !important; }
+[data-testid="stToolbar"] { display: none !important; }
+[data-testid="stAppViewContainer"] { padding-top: 0 !important; }
+.block-container { padding-top: 0 !important; margin-top: 0 !important; }
+.block-container > :first-child { margin-top: 0 !important; }
+/* Completely remove Streamlit's sidebar UI */
+[data-testid="stSidebar"], [data-testid="stSidebarCollapsedControl"] { display: none !important; }
+[data-testid="stAppViewContainer"] { margin-right: 0 !important; margin-left: 0 !important; }
+
+/* Mobile responsiveness */
+@media (max-width: 768px) {
+    .block-container { padding: 0.5rem !important; }
+    .stButton > button { font-size: 14px !important; padding: 0.5rem !important; }
+    .stSelectbox, .stTextInput, .stNumberInput { font-size: 16px !important; }
+    .stColumns > div { padding: 0.25rem !important; }
+    .pro-table th, .pro-table td { padding: 6px 4px !important; font-size: 12px !important; }
+    .section-title { font-size: 1.1rem !important; margin: 0.5rem 0 !important; }
+    .subsection-title { font-size: 1rem !important; margin: 0.25rem 0 !important; }
+    .ux-card { padding: 0.75rem !important; margin-bottom: 0.5rem !important; }
+    .chip { font-size: 11px !important; padding: 2px 6px !important; }
+    .top-nav { padding: 4px 6px !important; }
+    .top-nav-row { flex-direction: column !important; gap: 4px !important; }
+    .top-stats { margin-right: 0 !important; justify-content: center !important; }
+}
+
+@media (max-width: 480px) {
+    .block-container { padding: 0.25rem !important; }
+    .stButton > button { font-size: 12px !important; padding: 0.4rem !important; }
+    .pro-table th, .pro-table td { padding: 4px 2px !important; font-size: 11px !important; }
+    .section-title { font-size: 1rem !important; }
+    .subsection-title { font-size: 0.9rem !important; }
+    .ux-card { padding: 0.5rem !important; }
+    .chip { font-size: 10px !important; padding: 1px 4px !important; }
+}
+"""
+
+# Slide styles (cards and list rows instead of tables)
+SLIDE_CSS = """
+.slide-card { background: rgba(255,255,255,0.95); border: 1px solid var(--border); border-radius: 12px; padding: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.06); }
+.slide-list { display: flex; flex-direction: column; gap: 6px; }
+.slide-row { display: flex; align-items: center; justify-content: space-between; padding: 8px 10px; border-radius: 10px; background: #ffffff; border: 1px solid var(--border); }
+.slide-row .name { font-weight: 700; color: var(--text-strong); }
+.slide-chip { display:inline-block; min-width: 44px; text-align:center; padding: 2px 10px; border-radius: 999px; background: rgba(31,78,121,0.08); color: var(--brand-primary); border: 1px solid rgba(31,78,121,0.25); font-weight: 800; }
+.slide-score { display:inline-block; min-width: 72px; text-align:center; padding: 2px 12px; border-radius: 999px; background: rgba(31,78,121,0.10); color: var(--brand-primary); border: 1px solid rgba(31,78,121,0.25); font-weight: 800; }
+.slide-rows-3 { display:grid; grid-template-columns: 1fr auto 1fr; gap: 10px; align-items:center; }
+.slide-xs { font-size: 12px; color: #6c757d; }
+"""
+
+# Grid and compact table styles for groups slides
+GROUPS_GRID_CSS = """
+.groups-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 12px; }
+.group-card { background: rgba(255,255,255,0.96); border: 1px solid var(--border); border-radius: 12px; padding: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.06); }
+.group-title { font-weight: 800; margin-bottom: 6px; color: var(--text-strong); text-align: center; }
+.group-card .pro-table.compact th, .group-card .pro-table.compact td { padding: 6px 8px; font-size: 12px; }
+"""
+
+# Hide sidebar and Streamlit chrome for true fullscreen displays
+FULLSCREEN_CHROME_CSS = """
+[data-testid="stSidebar"], [data-testid="stToolbar"], [data-testid="stStatusWidget"] { display: none !important; }
+#MainMenu { visibility: hidden; }
+header { visibility: hidden; }
+footer { visibility: hidden; }
+[data-testid="stDecoration"] { display: none !important; }
+.block-container { padding-top: 0; padding-bottom: 0.5rem; }
+"""
+
+
+def style_tag(css: str) -> str:
+    return f"<style>\n{css}</style>"
+
+
+def sport_background_css(sport_name: str) -> str:
+    palettes = {
+        "كرة قدم": "linear-gradient(135deg, #0f9d58 0%, #0b7a43 100%)",
+        "كرة سلة": "linear-gradient(135deg, #f97316 0%, #ea580c 100%)",
+        "تنس": "linear-gradient(135deg, #84cc16 0%, #65a30d 100%)",
+        "بينغ بونغ": "linear-gradient(135deg, #38bdf8 0%, #0ea5e9 100%)",
+    }
+    return palettes.get(sport_name, "linear-gradient(135deg, #1f4e79 0%, #153956 100%)")
+
+
+def sport_accent_color(sport_name: str) -> str:
+    """Primary accent color per sport for consistent theming."""
+    accents = {
+        "كرة قدم": "#0f9d58",
+        "كرة سلة": "#f97316",
+        "تنس": "#84cc16",
+        "بينغ بونغ": "#0ea5e9",
+    }
+    return accents.get(sport_name, "#1f4e79")
+
+
+def sport_tile_svg(emoji: str) -> str:
+    # SVG tile with faint emoji watermark
+    return f"""
+    <svg xmlns='http://www.w3.org/2000/svg' width='120' height='120'>
+      <rect width='120' height='120' fill='none'/>
+      <text x='60' y='70' font-size='64' text-anchor='middle' opacity='0.09'>{emoji}</text>
+    </svg>
+    """.strip()
+
+
+def sport_scene_svg(sport_name: str) -> str:
+    # Subtle field/court motifs per sport
+    if sport_name == "كرة قدم":
+        svg = """
+        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
+          <rect width='240' height='240' fill='none'/>
+          <rect x='10' y='10' width='220' height='220' fill='none' stroke='white' stroke-opacity='0.12' stroke-width='2'/>
+          <circle cx='120' cy='120' r='30' fill='none' stroke='white' stroke-opacity='0.12' stroke-width='2'/>
+          <line x1='120' y1='10' x2='120' y2='230' stroke='white' stroke-opacity='0.12' stroke-width='2'/>
+        </svg>
+        """
+    elif sport_name == "كرة سلة":
+        svg = """
+        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
+          <rect width='240' height='240' fill='none'/>
+          <path d='M0,80 L240,80 M0,160 L240,160' stroke='white' stroke-opacity='0.10' stroke-width='3'/>
+          <circle cx='120' cy='120' r='60' fill='none' stroke='white' stroke-opacity='0.08' stroke-width='3'/>
+        </svg>
+        """
+    elif sport_name == "تنس":
+        svg = """
+        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
+          <rect width='240' height='240' fill='none'/>
+          <rect x='20' y='20' width='200' height='200' fill='none' stroke='white' stroke-opacity='0.14' stroke-width='2'/>
+          <line x1='120' y1='20' x2='120' y2='220' stroke='white' stroke-opacity='0.14' stroke-width='2'/>
+          <line x1='20' y1='120' x2='220' y2='120' stroke='white' stroke-opacity='0.14' stroke-width='2'/>
+        </svg>
+        """
+    else:  # بينغ بونغ
+        svg = """
+        <svg xmlns='http://www.w3.org/2000/svg' width='240' height='240'>
+          <rect width='240' height='240' fill='none'/>
+          <path d='M0,0 L240,240 M240,0 L0,240' stroke='white' stroke-opacity='0.06' stroke-width='2'/>
+          <circle cx='60' cy='60' r='12' fill='white' fill-opacity='0.06'/>
+          <circle cx='180' cy='180' r='12' fill='white' fill-opacity='0.06'/>
+        </svg>
+        """
+    return svg.strip()
+
+
+def _svg_data_uri(svg: str) -> str:
+    return f"url('data:image/svg+xml;utf8,{urllib.parse.quote(svg)}')"
+
+
+@lru_cache(maxsize=None)
+def sport_tile_data_uri(emoji: str) -> str:
+    return _svg_data_uri(sport_tile_svg(emoji))
+
+
+@lru_cache(maxsize=None)
+def sport_scene_tile_data_uri(sport_name: str) -> str:
+    return _svg_data_uri(sport_scene_svg(sport_name))
+
+
+def sport_tile_layers(sport_name: str, asset_url: Optional[Callable[[str], Optional[str]]] = None) -> Tuple[str, str]:
+    """(scene, emoji tile) CSS image values; asset_url maps an asset name to a static URL"""
+    scene_url = asset_url(f"scene-{sport_name}") if asset_url else None
+    tile_url = asset_url(f"tile-{sport_name}") if asset_url else None
+    scene = f"url('{scene_url}')" if scene_url else sport_scene_tile_data_uri(sport_name)
+    tile = f"url('{tile_url}')" if tile_url else sport_tile_data_uri(get_sport_icon(sport_name))
+    return scene, tile
+
+
+def sport_background_layers(sport_name: str, asset_url: Optional[Callable[[str], Optional[str]]] = None) -> str:
+    """CSS background-image layers: gradient, court scene and emoji watermark"""
+    scene, tile = sport_tile_layers(sport_name, asset_url)
+    return f"{sport_background_css(sport_name)}, {scene}, {tile}"
+
+
+@lru_cache(maxsize=64)
+def _sport_background_style(sport_name: str, fullscreen: bool, asset_url) -> str:
+    layers = sport_background_layers(sport_name, asset_url)
+    accent = sport_accent_color(sport_name)
+    body = (
+        f"body {{ background-image: {layers}; background-repeat: no-repeat, repeat, repeat; "
+        "background-size: cover, 240px 240px, 120px 120px; background-attachment: fixed, fixed, fixed; "
+        "background-position: center top, left top, left top; }\n"
+    )
+    if fullscreen:
+        return (
+            f":root {{ --brand-primary: {accent}; }}\n"
+            "html, body { height:100%; overflow:hidden; }\n"
+            + body +
+            ".block-container { background: rgba(255,255,255,0.85); border-radius: 12px; box-shadow: 0 8px 24px rgba(0,0,0,0.10); backdrop-filter: blur(1.5px); }\n"
+        )
+    # Embedded mode: keep normal page chrome and scrolling; lighter overlay
+    return (
+        f":root {{ --brand-primary: {accent}; }}\n"
+        + body +
+        ".block-container { background: rgba(255,255,255,0.92); border-radius: 12px; box-shadow: 0 4px 16px rgba(0,0,0,0.08); }\n"
+    )
+
+
+def sport_background_style(
+    sport_name: str, fullscreen: bool = False, asset_url: Optional[Callable[[str], Optional[str]]] = None
+) -> str:
+    """Page background CSS for a sport, memoized per (sport, mode, asset source)"""
+    return _sport_background_style(sport_name, fullscreen, asset_url)
+
+
+def compact_no_scroll_css(scale_percent: int = 90) -> str:
+    """Compact styling to fit all content in one screen without scrolling"""
+    scale = max(50, min(100, int(scale_percent)))
+    return f"""
+[data-testid="stSidebar"], [data-testid="stToolbar"], [data-testid="stStatusWidget"], header, footer, [data-testid="stDecoration"] {{ display: none !important; }}
+html, body {{ overflow: hidden !important; }}
+.block-container {{ padding-top: 0.25rem; padding-bottom: 0.25rem; height: 100vh; overflow: hidden; transform: scale({scale/100}); transform-origin: top center; }}
+.pro-table th, .pro-table td {{ padding: 6px 8px; font-size: 12px; }}
+.section-title {{ margin: 0.25rem 0; font-size: 1rem; }}
+.subsection-title {{ margin: 0.25rem 0; font-size: 0.95rem; }}
+"""
+
+
+def slide_canvas_css(scale: float, cell_padding: int, font_size: int, card_padding: int) -> str:
+    """Fade-in canvas and density overrides for one slide"""
+    return f"""
+@keyframes slideFadeIn {{
+    from {{ opacity: 0; transform: translateY(6px); }}
+    to {{ opacity: 1; transform: translateY(0); }}
+}}
+@keyframes slideProgress {{
+    from {{ width: 0%; }}
+    to {{ width: 100%; }}
+}}
+.autoslide-overlay {{
+    position: fixed; inset: 0; z-index: 9999;
+    display: flex; flex-direction: column; align-items: center; justify-content: flex-start;
+    overflow: hidden; padding: 0 8px 0 8px;
+}}
+.autoslide-canvas {{
+    width: 100%; max-width: 1200px;
+    transform: scale({scale}); transform-origin: top center;
+    animation: slideFadeIn 300ms ease both;
+}}
+
+/* Compact overrides for group cards/tables to reduce height */
+.group-card {{ padding: {card_padding}px; }}
+.group-card .pro-table.compact th, .group-card .pro-table.compact td {{ padding: {cell_padding}px 6px; font-size: {font_size}px; }}
+.section-title {{ margin: 0.2rem 0; }}
+.subsection-title {{ margin: 0.2rem 0; }}
+"""
@@ -1,188 +1,251 @@
 import streamlit as st
 import os
 from typing import Dict, Optional
-from models import Tournament, Team, Match, SportType, MatchStatus
-from utils import save_tournaments, load_tournaments, get_sport_icon, get_round_name, validate_score, get_team_name_label, get_store_mtime
+from models import Tournament, Match, SportType, OrphanPolicy, SET_SPORTS, NO_DRAW_SPORTS, MAX_SETS, MAX_SET_POINTS
+from utils import get_sport_icon, get_round_name, get_team_name_label, parse_team_names, parse_team_csv
+from tournament_service import TournamentService, TournamentError, NotFoundError, ValidationError
+from live_scoring import get_live_scoring
+from change_feed import get_change_feed
+from profiling import profiled
+from search import get_search_index
+from templates import score_text
+
+# Compact match rows shown per page in match management
+MATCHES_PER_PAGE = 10
+
+
+def _set_state(key: str, value):
+    st.session_state[key] = value
+
+
+def _set_open_match(match_id: Optional[str]):
+    """Expand one match into its full edit form (None collapses it)"""
+    st.session_state.mm_open_match = match_id
+
+
+def _live_action(match_id: str, operation, *args, refresh: bool = False):
+    """Button callback for live scoring; errors are shown by the panel on its next run"""
+    try:
+        operation(*args)
+        if refresh:
+            st.session_state.live_refresh = True
+    except TournamentError as e:
+        st.session_state[f"live_error_{match_id}"] = str(e)
+    except Exception as e:
+        st.session_state[f"live_error_{match_id}"] = f"خطأ في التسجيل المباشر: {e}"
+
+
+def _render_live_panel(manager: "TournamentManager", tournament_id: str, match_id: str):
+    """Live scoring controls; run as a fragment so a tap reruns only this panel"""
+    live = get_live_scoring()
+    tournament = manager.service.tournaments.get(tournament_id)
+    match = tournament and (tournament.matches.get(match_id) or tournament.knockout_matches.get(match_id))
+    if st.session_state.pop("live_refresh", False) or match is None:
+        # The match was finished (or is gone): refresh the whole page
+        st.rerun(scope="app")
+    error = st.session_state.pop(f"live_error_{match_id}", None)
+    if error:
+        st.error(error)
+    score = live.get(match_id)
+    if score is None:
+        st.button("🔴 بدء التسجيل المباشر", key=f"live_start_{match_id}", type="primary", use_container_width=True,
+                  on_click=_live_action, args=(match_id, live.start, manager.service, tournament_id, match_id))
+        st.caption("كل نقطة تُحفظ فورًا وتظهر على الشاشات، وتُسجَّل النتيجة في المباراة عند الإنهاء.")
+        return
+
+    team1 = tournament.teams.get(match.team1_id)
+    team2 = tournament.teams.get(match.team2_id)
+    sides = ((1, team1.name if team1 else 'فريق غير معروف', score.team1),
+             (2, team2.name if team2 else 'فريق غير معروف', score.team2))
+    for column, (side, name, points) in zip(st.columns(2), sides):
+        with column:
+            st.metric(name, points)
+            st.button(f"+1 {name}", key=f"live_plus_{side}_{match_id}", type="primary", use_container_width=True,
+                      on_click=_live_action, args=(match_id, live.point, match_id, side))
+            st.button("تراجع −1", key=f"live_minus_{side}_{match_id}", use_container_width=True,
+                      on_click=_live_action, args=(match_id, live.point, match_id, side, -1))
+    if score.sets:
+        st.caption("الأشواط: " + "  ".join(f"{a}-{b}" for a, b in score.sets))
+
+    set_col, finish_col, cancel_col = st.columns(3)
+    if tournament.sport_type in SET_SPORTS:
+        with set_col:
+            st.button("إنهاء الشوط", key=f"live_set_{match_id}", use_container_width=True,
+                      on_click=_live_action, args=(match_id, live.end_set, match_id))
+    with finish_col:
+        st.button("✅ إنهاء وحفظ النتيجة", key=f"live_finish_{match_id}", type="primary", use_container_width=True,
+                  on_click=_live_action, args=(match_id, live.finish, manager.service, match_id),
+                  kwargs={"refresh": True})
+    with cancel_col:
+        st.button("إلغاء المباشر", key=f"live_cancel_{match_id}", use_container_width=True,
+                  on_click=_live_action, args=(match_id, live.cancel, match_id))
+
 
 class TournamentManager:
+    """Streamlit front-end over a per-session TournamentService"""
+
     def __init__(self):
-        if 'tournaments' not in st.session_state:
-            st.session_state.tournaments = load_tournaments()
-        # Track data file modification time to auto-refresh
-        if '_data_mtime' not in st.session_state:
-            try:
-                st.session_state._data_mtime = float(get_store_mtime())
-            except Exception:
-                st.session_state._data_mtime = 0.0
+        if 'tournament_service' not in st.session_state:
+            # Sessions watch the process-wide change feed instead of polling the DB
+            feed = get_change_feed()
+            st.session_state.tournament_service = TournamentService(watch_mtime=lambda: feed.store_mtime)
+        self.service: TournamentService = st.session_state.tournament_service
 
     def _refresh_if_changed(self):
-        """Reload tournaments from disk if the data file has changed externally."""
-        try:
-            current_mtime = float(get_store_mtime())
-        except Exception:
-            current_mtime = 0.0
-        if current_mtime and current_mtime > st.session_state.get('_data_mtime', 0.0):
-            st.session_state.tournaments = load_tournaments()
-            st.session_state._data_mtime = current_mtime
-    
-    def save_data(self):
-        """Save current tournament data"""
-        ok = save_tournaments(st.session_state.tournaments)
-        # Update mtime after save
-        try:
-            st.session_state._data_mtime = float(get_store_mtime())
-        except Exception:
-            pass
-        return ok
+        """Reload tournaments from the store if it has changed externally."""
+        self.service.refresh_if_changed()
+
+    def has_external_changes(self) -> bool:
+        """True if another session committed since this one last loaded (no DB read)"""
+        return self.service.has_external_changes()
     
-    def create_tournament(self, name: str, sport_type: SportType) -> bool:
-        """Create a new tournament"""
+    def _run(self, error_prefix: str, operation, *args):
+        """Run a service operation, mapping failures to a boolean result.
+
+        Missing records and rejected changes show the service's message;
+        anything else is reported under error_prefix.
+        """
         try:
-            tournament = Tournament(
-                id="",  # Will be auto-generated
-                name=name,
-                sport_type=sport_type
-            )
-            st.session_state.tournaments[tournament.id] = tournament
-            self.save_data()
+            operation(*args)
             return True
+        except (NotFoundError, ValidationError) as e:
+            st.error(str(e))
+            return False
         except Exception as e:
-            st.error(f"خطأ في إنشاء البطولة: {e}")
+            st.error(f"{error_prefix}: {e}")
             return False
     
+    def create_tournament(self, name: str, sport_type: SportType) -> bool:
+        """Create a new tournament"""
+        return self._run("خطأ في إنشاء البطولة", self.service.create_tournament, name, sport_type)
+    
     def delete_tournament(self, tournament_id: str) -> bool:
         """Delete a tournament"""
-        try:
-            if tournament_id in st.session_state.tournaments:
-                del st.session_state.tournaments[tournament_id]
-                self.save_data()
-                return True
-            return False
-        except Exception as e:
-            st.error(f"خطأ في حذف البطولة: {e}")
-            return False
+        return self._run("خطأ في حذف البطولة", self.service.delete_tournament, tournament_id)
     
     def add_team_to_tournament(self, tournament_id: str, team_name: str) -> bool:
         """Add team to tournament"""
-        try:
-            if tournament_id not in st.session_state.tournaments:
-                return False
-            
-            tournament = st.session_state.tournaments[tournament_id]
-            team = Team(
-                id="",  # Will be auto-generated
-                name=team_name,
-                sport_type=tournament.sport_type
-            )
-            tournament.add_team(team)
-            self.save_data()
-            return True
-        except Exception as e:
-            st.error(f"خطأ في إضافة الفريق: {e}")
-            return False
+        return self._run("خطأ في إضافة الفريق", self.service.add_team, tournament_id, team_name)
     
-    def remove_team_from_tournament(self, tournament_id: str, team_id: str) -> bool:
-        """Remove team from tournament"""
+    def add_teams_to_tournament(self, tournament_id: str, team_names: list[str]) -> tuple[int, list[tuple[int, str, str]]]:
+        """Add many teams to a tournament with a single write.
+
+        Returns (added_count, errors) where each error is (index, name, reason).
+        """
         try:
-            if tournament_id not in st.session_state.tournaments:
-                return False
-            
-            tournament = st.session_state.tournaments[tournament_id]
-            tournament.remove_team(team_id)
-            self.save_data()
-            return True
+            added, errors = self.service.add_teams(tournament_id, team_names)
+            return len(added), errors
+        except NotFoundError as e:
+            return 0, [(i, name, str(e)) for i, name in enumerate(team_names)]
         except Exception as e:
-            st.error(f"خطأ في حذف الفريق: {e}")
-            return False
+            st.error(f"خطأ في إضافة الفرق: {e}")
+            return 0, []
+    
+    def render_bulk_team_registration(self, tournament_id: str, key_prefix: str):
+        """Render bulk registration from pasted lines or an uploaded CSV"""
+        st.caption("أدخل كل اسم في سطر منفصل، أو ارفع ملف CSV يكون الاسم في عموده الأول")
+        bulk_text = st.text_area("الأسماء", height=150, key=f"{key_prefix}_text")
+        uploaded = st.file_uploader("ملف CSV", type=["csv", "txt"], key=f"{key_prefix}_csv")
+        if st.button("إضافة الكل", type="primary", key=f"{key_prefix}_btn", use_container_width=True):
+            rows = [(f"سطر {n}", name) for n, name in parse_team_names(bulk_text)]
+            if uploaded is not None:
+                rows += [(f"CSV صف {n}", name) for n, name in parse_team_csv(uploaded.getvalue())]
+            if not rows:
+                st.warning("لم يتم العثور على أسماء.")
+                return
+            added_count, errors = self.add_teams_to_tournament(tournament_id, [name for _, name in rows])
+            if added_count:
+                st.success(f"تمت إضافة {added_count} من {len(rows)}.")
+            if errors:
+                self.render_bulk_errors(rows, errors)
+            elif added_count:
+                st.rerun()
+    
+    @staticmethod
+    def render_bulk_errors(rows: list[tuple[str, str]], errors: list[tuple[int, str, str]]):
+        """Show the rows a bulk registration rejected"""
+        st.warning(f"تم رفض {len(errors)} من الأسماء:")
+        st.dataframe(
+            [{"الموضع": rows[i][0] if i < len(rows) else str(i + 1), "الاسم": name, "السبب": reason} for i, name, reason in errors],
+            hide_index=True,
+            use_container_width=True,
+        )
+    
+    def remove_team_from_tournament(self, tournament_id: str, team_id: str, policy: OrphanPolicy = OrphanPolicy.DELETE) -> bool:
+        """Remove team from tournament, settling its matches per policy in one write"""
+        return self._run("خطأ في حذف الفريق", self.service.remove_team, tournament_id, team_id, policy)
     
     def create_groups_for_tournament(self, tournament_id: str, teams_per_group: int = 4) -> bool:
         """Create groups for tournament"""
-        try:
-            if tournament_id not in st.session_state.tournaments:
-                return False
-            
-            tournament = st.session_state.tournaments[tournament_id]
-            success = tournament.create_groups(teams_per_group)
-            if success:
-                tournament.generate_group_matches()
-                self.save_data()
-            return success
-        except Exception as e:
-            st.error(f"خطأ في إنشاء المجموعات: {e}")
-            return False
+        return self._run("خطأ في إنشاء المجموعات", self.service.create_groups, tournament_id, teams_per_group)
     
     def create_custom_groups_for_tournament(self, tournament_id: str, group_sizes: list[int]) -> bool:
         """Create groups with custom sizes for tournament"""
-        try:
-            if tournament_id not in st.session_state.tournaments:
-                return False
-            
-            tournament = st.session_state.tournaments[tournament_id]
-            success = tournament.create_custom_groups(group_sizes)
-            if success:
-                tournament.generate_group_matches()
-                self.save_data()
-            return success
-        except Exception as e:
-            st.error(f"خطأ في إنشاء المجموعات المخصصة: {e}")
-            return False
+        return self._run("خطأ في إنشاء المجموعات المخصصة", self.service.create_custom_groups, tournament_id, group_sizes)
     
     def update_match_result(self, tournament_id: str, match_id: str, team1_score: int, team2_score: int) -> bool:
         """Update match result"""
-        try:
-            if tournament_id not in st.session_state.tournaments:
-                return False
-            
-            tournament = st.session_state.tournaments[tournament_id]
-            
-            # Check in group matches first
-            if match_id in tournament.matches:
-                match = tournament.matches[match_id]
-                match.team1_score = team1_score
-                match.team2_score = team2_score
-                match.status = MatchStatus.COMPLETED
-            # Check in knockout matches
-            elif match_id in tournament.knockout_matches:
-                match = tournament.knockout_matches[match_id]
-                match.team1_score = team1_score
-                match.team2_score = team2_score
-                match.status = MatchStatus.COMPLETED
-                # Advance knockout stage if needed
-                tournament.advance_knockout_stage()
-            else:
+        return self._run("خطأ في تحديث النتيجة", self.service.update_match_result, tournament_id, match_id, team1_score, team2_score)
+
+    def update_match_sets(self, tournament_id: str, match_id: str, set_scores: list[tuple[int, int]]) -> bool:
+        """Record a tennis/ping-pong result set by set"""
+        return self._run("خطأ في تحديث النتيجة", self.service.update_match_sets, tournament_id, match_id, set_scores)
+
+    def render_set_entry(self, tournament: Tournament, match: Match, key: str) -> bool:
+        """Set-by-set score inputs for set sports; True once a result was saved.
+
+        Sets left at 0-0 count as not played.
+        """
+        recorded = match.set_scores()
+        set_scores = []
+        for i in range(MAX_SETS[tournament.sport_type]):
+            team1_points, team2_points = recorded[i] if i < len(recorded) else (0, 0)
+            label_col, col1, col2 = st.columns([1, 2, 2])
+            with label_col:
+                st.write(f"الشوط {i + 1}")
+            with col1:
+                team1_points = st.number_input(f"الشوط {i + 1} - 1", min_value=0, max_value=MAX_SET_POINTS, step=1, value=team1_points,
+                                               key=f"{key}_s{i}_1", label_visibility="collapsed")
+            with col2:
+                team2_points = st.number_input(f"الشوط {i + 1} - 2", min_value=0, max_value=MAX_SET_POINTS, step=1, value=team2_points,
+                                               key=f"{key}_s{i}_2", label_visibility="collapsed")
+            if team1_points or team2_points:
+                set_scores.append((int(team1_points), int(team2_points)))
+        if st.button("حفظ نتيجة الأشواط", key=f"{key}_save", type="primary", use_container_width=True):
+            if not set_scores:
+                st.error("أدخل نتيجة شوط واحد على الأقل")
                 return False
-            
-            self.save_data()
-            return True
+            return self.update_match_sets(tournament.id, match.id, set_scores)
+        return False
+
+    def update_match_results(self, results: list[tuple[str, str, int, int]]) -> tuple[int, list[tuple[str, str]]]:
+        """Apply many results at once and persist them with a single write, all or nothing.
+
+        results holds (tournament_id, match_id, team1_score, team2_score).
+        Returns (applied_count, errors) where each error is (match_id, reason);
+        any error means nothing was applied.
+        """
+        try:
+            return self.service.update_match_results(results)
         except Exception as e:
-            st.error(f"خطأ في تحديث النتيجة: {e}")
-            return False
+            st.error(f"خطأ في تحديث النتائج: {e}")
+            return 0, []
     
     def generate_knockout_for_tournament(self, tournament_id: str) -> bool:
         """Generate knockout stage for tournament"""
-        try:
-            if tournament_id not in st.session_state.tournaments:
-                return False
-            
-            tournament = st.session_state.tournaments[tournament_id]
-            success = tournament.generate_knockout_matches()
-            if success:
-                self.save_data()
-            return success
-        except Exception as e:
-            st.error(f"خطأ في إنشاء دور الإقصاء: {e}")
-            return False
+        return self._run("خطأ في إنشاء دور الإقصاء", self.service.generate_knockout, tournament_id)
     
     def get_tournament(self, tournament_id: str) -> Optional[Tournament]:
         """Get tournament by ID"""
-        return st.session_state.tournaments.get(tournament_id)
+        return self.service.get_tournament(tournament_id)
     
     def get_all_tournaments(self) -> Dict[str, Tournament]:
         """Get all tournaments"""
-        # Auto-refresh if file changed (e.g., another session updated results)
+        # Auto-refresh if the store changed (e.g., another session updated results)
         self._refresh_if_changed()
-        return st.session_state.tournaments
+        return self.service.tournaments
     
+    @profiled("page.tournament_management")
     def render_tournament_management(self):
         """Render tournament management interface"""
         st.header("⚙️ إدارة الدوريات")
@@ -204,8 +267,6 @@ class TournamentManager:
                     if self.create_tournament(new_tournament_name.strip(), sport_type):
                         st.success("تم إنشاء الدوري بنجاح!")
                         st.rerun()
-                    else:
-                        st.error("فشل في إنشاء الدوري")
                 else:
                     st.error("يرجى إدخال اسم الدوري")
         
@@ -242,6 +303,7 @@ class TournamentManager:
         else:
             st.info("لا توجد دوريات حالياً. قم بإنشاء دوري جديد.")
     
+    @profiled("page.team_management")
     def render_team_management(self, tournament_id: str):
         """Render team management interface"""
         tournament = self.get_tournament(tournament_id)
@@ -261,31 +323,23 @@ class TournamentManager:
                     if self.add_team_to_tournament(tournament_id, new_team_name.strip()):
                         st.success("تم إضافة الفريق بنجاح!")
                         st.rerun()
-                    else:
-                        st.error("فشل في إضافة الفريق")
                 else:
                     st.error("يرجى إدخال اسم الفريق")
 
         # Bulk add teams
         with st.expander("إضافة عدة فرق دفعة واحدة", expanded=False):
-            st.caption("أدخل كل اسم في سطر منفصل")
-            bulk_text = st.text_area("الأسماء", height=150, key="bulk_team_text_manage")
-            if st.button("إضافة الكل", type="primary", key="bulk_add_btn_manage", use_container_width=True):
-                names = [n.strip() for n in bulk_text.splitlines() if n.strip()]
-                if not names:
-                    st.warning("لم يتم العثور على أسماء.")
-                else:
-                    success_count = 0
-                    for name in names:
-                        if self.add_team_to_tournament(tournament_id, name):
-                            success_count += 1
-                    st.success(f"تمت إضافة {success_count} من {len(names)}.")
-                    st.rerun()
+            self.render_bulk_team_registration(tournament_id, "bulk_team_manage")
         
         # Display teams
         if tournament.teams:
             st.subheader("الفرق المسجلة")
             search_query = st.text_input("ابحث عن فريق", key="team_search_manage")
+            orphan_policy = st.selectbox(
+                "مباريات الفريق المحذوف",
+                list(OrphanPolicy),
+                format_func=lambda p: p.value,
+                key="team_remove_policy_manage",
+            )
             # Preserve insertion order; only filter
             for team_id, team in tournament.teams.items():
                 if search_query and search_query.strip() not in team.name:
@@ -297,7 +351,7 @@ class TournamentManager:
                 
                 with col2:
                     if st.button("حذف", key=f"remove_team_{team_id}", type="secondary", use_container_width=True):
-                        if self.remove_team_from_tournament(tournament_id, team_id):
+                        if self.remove_team_from_tournament(tournament_id, team_id, orphan_policy):
                             st.success("تم حذف الفريق بنجاح!")
                             st.rerun()
         
@@ -318,8 +372,6 @@ class TournamentManager:
                         if self.create_groups_for_tournament(tournament_id, teams_per_group):
                             st.success("تم إنشاء المجموعات بنجاح!")
                             st.rerun()
-                        else:
-                            st.error("فشل في إنشاء المجموعات")
             else:
                 st.write(f"**إجمالي الفرق:** {len(tournament.teams)}")
                 st.caption("أدخل عدد الفرق لكل مجموعة (يجب أن يساوي إجمالي الفرق)")
@@ -349,8 +401,6 @@ class TournamentManager:
                         if self.create_custom_groups_for_tournament(tournament_id, group_sizes):
                             st.success("تم إنشاء المجموعات المخصصة بنجاح!")
                             st.rerun()
-                        else:
-                            st.error("فشل في إنشاء المجموعات المخصصة")
                 else:
                     st.error(f"المجموع يجب أن يساوي {len(tournament.teams)}")
         else:
@@ -379,6 +429,7 @@ class TournamentManager:
                 del st.session_state.current_tournament
             st.rerun()
     
+    @profiled("page.match_management")
     def render_match_management(self, tournament_id: str):
         """Render match management interface"""
         tournament = self.get_tournament(tournament_id)
@@ -442,46 +493,45 @@ class TournamentManager:
                             else:
                                 st.error(msg or "فشل في إنشاء المباراة")
         
-        # Group stage matches
+        # Group stage matches: only the selected group is rendered, one page at a time
         if tournament.matches:
             st.subheader("مباريات دور المجموعات")
 
             # Filters
+            # One pass buckets matches by group; widgets are only created for the selected one
+            matches_by_group: Dict[Optional[str], list[Match]] = {}
+            for match in tournament.matches.values():
+                group_key = match.group_id if match.group_id in tournament.groups else None
+                matches_by_group.setdefault(group_key, []).append(match)
+
             filter_cols = st.columns([2, 2, 2])
             with filter_cols[0]:
-                group_filter_options = {"كل المجموعات": None}
+                group_options = {}
                 for gid, grp in tournament.groups.items():
-                    group_filter_options[grp.name] = gid
-                selected_group_label = st.selectbox("المجموعة", list(group_filter_options.keys()), key="mm_group_filter")
-                selected_group_id = group_filter_options[selected_group_label]
+                    group_options[grp.name] = gid
+                if None in matches_by_group:
+                    group_options["بدون مجموعة"] = None
+                selected_group_label = st.selectbox("المجموعة", list(group_options.keys()), key="mm_group_filter")
+                selected_group_id = group_options.get(selected_group_label)
             with filter_cols[1]:
                 status_filter_label = st.selectbox("الحالة", ["الكل", "معلقة فقط", "مكتملة فقط"], key="mm_status_filter")
             with filter_cols[2]:
                 team_search = st.text_input("بحث عن فريق", key="mm_team_search")
 
-            # Render by groups
-            for group_id, group in tournament.groups.items():
-                if selected_group_id and group_id != selected_group_id:
-                    continue
-                with st.expander(f"{group.name}", expanded=True):
-                    group_matches = [m for m in tournament.matches.values() if m.group_id == group_id]
-                    if team_search:
-                        team_search_stripped = team_search.strip()
-                        def match_has_team(m):
-                            n1 = tournament.teams.get(m.team1_id).name if m.team1_id in tournament.teams else ""
-                            n2 = tournament.teams.get(m.team2_id).name if m.team2_id in tournament.teams else ""
-                            return team_search_stripped in n1 or team_search_stripped in n2
-                        group_matches = [m for m in group_matches if match_has_team(m)]
-                    if status_filter_label == "معلقة فقط":
-                        group_matches = [m for m in group_matches if not m.is_completed]
-                    elif status_filter_label == "مكتملة فقط":
-                        group_matches = [m for m in group_matches if m.is_completed]
-
-                    if group_matches:
-                        for match in group_matches:
-                            self._render_match_form(tournament, match)
-                    else:
-                        st.info("لا توجد مباريات مطابقة للمرشح")
+            group_matches = matches_by_group.get(selected_group_id, [])
+            if team_search.strip():
+                team_ids = get_search_index(self.get_all_tournaments()).team_ids(tournament_id, team_search)
+                group_matches = [m for m in group_matches if m.team1_id in team_ids or m.team2_id in team_ids]
+            if status_filter_label == "معلقة فقط":
+                group_matches = [m for m in group_matches if not m.is_completed]
+            elif status_filter_label == "مكتملة فقط":
+                group_matches = [m for m in group_matches if m.is_completed]
+
+            if group_matches:
+                filters = (selected_group_id, status_filter_label, team_search)
+                self._render_match_rows(tournament, group_matches, "mm_group", filters)
+            else:
+                st.info("لا توجد مباريات مطابقة للمرشح")
         
         # Knockout stage
         if tournament.knockout_matches or tournament.can_generate_knockout():
@@ -504,8 +554,7 @@ class TournamentManager:
                 for round_type in ["semi", "final"]:
                     if round_type in rounds:
                         st.write(f"**{get_round_name(round_type)}**")
-                        for match in rounds[round_type]:
-                            self._render_match_form(tournament, match)
+                        self._render_match_rows(tournament, rounds[round_type], f"mm_{round_type}")
         
         # Back button
         if st.button("العودة لإدارة الفرق", type="secondary", use_container_width=True):
@@ -517,44 +566,9 @@ class TournamentManager:
 
         Returns (ok, error_message). error_message is None when ok is True.
         """
+        self._refresh_if_changed()
         try:
-            tournaments = self.get_all_tournaments()
-            if tournament_id not in tournaments:
-                return False, "الدوري غير موجود"
-            tournament = tournaments[tournament_id]
-
-            if team1_id == team2_id:
-                return False, "لا يمكن اختيار نفس الفريق"
-            if team1_id not in tournament.teams or team2_id not in tournament.teams:
-                return False, "فرق غير صالحة"
-
-            from models import Match
-
-            if round_type == "group":
-                if not group_id or group_id not in tournament.groups:
-                    return False, "المجموعة غير صالحة"
-                # Ensure both teams in the selected group
-                group_team_ids = set(tournament.groups[group_id].team_ids)
-                if team1_id not in group_team_ids or team2_id not in group_team_ids:
-                    return False, "الفريقان يجب أن يكونا ضمن نفس المجموعة"
-                # Check duplicates in group matches (order-insensitive)
-                for m in tournament.matches.values():
-                    if m.group_id == group_id and {m.team1_id, m.team2_id} == {team1_id, team2_id}:
-                        return False, "المباراة موجودة بالفعل في هذه المجموعة"
-                new_match = Match(id="", team1_id=team1_id, team2_id=team2_id, group_id=group_id, round_type="group")
-                tournament.matches[new_match.id] = new_match
-            else:
-                # Knockout rounds
-                if round_type not in {"semi", "final"}:
-                    return False, "نوع الجولة غير صالح"
-                # Prevent duplicates in knockout with same pairing and round
-                for m in tournament.knockout_matches.values():
-                    if m.round_type == round_type and {m.team1_id, m.team2_id} == {team1_id, team2_id}:
-                        return False, "المباراة موجودة بالفعل في هذا الدور"
-                new_match = Match(id="", team1_id=team1_id, team2_id=team2_id, round_type=round_type)
-                tournament.knockout_matches[new_match.id] = new_match
-
-            self.save_data()
+            self.service.create_manual_match(tournament_id, team1_id, team2_id, round_type, group_id)
             return True, None
         except Exception as e:
             return False, str(e)
@@ -565,110 +579,124 @@ class TournamentManager:
         Resets scores and status to معلقة.
         Returns (ok, error_message).
         """
+        self._refresh_if_changed()
         try:
-            tournaments = self.get_all_tournaments()
-            if tournament_id not in tournaments:
-                return False, "الدوري غير موجود"
-            tournament = tournaments[tournament_id]
-
-            # Locate match
-            match: Optional[Match]
-            in_group = False
-            if match_id in tournament.matches:
-                match = tournament.matches[match_id]
-                in_group = True
-            elif match_id in tournament.knockout_matches:
-                match = tournament.knockout_matches[match_id]
-            else:
-                return False, "المباراة غير موجودة"
-
-            if team1_id == team2_id:
-                return False, "لا يمكن اختيار نفس الفريق"
-            if team1_id not in tournament.teams or team2_id not in tournament.teams:
-                return False, "فرق غير صالحة"
-
-            # Group validation
-            if in_group:
-                gid = match.group_id
-                if not gid or gid not in tournament.groups:
-                    return False, "المجموعة غير صالحة"
-                group_team_ids = set(tournament.groups[gid].team_ids)
-                if team1_id not in group_team_ids or team2_id not in group_team_ids:
-                    return False, "الفريقان يجب أن يكونا ضمن نفس المجموعة"
-                # Duplicate check among group matches excluding self
-                for m in tournament.matches.values():
-                    if m.id == match.id:
-                        continue
-                    if m.group_id == gid and {m.team1_id, m.team2_id} == {team1_id, team2_id}:
-                        return False, "مباراة بنفس المتنافسين موجودة بالفعل في هذه المجموعة"
-            else:
-                # Knockout duplicate check (same round)
-                rtype = match.round_type
-                for m in tournament.knockout_matches.values():
-                    if m.id == match.id:
-                        continue
-                    if m.round_type == rtype and {m.team1_id, m.team2_id} == {team1_id, team2_id}:
-                        return False, "مباراة بنفس المتنافسين موجودة بالفعل في هذا الدور"
-
-            # Apply update and reset scores
-            match.team1_id = team1_id
-            match.team2_id = team2_id
-            match.team1_score = None
-            match.team2_score = None
-            match.status = MatchStatus.PENDING
-
-            self.save_data()
+            self.service.update_match_competitors(tournament_id, match_id, team1_id, team2_id)
             return True, None
         except Exception as e:
             return False, str(e)
 
+    def _render_match_rows(self, tournament: Tournament, matches: list[Match], key: str, filters: tuple = ()):
+        """Render one page of compact match rows; only the opened match gets the full form.
+
+        The page is kept in session state under key and reset when filters change.
+        """
+        page_key, filters_key = f"{key}_page", f"{key}_filters"
+        if st.session_state.get(filters_key) != filters:
+            st.session_state[filters_key] = filters
+            st.session_state[page_key] = 0
+        page_count = max(1, -(-len(matches) // MATCHES_PER_PAGE))
+        page = min(st.session_state.get(page_key, 0), page_count - 1)
+        st.session_state[page_key] = page
+        open_match = st.session_state.get("mm_open_match")
+        live = get_live_scoring()
+
+        for match in matches[page * MATCHES_PER_PAGE:(page + 1) * MATCHES_PER_PAGE]:
+            if match.id == open_match:
+                with st.container(border=True):
+                    self._render_match_form(tournament, match)
+                    st.button("إغلاق", key=f"mm_close_{match.id}", use_container_width=True,
+                              on_click=_set_open_match, args=(None,))
+                continue
+            team1 = tournament.teams.get(match.team1_id)
+            team2 = tournament.teams.get(match.team2_id)
+            row_col, status_col, edit_col = st.columns([5, 1, 1])
+            with row_col:
+                st.text(f"{team1.name if team1 else 'فريق غير معروف'}  {score_text(match)}  "
+                        f"{team2.name if team2 else 'فريق غير معروف'}")
+            with status_col:
+                live_score = live.get(match.id)
+                if live_score is not None:
+                    st.caption(f"🔴 مباشر {live_score.team1}-{live_score.team2}")
+                else:
+                    st.caption("✅ مكتملة" if match.is_completed else "⏳ معلقة")
+            with edit_col:
+                st.button("✏️ تعديل", key=f"mm_open_{match.id}", use_container_width=True,
+                          on_click=_set_open_match, args=(match.id,))
+
+        if page_count > 1:
+            nav_prev, nav_label, nav_next = st.columns([1, 2, 1])
+            with nav_prev:
+                st.button("→ السابق", key=f"{key}_prev", use_container_width=True, disabled=page == 0,
+                          on_click=_set_state, args=(page_key, page - 1))
+            with nav_label:
+                st.caption(f"صفحة {page + 1} من {page_count} · {len(matches)} مباراة")
+            with nav_next:
+                st.button("التالي ←", key=f"{key}_next", use_container_width=True, disabled=page >= page_count - 1,
+                          on_click=_set_state, args=(page_key, page + 1))
+
     def _render_match_form(self, tournament: Tournament, match: Match):
         """Render form for a single match"""
         team1_name = tournament.teams.get(match.team1_id, type('obj', (object,), {'name': 'فريق غير معروف'})).name
         team2_name = tournament.teams.get(match.team2_id, type('obj', (object,), {'name': 'فريق غير معروف'})).name
         
-        col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 2])
+        if tournament.sport_type in SET_SPORTS:
+            st.write(f"{team1_name} ضد {team2_name}")
+            if self.render_set_entry(tournament, match, f"sets_{match.id}"):
+                st.success("تم تحديث النتيجة بنجاح!")
+                st.rerun()
+            if match.is_completed:
+                st.success(f"مكتملة: {score_text(match)}")
+            else:
+                st.warning("معلقة")
+        else:
+            col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 2])
         
-        with col1:
-            st.write(team1_name)
+            with col1:
+                st.write(team1_name)
         
-        with col2:
-            team1_score = st.number_input(
-                "النتيجة",
-                min_value=0,
-                value=match.team1_score if match.team1_score is not None else 0,
-                key=f"team1_score_{match.id}",
-                label_visibility="collapsed"
-            )
+            with col2:
+                team1_score = st.number_input(
+                    "النتيجة",
+                    min_value=0,
+                    value=match.team1_score if match.team1_score is not None else 0,
+                    key=f"team1_score_{match.id}",
+                    label_visibility="collapsed"
+                )
         
-        with col3:
-            st.write("VS")
+            with col3:
+                st.write("VS")
         
-        with col4:
-            team2_score = st.number_input(
-                "النتيجة",
-                min_value=0,
-                value=match.team2_score if match.team2_score is not None else 0,
-                key=f"team2_score_{match.id}",
-                label_visibility="collapsed"
-            )
+            with col4:
+                team2_score = st.number_input(
+                    "النتيجة",
+                    min_value=0,
+                    value=match.team2_score if match.team2_score is not None else 0,
+                    key=f"team2_score_{match.id}",
+                    label_visibility="collapsed"
+                )
         
-        with col5:
-            st.write(team2_name)
+            with col5:
+                st.write(team2_name)
         
-        col6, col7 = st.columns([1, 1])
+            col6, col7 = st.columns([1, 1])
         
-        with col6:
-            if st.button("تحديث النتيجة", key=f"update_{match.id}", type="primary", use_container_width=True):
-                if self.update_match_result(tournament.id, match.id, team1_score, team2_score):
-                    st.success("تم تحديث النتيجة بنجاح!")
-                    st.rerun()
+            with col6:
+                if st.button("تحديث النتيجة", key=f"update_{match.id}", type="primary", use_container_width=True):
+                    if self.update_match_result(tournament.id, match.id, team1_score, team2_score):
+                        st.success("تم تحديث النتيجة بنجاح!")
+                        st.rerun()
         
-        with col7:
-            if match.is_completed:
-                st.success("مكتملة")
-            else:
-                st.warning("معلقة")
+            with col7:
+                if match.is_completed:
+                    st.success("مكتملة")
+                else:
+                    st.warning("معلقة")
+
+        live_score = get_live_scoring().get(match.id)
+        if live_score is not None or not match.is_completed:
+            with st.expander("🔴 تسجيل مباشر", expanded=live_score is not None):
+                st.fragment(_render_live_panel)(self, tournament.id, match.id)
 
         # In-place competitor editing
         with st.expander("تعديل المتنافسين", expanded=False):
@@ -716,13 +744,14 @@ class TournamentManager:
         
         # Quick actions
         qa1, qa2, qa3 = st.columns(3)
+        with_draw = tournament.sport_type not in NO_DRAW_SPORTS
         with qa1:
             if st.button(f"🏆 فوز {team1_name}", key=f"qa_t1_{match.id}", type="secondary", use_container_width=True):
                 if self.update_match_result(tournament.id, match.id, 1, 0):
                     st.success("تم تسجيل النتيجة")
                     st.rerun()
         with qa2:
-            if st.button("🤝 تعادل", key=f"qa_draw_{match.id}", type="secondary", use_container_width=True):
+            if with_draw and st.button("🤝 تعادل", key=f"qa_draw_{match.id}", type="secondary", use_container_width=True):
                 if self.update_match_result(tournament.id, match.id, 0, 0):
                     st.success("تم تسجيل التعادل")
                     st.rerun()
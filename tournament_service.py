@@ -0,0 +1,398 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from models import Tournament, Team, Match, SportType, MatchStatus, OrphanPolicy, SET_SPORTS, NO_DRAW_SPORTS, MAX_SETS, MAX_SET_POINTS
+from utils import save_tournaments, load_tournaments, get_store_mtime, validate_score, StaleStoreError
+
+
+class TournamentError(Exception):
+    """Base error for service operations; the message is user-facing"""
+
+
+class NotFoundError(TournamentError):
+    """A tournament, team or match id does not exist"""
+
+
+class ValidationError(TournamentError):
+    """The requested change is not allowed"""
+
+
+class StorageError(TournamentError):
+    """Persisting the store failed"""
+
+
+class ConflictError(TournamentError):
+    """Another session committed first; the service has reloaded and the change must be redone"""
+
+
+class TournamentService:
+    """Tournament operations without any Streamlit dependency.
+
+    Holds the in-memory tournaments dictionary, keeps it in sync with the
+    store and persists every mutation with a single write. Failures are
+    reported by raising TournamentError subclasses.
+    """
+
+    def __init__(
+        self,
+        tournaments: Optional[Dict[str, Tournament]] = None,
+        load: Callable[[], Dict[str, Tournament]] = load_tournaments,
+        save: Callable[[Dict[str, Tournament], List[dict], float], float] = save_tournaments,
+        get_mtime: Callable[[], float] = get_store_mtime,
+        watch_mtime: Optional[Callable[[], float]] = None,
+    ):
+        """watch_mtime, if given, is a cheap in-memory source of the store
+        mtime (e.g. a shared ChangeFeed) used by refresh_if_changed instead
+        of querying the database on every call."""
+        self._load = load
+        self._save = save
+        self._get_mtime = get_mtime
+        self._watch_mtime = watch_mtime
+        if tournaments is None:
+            self._reload()
+        else:
+            self.tournaments = tournaments
+            self.data_mtime = self._current_mtime()
+        # Matches whose result changed since the last commit, for delta events
+        self._changed_matches: List[Tuple[Tournament, Match]] = []
+        self._deleted_ids: List[str] = []
+
+    def _current_mtime(self) -> float:
+        try:
+            return float(self._get_mtime())
+        except Exception:
+            return 0.0
+
+    def _reload(self):
+        # mtime first: a write landing between the two reads then only makes
+        # the copy look older than it is, never newer
+        mtime = self._current_mtime()
+        self.tournaments = self._load()
+        # The first load creates the store
+        self.data_mtime = mtime or self._current_mtime()
+
+    # ---------- Store sync ----------
+    def has_external_changes(self) -> bool:
+        """True if the store was written after this service last loaded or saved it"""
+        if self._watch_mtime is None:
+            return self._current_mtime() > self.data_mtime
+        return self._watch_mtime() > self.data_mtime
+
+    def refresh_if_changed(self) -> bool:
+        """Reload tournaments if the store changed externally. Returns True if reloaded."""
+        if not self.has_external_changes():
+            return False
+        if self._current_mtime() > self.data_mtime:
+            self._reload()
+            return True
+        return False
+
+    def commit(self, *touched: Tournament):
+        """Bump the version of the touched tournaments and persist everything with a single write.
+
+        Compact change events (see build_changes) are written alongside the
+        store so display screens can patch themselves instead of refetching.
+
+        The write is refused if another session committed since this copy
+        was loaded: saving it would undo their changes and give a second,
+        different content the same version, which every version-keyed cache
+        and ETag trusts to be unique. The copy is then reloaded from the
+        store (as after a failed write) and ConflictError is raised.
+        """
+        for tournament in touched:
+            tournament.version += 1
+        changes = self.build_changes(touched)
+        self._changed_matches = []
+        self._deleted_ids = []
+        try:
+            mtime = self._save(self.tournaments, changes, self.data_mtime)
+        except StaleStoreError:
+            self._reload()
+            raise ConflictError("تم تعديل البيانات من جلسة أخرى، تم تحديثها، يرجى إعادة المحاولة")
+        if not mtime:
+            self._reload()
+            raise StorageError("تعذر حفظ البيانات")
+        self.data_mtime = mtime
+
+    def build_changes(self, touched) -> List[dict]:
+        """Delta events for a commit.
+
+        match_updated and standings_changed carry enough data to patch a
+        screen in place; the trailing tournament_changed carries the new
+        version so a client knows whether it missed anything.
+        """
+        changes = []
+        standings_groups = []
+        for tournament, match in self._changed_matches:
+            changes.append({
+                'type': 'match_updated',
+                'tournament_id': tournament.id,
+                'version': tournament.version,
+                'match': {
+                    'id': match.id,
+                    'team1_id': match.team1_id,
+                    'team2_id': match.team2_id,
+                    'team1_score': match.team1_score,
+                    'team2_score': match.team2_score,
+                    'sets': match.sets.tolist() if match.sets else None,
+                    'status': match.status.value,
+                    'group_id': match.group_id,
+                    'round_type': match.round_type,
+                },
+            })
+            if match.round_type == "group" and (tournament, match.group_id) not in standings_groups:
+                standings_groups.append((tournament, match.group_id))
+        for tournament, group_id in standings_groups:
+            changes.append({
+                'type': 'standings_changed',
+                'tournament_id': tournament.id,
+                'version': tournament.version,
+                'group_id': group_id,
+                'standings': [
+                    {k: row[k] for k in ('team_id', 'played', 'won', 'drawn', 'lost', 'goal_difference', 'points')}
+                    for row in tournament.get_group_standings(group_id)
+                ],
+            })
+        for tournament in touched:
+            changes.append({'type': 'tournament_changed', 'tournament_id': tournament.id, 'version': tournament.version})
+        for tournament_id in self._deleted_ids:
+            changes.append({'type': 'tournament_deleted', 'tournament_id': tournament_id})
+        if not changes:
+            # Watchers track the store through the log, so every write leaves a trace
+            changes.append({'type': 'store_changed'})
+        return changes
+
+    # ---------- Lookups ----------
+    def get_tournament(self, tournament_id: str) -> Optional[Tournament]:
+        return self.tournaments.get(tournament_id)
+
+    def require_tournament(self, tournament_id: str) -> Tournament:
+        tournament = self.tournaments.get(tournament_id)
+        if tournament is None:
+            raise NotFoundError("الدوري غير موجود")
+        return tournament
+
+    @staticmethod
+    def require_match(tournament: Tournament, match_id: str) -> Match:
+        match = tournament.matches.get(match_id) or tournament.knockout_matches.get(match_id)
+        if match is None:
+            raise NotFoundError("المباراة غير موجودة")
+        return match
+
+    # ---------- Tournaments & teams ----------
+    def create_tournament(self, name: str, sport_type: SportType) -> Tournament:
+        if not name.strip():
+            raise ValidationError("يرجى إدخال اسم الدوري")
+        tournament = Tournament(id="", name=name.strip(), sport_type=sport_type)
+        self.tournaments[tournament.id] = tournament
+        self.commit(tournament)
+        return tournament
+
+    def delete_tournament(self, tournament_id: str):
+        self.require_tournament(tournament_id)
+        del self.tournaments[tournament_id]
+        self._deleted_ids.append(tournament_id)
+        self.commit()
+
+    def add_team(self, tournament_id: str, team_name: str) -> Team:
+        tournament = self.require_tournament(tournament_id)
+        team = Team(id="", name=team_name, sport_type=tournament.sport_type)
+        tournament.add_team(team)
+        self.commit(tournament)
+        return team
+
+    def add_teams(self, tournament_id: str, team_names: List[str]) -> Tuple[List[Team], List[Tuple[int, str, str]]]:
+        """Add many teams with one write. Returns (added_teams, errors)."""
+        tournament = self.require_tournament(tournament_id)
+        added, errors = tournament.add_teams(team_names)
+        if added:
+            self.commit(tournament)
+        return added, errors
+
+    def remove_team(self, tournament_id: str, team_id: str, policy: OrphanPolicy = OrphanPolicy.DELETE):
+        tournament = self.require_tournament(tournament_id)
+        if not tournament.remove_team(team_id, policy):
+            raise NotFoundError("الفريق غير موجود")
+        self.commit(tournament)
+
+    # ---------- Groups & knockout ----------
+    def create_groups(self, tournament_id: str, teams_per_group: int = 4):
+        tournament = self.require_tournament(tournament_id)
+        if not tournament.create_groups(teams_per_group):
+            raise ValidationError("يجب إضافة 3 فرق على الأقل لإنشاء المجموعات")
+        tournament.generate_group_matches()
+        self.commit(tournament)
+
+    def create_custom_groups(self, tournament_id: str, group_sizes: List[int]):
+        tournament = self.require_tournament(tournament_id)
+        if not tournament.create_custom_groups(group_sizes):
+            raise ValidationError(f"المجموع يجب أن يساوي {len(tournament.teams)}")
+        tournament.generate_group_matches()
+        self.commit(tournament)
+
+    def generate_knockout(self, tournament_id: str):
+        tournament = self.require_tournament(tournament_id)
+        if not tournament.generate_knockout_matches():
+            raise ValidationError("لا يوجد عدد كافٍ من متصدري المجموعات لدور الإقصاء")
+        self.commit(tournament)
+
+    # ---------- Results ----------
+    @staticmethod
+    def _check_result(tournament: Tournament, team1_score, team2_score) -> Tuple[int, int]:
+        """Validate a final score without touching the match"""
+        ok1, score1 = validate_score(str(team1_score))
+        ok2, score2 = validate_score(str(team2_score))
+        if not (ok1 and ok2):
+            raise ValidationError("نتيجة غير صالحة")
+        if score1 == score2 and tournament.sport_type in NO_DRAW_SPORTS:
+            raise ValidationError(f"لا يمكن أن تنتهي المباراة بالتعادل في {tournament.sport_type.value}")
+        return score1, score2
+
+    def _apply_result(self, tournament: Tournament, match: Match, team1_score, team2_score):
+        score1, score2 = self._check_result(tournament, team1_score, team2_score)
+        match.team1_score = score1
+        match.team2_score = score2
+        match.sets = None
+        match.status = MatchStatus.COMPLETED
+        self._changed_matches.append((tournament, match))
+
+    def _apply_sets(self, tournament: Tournament, match: Match, set_scores: List[Tuple[int, int]]):
+        if tournament.sport_type not in SET_SPORTS:
+            raise ValidationError("نتائج الأشواط متاحة للتنس والبينغ بونغ فقط")
+        max_sets = MAX_SETS[tournament.sport_type]
+        if not 1 <= len(set_scores) <= max_sets:
+            raise ValidationError(f"عدد الأشواط يجب أن يكون بين 1 و{max_sets}")
+        parsed = []
+        for team1_points, team2_points in set_scores:
+            ok1, points1 = validate_score(str(team1_points))
+            ok2, points2 = validate_score(str(team2_points))
+            if not (ok1 and ok2):
+                raise ValidationError("نتيجة شوط غير صالحة")
+            if points1 > MAX_SET_POINTS or points2 > MAX_SET_POINTS:
+                raise ValidationError(f"نقاط الشوط يجب ألا تتجاوز {MAX_SET_POINTS}")
+            if points1 == points2:
+                raise ValidationError("لا يمكن أن ينتهي الشوط بالتعادل")
+            parsed.append((points1, points2))
+        team1_sets = sum(1 for points1, points2 in parsed if points1 > points2)
+        if team1_sets * 2 == len(parsed):
+            raise ValidationError("يجب أن يفوز أحد الطرفين بعدد أكبر من الأشواط")
+        match.record_sets(parsed)
+        match.status = MatchStatus.COMPLETED
+        self._changed_matches.append((tournament, match))
+
+    def _advance_knockout(self, tournament: Tournament):
+        """Advance the bracket and report any newly created match as a change"""
+        before = set(tournament.knockout_matches)
+        tournament.advance_knockout_stage()
+        for match_id in tournament.knockout_matches.keys() - before:
+            self._changed_matches.append((tournament, tournament.knockout_matches[match_id]))
+
+    def update_match_result(self, tournament_id: str, match_id: str, team1_score: int, team2_score: int) -> Match:
+        tournament = self.require_tournament(tournament_id)
+        match = self.require_match(tournament, match_id)
+        self._apply_result(tournament, match, team1_score, team2_score)
+        if match_id in tournament.knockout_matches:
+            self._advance_knockout(tournament)
+        self.commit(tournament)
+        return match
+
+    def update_match_sets(self, tournament_id: str, match_id: str, set_scores: List[Tuple[int, int]]) -> Match:
+        """Record a tennis/ping-pong result set by set; the match score becomes sets won"""
+        tournament = self.require_tournament(tournament_id)
+        match = self.require_match(tournament, match_id)
+        self._apply_sets(tournament, match, set_scores)
+        if match_id in tournament.knockout_matches:
+            self._advance_knockout(tournament)
+        self.commit(tournament)
+        return match
+
+    def update_match_results(self, results: List[Tuple[str, str, int, int]]) -> Tuple[int, List[Tuple[str, str]]]:
+        """Apply many results and persist them with a single write, all or nothing.
+
+        results holds (tournament_id, match_id, team1_score, team2_score).
+        Every row is validated before any is applied; if one fails nothing changes.
+        Returns (applied_count, errors) where each error is (match_id, reason).
+        """
+        checked = []
+        errors = []
+        for tournament_id, match_id, team1_score, team2_score in results:
+            try:
+                tournament = self.require_tournament(tournament_id)
+                match = self.require_match(tournament, match_id)
+                score1, score2 = self._check_result(tournament, team1_score, team2_score)
+            except TournamentError as e:
+                errors.append((match_id, str(e)))
+                continue
+            checked.append((tournament, match, score1, score2))
+        if errors or not checked:
+            return 0, errors
+        touched = {}
+        knockout_touched = {}
+        for tournament, match, score1, score2 in checked:
+            self._apply_result(tournament, match, score1, score2)
+            touched[tournament.id] = tournament
+            if match.id in tournament.knockout_matches:
+                knockout_touched[tournament.id] = tournament
+        # Advance each knockout bracket once, after all its results are in
+        for tournament in knockout_touched.values():
+            self._advance_knockout(tournament)
+        self.commit(*touched.values())
+        return len(checked), errors
+
+    # ---------- Manual matches ----------
+    @staticmethod
+    def _validate_pair(tournament: Tournament, team1_id: str, team2_id: str):
+        if team1_id == team2_id:
+            raise ValidationError("لا يمكن اختيار نفس الفريق")
+        if team1_id not in tournament.teams or team2_id not in tournament.teams:
+            raise ValidationError("فرق غير صالحة")
+
+    @staticmethod
+    def _validate_group_pair(tournament: Tournament, group_id: Optional[str], team1_id: str, team2_id: str):
+        if not group_id or group_id not in tournament.groups:
+            raise ValidationError("المجموعة غير صالحة")
+        group_team_ids = set(tournament.groups[group_id].team_ids)
+        if team1_id not in group_team_ids or team2_id not in group_team_ids:
+            raise ValidationError("الفريقان يجب أن يكونا ضمن نفس المجموعة")
+
+    def create_manual_match(self, tournament_id: str, team1_id: str, team2_id: str, round_type: str = "group", group_id: Optional[str] = None) -> Match:
+        """Create a manual match between two teams, rejecting duplicate pairings"""
+        tournament = self.require_tournament(tournament_id)
+        self._validate_pair(tournament, team1_id, team2_id)
+
+        if round_type == "group":
+            self._validate_group_pair(tournament, group_id, team1_id, team2_id)
+            if tournament.find_pair_match(team1_id, team2_id, group_id):
+                raise ValidationError("المباراة موجودة بالفعل في هذه المجموعة")
+            new_match = Match(id="", team1_id=team1_id, team2_id=team2_id, group_id=group_id, round_type="group")
+        else:
+            if round_type not in {"semi", "final"}:
+                raise ValidationError("نوع الجولة غير صالح")
+            if tournament.find_pair_match(team1_id, team2_id, round_type):
+                raise ValidationError("المباراة موجودة بالفعل في هذا الدور")
+            new_match = Match(id="", team1_id=team1_id, team2_id=team2_id, round_type=round_type)
+        tournament.add_match(new_match)
+        self.commit(tournament)
+        return new_match
+
+    def update_match_competitors(self, tournament_id: str, match_id: str, team1_id: str, team2_id: str) -> Match:
+        """Change the teams of a match; resets its score to pending"""
+        tournament = self.require_tournament(tournament_id)
+        match = self.require_match(tournament, match_id)
+        self._validate_pair(tournament, team1_id, team2_id)
+
+        if match_id in tournament.matches:
+            self._validate_group_pair(tournament, match.group_id, team1_id, team2_id)
+            existing = tournament.find_pair_match(team1_id, team2_id, match.group_id)
+            if existing and existing.id != match.id:
+                raise ValidationError("مباراة بنفس المتنافسين موجودة بالفعل في هذه المجموعة")
+        else:
+            existing = tournament.find_pair_match(team1_id, team2_id, match.round_type)
+            if existing and existing.id != match.id:
+                raise ValidationError("مباراة بنفس المتنافسين موجودة بالفعل في هذا الدور")
+
+        tournament.set_match_competitors(match, team1_id, team2_id)
+        match.team1_score = None
+        match.team2_score = None
+        match.sets = None
+        match.status = MatchStatus.PENDING
+        self.commit(tournament)
+        return match
@@ -1,9 +1,14 @@
+import csv
+import io
 import json
 import os
 import sqlite3
+import threading
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 from models import Tournament
+from profiling import profiled
+import metrics
 
 # Legacy JSON path (still used for one-time migration if present)
 DATA_FILE = "tournaments_data.json"
@@ -57,8 +62,41 @@ def _get_connection():
         )
         """
     )
+    # Append-only feed of compact deltas, written in the same transaction as the store
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL NOT NULL,
+            payload TEXT NOT NULL
+        )
+        """
+    )
+    # Per-match log of live scoring taps, folded into the match when it ends
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS live_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tournament_id TEXT NOT NULL,
+            match_id TEXT NOT NULL,
+            ts REAL NOT NULL,
+            kind TEXT NOT NULL,
+            side INTEGER NOT NULL,
+            delta INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS live_events_match ON live_events(match_id, seq)")
     return conn
 
+# Number of change_log rows kept; older ones are pruned on write
+CHANGE_LOG_RETAIN = 5000
+# Live scoring appends many small changes; prune once per this many
+LIVE_PRUNE_EVERY = 500
+
+class StaleStoreError(Exception):
+    """The store was written after the copy being saved was loaded"""
+
 def _read_kv(key: str) -> tuple[str | None, float | None]:
     try:
         with _get_connection() as conn:
@@ -70,18 +108,135 @@ def _read_kv(key: str) -> tuple[str | None, float | None]:
     except Exception:
         return None, None
 
-def _write_kv(key: str, value: str) -> bool:
+def _write_kv(key: str, value: str, changes: Optional[List[dict]] = None,
+              expected_mtime: Optional[float] = None) -> float:
+    """Write key and return its new mtime (0.0 on failure).
+
+    With expected_mtime, raise StaleStoreError instead of writing if the
+    stored mtime differs. The check and the write share one IMMEDIATE
+    transaction, and mtimes strictly increase, so no two writes share one.
+    """
     try:
-        now = time.time()
         with _get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT mtime FROM kv_store WHERE key=?", (key,)).fetchone()
+            previous = float(row[0]) if row else 0.0
+            if expected_mtime is not None and previous != expected_mtime:
+                raise StaleStoreError(key)
+            now = max(time.time(), previous + 1e-6)
             conn.execute(
                 "INSERT INTO kv_store(key, value, mtime) VALUES(?,?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value, mtime=excluded.mtime",
                 (key, value, now),
             )
-        return True
+            if changes:
+                conn.executemany(
+                    "INSERT INTO change_log(ts, payload) VALUES(?,?)",
+                    [(now, json.dumps(c, ensure_ascii=False, separators=(',', ':'))) for c in changes],
+                )
+                conn.execute(
+                    "DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - ?",
+                    (CHANGE_LOG_RETAIN,),
+                )
+        return now
+    except StaleStoreError:
+        raise
     except Exception as e:
         print(f"Error writing to DB: {e}")
-        return False
+        return 0.0
+
+# Readers poll often and live scoring writes often; keep one connection
+# per thread instead of reopening
+_reader = threading.local()
+
+def _reader_connection():
+    conn = getattr(_reader, "conn", None)
+    if conn is None:
+        conn = _get_connection()
+        _reader.conn = conn
+    return conn
+
+@profiled("storage.read_changes")
+def read_changes(since_seq: int, limit: int = 500) -> List[tuple[int, dict]]:
+    """Return (seq, change) pairs newer than since_seq, oldest first.
+
+    Each change carries 'ts', the store mtime of the commit that wrote it.
+    """
+    try:
+        cur = _reader_connection().execute(
+            "SELECT seq, ts, payload FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+            (since_seq, limit),
+        )
+        changes = []
+        for seq, ts, payload in cur.fetchall():
+            change = json.loads(payload)
+            change['ts'] = float(ts)
+            changes.append((int(seq), change))
+        return changes
+    except Exception as e:
+        print(f"Error reading change log: {e}")
+        return []
+
+def get_latest_change_seq() -> int:
+    """Sequence number of the newest change (0 if none)"""
+    try:
+        row = _reader_connection().execute("SELECT MAX(seq) FROM change_log").fetchone()
+        return int(row[0] or 0)
+    except Exception:
+        return 0
+
+@profiled("storage.live_event")
+def append_live_event(tournament_id: str, match_id: str, kind: str, side: int, delta: int, change: dict) -> int:
+    """Append one live scoring event and its change-log entry in one small transaction.
+
+    The tournaments blob is not touched. Returns the change seq (0 on failure).
+    """
+    try:
+        now = time.time()
+        conn = _reader_connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO live_events(tournament_id, match_id, ts, kind, side, delta) VALUES(?,?,?,?,?,?)",
+                (tournament_id, match_id, now, kind, side, delta),
+            )
+            cur = conn.execute(
+                "INSERT INTO change_log(ts, payload) VALUES(?,?)",
+                (now, json.dumps(change, ensure_ascii=False, separators=(',', ':'))),
+            )
+            seq = int(cur.lastrowid)
+            if seq % LIVE_PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM change_log WHERE seq <= ?", (seq - CHANGE_LOG_RETAIN,))
+        return seq
+    except Exception as e:
+        print(f"Error writing live event: {e}")
+        return 0
+
+def read_live_events(match_id: Optional[str] = None) -> List[tuple[str, str, str, int, int]]:
+    """(tournament_id, match_id, kind, side, delta) of one match's (or every) live event, oldest first"""
+    try:
+        query = "SELECT tournament_id, match_id, kind, side, delta FROM live_events"
+        if match_id is None:
+            cur = _reader_connection().execute(f"{query} ORDER BY seq")
+        else:
+            cur = _reader_connection().execute(f"{query} WHERE match_id=? ORDER BY seq", (match_id,))
+        return [(tid, mid, kind, int(side), int(delta)) for tid, mid, kind, side, delta in cur.fetchall()]
+    except Exception as e:
+        print(f"Error reading live events: {e}")
+        return []
+
+def clear_live_events(match_id: str, change: dict) -> int:
+    """Drop a match's live events and append change (its final live state); returns the change seq"""
+    try:
+        conn = _reader_connection()
+        with conn:
+            conn.execute("DELETE FROM live_events WHERE match_id=?", (match_id,))
+            cur = conn.execute(
+                "INSERT INTO change_log(ts, payload) VALUES(?,?)",
+                (time.time(), json.dumps(change, ensure_ascii=False, separators=(',', ':'))),
+            )
+        return int(cur.lastrowid)
+    except Exception as e:
+        print(f"Error clearing live events: {e}")
+        return 0
 
 def get_store_mtime() -> float:
     """Return last modification time for tournaments store (0.0 if none)."""
@@ -108,23 +263,38 @@ def _migrate_json_to_db_if_needed():
         print(f"Error migrating JSON to DB: {e}")
         _write_kv("tournaments", json.dumps({}, ensure_ascii=False))
 
-def save_tournaments(tournaments: Dict[str, Tournament]):
-    """Persist all tournaments to SQLite (as a single JSON blob)."""
+@profiled("storage.save")
+def save_tournaments(tournaments: Dict[str, Tournament], changes: Optional[List[dict]] = None,
+                     expected_mtime: Optional[float] = None) -> float:
+    """Persist all tournaments to SQLite (as a single JSON blob).
+
+    changes are appended to the change log in the same transaction.
+    Returns the new store mtime (0.0 on failure); raises StaleStoreError
+    if expected_mtime is given and the store has moved past it.
+    """
+    start = time.perf_counter()
     data = {
         tournament_id: tournament.to_dict()
         for tournament_id, tournament in tournaments.items()
     }
     try:
-        ok = _write_kv("tournaments", json.dumps(data, ensure_ascii=False))
-        return bool(ok)
+        payload = json.dumps(data, ensure_ascii=False)
+        mtime = _write_kv("tournaments", payload, changes, expected_mtime)
+        metrics.save_seconds.observe(time.perf_counter() - start)
+        metrics.payload_bytes.observe(len(payload.encode('utf-8')))
+        return mtime
+    except StaleStoreError:
+        raise
     except Exception as e:
         print(f"Error saving tournaments: {e}")
-        return False
+        return 0.0
 
+@profiled("storage.load")
 def load_tournaments() -> Dict[str, Tournament]:
     """Load all tournaments from SQLite, migrating once from JSON if needed."""
     _migrate_json_to_db_if_needed()
     try:
+        start = time.perf_counter()
         raw, _ = _read_kv("tournaments")
         if not raw:
             return {}
@@ -133,6 +303,8 @@ def load_tournaments() -> Dict[str, Tournament]:
         for tournament_id, tournament_data in data.items():
             tournament = Tournament.from_dict(tournament_data)
             tournaments[tournament_id] = tournament
+        metrics.load_seconds.observe(time.perf_counter() - start)
+        metrics.payload_bytes.observe(len(raw.encode('utf-8')))
         return tournaments
     except Exception as e:
         print(f"Error loading tournaments: {e}")
@@ -168,6 +340,26 @@ def validate_score(score_str: str) -> tuple[bool, int]:
     except ValueError:
         return False, 0
 
+# Header cells recognised (and skipped) on the first row of a team CSV
+_CSV_NAME_HEADERS = {"name", "team", "player", "الاسم", "اسم الفريق", "اسم اللاعب", "الفريق", "اللاعب"}
+
+def parse_team_names(text: str) -> List[tuple[int, str]]:
+    """Split pasted text into (line_number, name) pairs, skipping blank lines"""
+    return [(i, line.strip()) for i, line in enumerate(text.splitlines(), start=1) if line.strip()]
+
+def parse_team_csv(data: bytes) -> List[tuple[int, str]]:
+    """Read team names from the first column of a CSV file as (row_number, name) pairs"""
+    text = data.decode("utf-8-sig", errors="replace")
+    rows = []
+    for i, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        name = row[0].strip() if row else ""
+        if not name:
+            continue
+        if i == 1 and name.casefold() in _CSV_NAME_HEADERS:
+            continue
+        rows.append((i, name))
+    return rows
+
 def get_team_name_label(sport_type) -> str:
     """Get appropriate label for team/player name based on sport"""
     individual_sports = ["تنس", "بينغ بونغ"]